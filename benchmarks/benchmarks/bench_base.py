@@ -13,11 +13,13 @@ if TYPE_CHECKING:
 class BenchBase:
     levels: npt.NDArray[np.floating[Any]]
     timeout: int = 120  # Some rendering benchmarks can take more than the default minute.
-    x: npt.NDArray[np.float64]
-    y: npt.NDArray[np.float64]
-    z: npt.NDArray[np.float64] | np.ma.MaskedArray[Any, Any]
+    x: npt.NDArray[np.floating[Any]]
+    y: npt.NDArray[np.floating[Any]]
+    z: npt.NDArray[np.floating[Any]] | np.ma.MaskedArray[Any, Any]
 
-    def set_xyz_and_levels(self, dataset: str, n: int, want_mask: bool) -> None:
+    def set_xyz_and_levels(
+        self, dataset: str, n: int, want_mask: bool, dtype: str = "float64",
+    ) -> None:
         if dataset == "random":
             mask_fraction = 0.05 if want_mask else 0.0
             self.x, self.y, self.z = random((n, n), mask_fraction=mask_fraction)
@@ -27,3 +29,8 @@ class BenchBase:
             self.levels = np.arange(-1.0, 1.01, 0.1)
         else:
             raise NotImplementedError
+
+        if dtype != "float64":
+            self.x = self.x.astype(dtype)
+            self.y = self.y.astype(dtype)
+            self.z = self.z.astype(dtype)
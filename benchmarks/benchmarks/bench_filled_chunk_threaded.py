@@ -0,0 +1,36 @@
+from __future__ import annotations
+
+from itertools import pairwise
+
+from contourpy import FillType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, fill_types, high_total_chunk_counts, thread_counts
+
+
+class BenchFilledChunkThreaded(BenchBase):
+    # Many chunks and threads, with a single pair of levels per call so that the threads divide up
+    # the chunks rather than the levels.
+    params: tuple[list[str], list[str], list[FillType], list[int], list[int], list[int]] = (
+        ["threaded"], datasets(), fill_types(), [1000], high_total_chunk_counts(), thread_counts(),
+    )
+    param_names: tuple[str, ...] = (
+        "name", "dataset", "fill_type", "n", "total_chunk_count", "thread_count",
+    )
+
+    def setup(
+        self, name: str, dataset: str, fill_type: FillType, n: int, total_chunk_count: int,
+        thread_count: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, False)
+
+    def time_filled_chunk_threaded(
+        self, name: str, dataset: str, fill_type: FillType, n: int, total_chunk_count: int,
+        thread_count: int,
+    ) -> None:
+        cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, fill_type=fill_type,
+            total_chunk_count=total_chunk_count, thread_count=thread_count,
+        )
+        for lower_level, upper_level in pairwise(self.levels):
+            cont_gen.filled(lower_level, upper_level)
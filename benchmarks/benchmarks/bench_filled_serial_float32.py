@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from contourpy import FillType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, dtypes, fill_types, problem_sizes
+
+
+class BenchFilledSerialFloat32(BenchBase):
+    params: tuple[list[str], list[str], list[FillType], list[str], list[int]] = (
+        ["serial"], datasets(), fill_types(), dtypes(), problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "fill_type", "dtype", "n")
+
+    def setup(self, name: str, dataset: str, fill_type: FillType, dtype: str, n: int) -> None:
+        self.set_xyz_and_levels(dataset, n, False, dtype)
+
+    def time_filled_serial_float32(
+        self, name: str, dataset: str, fill_type: FillType, dtype: str, n: int,
+    ) -> None:
+        cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, fill_type=fill_type, output_dtype=dtype)
+        cont_gen.multi_filled(self.levels)
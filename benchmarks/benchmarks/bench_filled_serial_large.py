@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+from contourpy import FillType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import corner_mask_to_bool, corner_masks, datasets, large_problem_sizes
+
+
+class BenchFilledSerialLarge(BenchBase):
+    # Single pair of levels on large grids, so most quads do not contain any contour lines.
+    params: tuple[list[str], list[str], list[FillType], list[str | bool], list[int]] = (
+        ["serial"], datasets(), [FillType.OuterCode], corner_masks(), large_problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "fill_type", "corner_mask", "n")
+
+    def setup(
+        self, name: str, dataset: str, fill_type: FillType, corner_mask: str | bool, n: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, corner_mask != "no mask")
+        self.cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, fill_type=fill_type,
+            corner_mask=corner_mask_to_bool(corner_mask),
+        )
+        index = len(self.levels) // 2
+        self.lower_level, self.upper_level = self.levels[index:index+2]
+
+    def time_filled_serial_large(
+        self, name: str, dataset: str, fill_type: FillType, corner_mask: str | bool, n: int,
+    ) -> None:
+        self.cont_gen.filled(self.lower_level, self.upper_level)
@@ -0,0 +1,27 @@
+from __future__ import annotations
+
+from contourpy import FillType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, problem_sizes
+
+
+class BenchFilledSerialSinglePass(BenchBase):
+    # Only fill types that do not identify holes can be contoured in a single pass.
+    params: tuple[list[str], list[str], list[FillType], list[bool], list[int]] = (
+        ["serial"], datasets(), [FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset],
+        [False, True], problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "fill_type", "single_pass", "n")
+
+    def setup(
+        self, name: str, dataset: str, fill_type: FillType, single_pass: bool, n: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, False)
+
+    def time_filled_serial_single_pass(
+        self, name: str, dataset: str, fill_type: FillType, single_pass: bool, n: int,
+    ) -> None:
+        cont_gen = contour_generator(self.x, self.y, self.z, name=name, fill_type=fill_type)
+        cont_gen.set_single_pass(single_pass)
+        cont_gen.multi_filled(self.levels)
@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import numpy as np
+
+from contourpy import FillType, ZInterp, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, problem_sizes, z_interps
+
+
+class BenchFilledSerialZInterp(BenchBase):
+    params: tuple[list[str], list[str], list[FillType], list[ZInterp], list[int]] = (
+        ["serial"], datasets(), [FillType.OuterCode], z_interps(), problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "fill_type", "z_interp", "n")
+
+    def setup(
+        self, name: str, dataset: str, fill_type: FillType, z_interp: ZInterp, n: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, False)
+        # Positive z for ZInterp.Log, with the same contours for both ZInterp.
+        self.z = np.exp(self.z)
+        self.levels = np.exp(self.levels)
+
+    def time_filled_serial_z_interp(
+        self, name: str, dataset: str, fill_type: FillType, z_interp: ZInterp, n: int,
+    ) -> None:
+        cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, fill_type=fill_type, z_interp=z_interp)
+        cont_gen.multi_filled(self.levels)
@@ -0,0 +1,34 @@
+from __future__ import annotations
+
+from contourpy import LineType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, high_total_chunk_counts, line_types, thread_counts
+
+
+class BenchLinesChunkThreaded(BenchBase):
+    # Many chunks and threads, with a single level per call so that the threads divide up the
+    # chunks rather than the levels.
+    params: tuple[list[str], list[str], list[LineType], list[int], list[int], list[int]] = (
+        ["threaded"], datasets(), line_types(), [1000], high_total_chunk_counts(), thread_counts(),
+    )
+    param_names: tuple[str, ...] = (
+        "name", "dataset", "line_type", "n", "total_chunk_count", "thread_count",
+    )
+
+    def setup(
+        self, name: str, dataset: str, line_type: LineType, n: int, total_chunk_count: int,
+        thread_count: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, False)
+
+    def time_lines_chunk_threaded(
+        self, name: str, dataset: str, line_type: LineType, n: int, total_chunk_count: int,
+        thread_count: int,
+    ) -> None:
+        cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, line_type=line_type,
+            total_chunk_count=total_chunk_count, thread_count=thread_count,
+        )
+        for level in self.levels:
+            cont_gen.lines(level)
@@ -0,0 +1,23 @@
+from __future__ import annotations
+
+from contourpy import LineType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, dtypes, line_types, problem_sizes
+
+
+class BenchLinesSerialFloat32(BenchBase):
+    params: tuple[list[str], list[str], list[LineType], list[str], list[int]] = (
+        ["serial"], datasets(), line_types(), dtypes(), problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "line_type", "dtype", "n")
+
+    def setup(self, name: str, dataset: str, line_type: LineType, dtype: str, n: int) -> None:
+        self.set_xyz_and_levels(dataset, n, False, dtype)
+
+    def time_lines_serial_float32(
+        self, name: str, dataset: str, line_type: LineType, dtype: str, n: int,
+    ) -> None:
+        cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, line_type=line_type, output_dtype=dtype)
+        cont_gen.multi_lines(self.levels)
@@ -0,0 +1,29 @@
+from __future__ import annotations
+
+from contourpy import LineType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import corner_mask_to_bool, corner_masks, datasets, large_problem_sizes
+
+
+class BenchLinesSerialLarge(BenchBase):
+    # Single level on large grids, so most quads do not contain any contour lines.
+    params: tuple[list[str], list[str], list[LineType], list[str | bool], list[int]] = (
+        ["serial"], datasets(), [LineType.SeparateCode], corner_masks(), large_problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "line_type", "corner_mask", "n")
+
+    def setup(
+        self, name: str, dataset: str, line_type: LineType, corner_mask: str | bool, n: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, corner_mask != "no mask")
+        self.cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, line_type=line_type,
+            corner_mask=corner_mask_to_bool(corner_mask),
+        )
+        self.level = self.levels[len(self.levels) // 2]
+
+    def time_lines_serial_large(
+        self, name: str, dataset: str, line_type: LineType, corner_mask: str | bool, n: int,
+    ) -> None:
+        self.cont_gen.lines(self.level)
@@ -7,21 +7,27 @@ from .util_bench import corner_mask_to_bool, corner_masks, datasets, problem_siz
 
 
 class BenchLinesSerialQuadAsTri(BenchBase):
-    params: tuple[list[str], list[str], list[LineType], list[str | bool], list[int]] = (
-        ["serial"], datasets(), [LineType.SeparateCode], corner_masks(), problem_sizes(),
+    params: tuple[list[str], list[str], list[LineType], list[str | bool], list[bool], list[int]] = (
+        ["serial"], datasets(), [LineType.SeparateCode], corner_masks(), [False, True],
+        problem_sizes(),
+    )
+    param_names: tuple[str, ...] = (
+        "name", "dataset", "line_type", "corner_mask", "cache_quad_middles", "n",
     )
-    param_names: tuple[str, ...] = ("name", "dataset", "line_type", "corner_mask", "n")
 
     def setup(
-        self, name: str, dataset: str, line_type: LineType, corner_mask: str | bool, n: int,
+        self, name: str, dataset: str, line_type: LineType, corner_mask: str | bool,
+        cache_quad_middles: bool, n: int,
     ) -> None:
         self.set_xyz_and_levels(dataset, n, corner_mask != "no mask")
 
     def time_lines_serial_quad_as_tri(
-        self, name: str, dataset: str, line_type: LineType, corner_mask: str | bool, n: int,
+        self, name: str, dataset: str, line_type: LineType, corner_mask: str | bool,
+        cache_quad_middles: bool, n: int,
     ) -> None:
         cont_gen = contour_generator(
             self.x, self.y, self.z, name=name, line_type=line_type,
             corner_mask=corner_mask_to_bool(corner_mask), quad_as_tri=True,
         )
+        cont_gen.set_cache_quad_middles(cache_quad_middles)
         cont_gen.multi_lines(self.levels)
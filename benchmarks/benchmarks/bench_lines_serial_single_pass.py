@@ -0,0 +1,25 @@
+from __future__ import annotations
+
+from contourpy import LineType, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, line_types, problem_sizes
+
+
+class BenchLinesSerialSinglePass(BenchBase):
+    params: tuple[list[str], list[str], list[LineType], list[bool], list[int]] = (
+        ["serial"], datasets(), line_types(), [False, True], problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "line_type", "single_pass", "n")
+
+    def setup(
+        self, name: str, dataset: str, line_type: LineType, single_pass: bool, n: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, False)
+
+    def time_lines_serial_single_pass(
+        self, name: str, dataset: str, line_type: LineType, single_pass: bool, n: int,
+    ) -> None:
+        cont_gen = contour_generator(self.x, self.y, self.z, name=name, line_type=line_type)
+        cont_gen.set_single_pass(single_pass)
+        cont_gen.multi_lines(self.levels)
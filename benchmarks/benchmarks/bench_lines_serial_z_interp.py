@@ -0,0 +1,30 @@
+from __future__ import annotations
+
+import numpy as np
+
+from contourpy import LineType, ZInterp, contour_generator
+
+from .bench_base import BenchBase
+from .util_bench import datasets, problem_sizes, z_interps
+
+
+class BenchLinesSerialZInterp(BenchBase):
+    params: tuple[list[str], list[str], list[LineType], list[ZInterp], list[int]] = (
+        ["serial"], datasets(), [LineType.SeparateCode], z_interps(), problem_sizes(),
+    )
+    param_names: tuple[str, ...] = ("name", "dataset", "line_type", "z_interp", "n")
+
+    def setup(
+        self, name: str, dataset: str, line_type: LineType, z_interp: ZInterp, n: int,
+    ) -> None:
+        self.set_xyz_and_levels(dataset, n, False)
+        # Positive z for ZInterp.Log, with the same contours for both ZInterp.
+        self.z = np.exp(self.z)
+        self.levels = np.exp(self.levels)
+
+    def time_lines_serial_z_interp(
+        self, name: str, dataset: str, line_type: LineType, z_interp: ZInterp, n: int,
+    ) -> None:
+        cont_gen = contour_generator(
+            self.x, self.y, self.z, name=name, line_type=line_type, z_interp=z_interp)
+        cont_gen.multi_lines(self.levels)
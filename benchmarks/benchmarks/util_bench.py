@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from contourpy import FillType, LineType, max_threads
+from contourpy import FillType, LineType, ZInterp, max_threads
 
 
 def corner_mask_to_bool(corner_mask: str | bool) -> bool:
@@ -18,10 +18,22 @@ def datasets() -> list[str]:
     return ["simple", "random"]
 
 
+def dtypes() -> list[str]:
+    return ["float64", "float32"]
+
+
 def fill_types() -> list[FillType]:
     return list(FillType.__members__.values())
 
 
+def high_total_chunk_counts() -> list[int]:
+    return [40, 400, 4000]
+
+
+def large_problem_sizes() -> list[int]:
+    return [1000, 2000, 4000]
+
+
 def line_types() -> list[LineType]:
     return list(LineType.__members__.values())
 
@@ -31,9 +43,13 @@ def problem_sizes() -> list[int]:
 
 
 def thread_counts() -> list[int]:
-    thread_counts = [1, 2, 4, 6, 8]
+    thread_counts = [1, 2, 4, 6, 8, 16, 32]
     return list(filter(lambda n: n <= max(max_threads(), 1), thread_counts))
 
 
 def total_chunk_counts() -> list[int]:
     return [4, 12, 40, 120]
+
+
+def z_interps() -> list[ZInterp]:
+    return list(ZInterp.__members__.values())
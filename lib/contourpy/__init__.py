@@ -14,6 +14,9 @@ from contourpy._contourpy import (
     ThreadedContourGenerator,
     ZInterp,
     max_threads,
+    set_thread_pool_size,
+    shutdown_thread_pool,
+    thread_pool_size,
 )
 from contourpy._version import __version__
 from contourpy.chunk import calc_chunk_sizes
@@ -30,13 +33,21 @@ from contourpy.dechunk import (
     dechunk_multi_lines,
 )
 from contourpy.enum_util import as_fill_type, as_line_type, as_z_interp
+from contourpy.stacked import (
+    stacked_filled,
+    stacked_lines,
+    stacked_multi_filled,
+    stacked_multi_lines,
+)
+from contourpy.tiled import tiled_filled, tiled_lines, tiled_multi_filled, tiled_multi_lines
 
 if TYPE_CHECKING:
     from typing import Any
 
-    from numpy.typing import ArrayLike
+    import numpy.typing as npt
+    from numpy.typing import ArrayLike, DTypeLike
 
-    from ._contourpy import CoordinateArray, MaskArray
+    from ._contourpy import MaskArray, XYArray, ZArray
 
 __all__ = [
     "ContourGenerator",
@@ -58,6 +69,17 @@ __all__ = [
     "dechunk_multi_filled",
     "dechunk_multi_lines",
     "max_threads",
+    "set_thread_pool_size",
+    "shutdown_thread_pool",
+    "stacked_filled",
+    "stacked_lines",
+    "stacked_multi_filled",
+    "stacked_multi_lines",
+    "thread_pool_size",
+    "tiled_filled",
+    "tiled_lines",
+    "tiled_multi_filled",
+    "tiled_multi_lines",
 ]
 
 
@@ -70,19 +92,71 @@ _class_lookup: dict[str, type[ContourGenerator]] = {
 }
 
 
+def _as_xy_array(
+    xy: ArrayLike | None,
+    xy_name: str,
+    copy: bool | None,
+    allow_float32: bool,
+) -> XYArray:
+    # float64 arrays, and float32 arrays if allow_float32, are not copied unless copy is True, other
+    # types are converted to float64 unless copy is False.
+    dtypes = (np.float64, np.float32) if allow_float32 else (np.float64,)
+    direct = xy if isinstance(xy, np.ndarray) and xy.dtype in dtypes else None
+    if copy is False and xy is not None and not (direct is not None and direct.flags.c_contiguous):
+        dtype_names = " or ".join(np.dtype(dtype).name for dtype in dtypes)
+        raise ValueError(
+            f"Cannot avoid a copy of {xy_name} as it is not a C-contiguous {dtype_names} NumPy "
+            "array")
+
+    if direct is not None:
+        return direct.copy() if copy else direct
+    return np.array(xy, dtype=np.float64) if copy else np.asarray(xy, dtype=np.float64)
+
+
 def _remove_z_mask(
     z: ArrayLike | np.ma.MaskedArray[Any, Any] | None,
-) -> tuple[CoordinateArray, MaskArray | None]:
-    # Preserve mask if present.
-    z_array = np.ma.asarray(z, dtype=np.float64)
-    z_masked = np.ma.masked_invalid(z_array, copy=False)
+    copy: bool | None = None,
+) -> tuple[ZArray, MaskArray | None]:
+    # Preserve mask if present.  float64 and float32 arrays with any strides are not copied unless
+    # copy is True, other types are converted to float64 unless copy is False.
+    if copy is False and not isinstance(z, np.ndarray):
+        raise ValueError("Cannot avoid a copy of z as it is not a NumPy array")
+
+    z_array: ZArray
+    mask: MaskArray | None = None
+    if isinstance(z, np.ma.MaskedArray):
+        data: npt.NDArray[Any] = z.data
+        if z.mask is not np.ma.nomask:
+            mask = np.asarray(z.mask, dtype=np.bool_)
+    else:
+        data = np.asarray(z)
 
-    if np.ma.is_masked(z_masked):
-        mask = np.ma.getmask(z_masked)
+    if data.dtype == np.float64 or data.dtype == np.float32:
+        z_array = data.copy() if copy else data
+    elif copy is False:
+        raise ValueError(
+            f"Cannot avoid a copy of z as its dtype is {data.dtype} rather than float64 or float32")
     else:
-        mask = None
+        z_array = data.astype(np.float64)
 
-    return np.ma.getdata(z_masked), mask  # type: ignore[return-value]
+    # The generator keeps the mask, so the caller's mask is copied unless it cannot be changed
+    # or copy is False, otherwise changing it later would change the contours.
+    if mask is not None:
+        if not mask.any():
+            mask = None
+        elif copy or (copy is None and mask.flags.writeable):
+            mask = mask.copy()
+
+    # Invalid values are also masked.  The sum of z is only non-finite if there are invalid values
+    # or it overflows, and only then is each element checked and a mask created.
+    with np.errstate(all="ignore"):
+        z_sum = z_array.sum()
+    if not np.isfinite(z_sum):
+        invalid = ~np.isfinite(z_array)
+        if invalid.any():
+            mask = np.ascontiguousarray(invalid if mask is None else mask | invalid)
+
+    return z_array, mask
 
 
 def contour_generator(
@@ -100,6 +174,8 @@ def contour_generator(
     quad_as_tri: bool = False,
     z_interp: ZInterp | str | None = ZInterp.Linear,
     thread_count: int = 0,
+    copy: bool | None = None,
+    output_dtype: DTypeLike | None = None,
 ) -> ContourGenerator:
     """Create and return a :class:`~.ContourGenerator` object.
 
@@ -115,7 +191,9 @@ def contour_generator(
             If not specified are assumed to be ``np.arange(ny)``. Must be ordered monotonically.
         z (array-like of shape (ny, nx), may be a masked array): The 2D gridded values to calculate
             the contours of.  May be a masked array, and any invalid values (``np.inf`` or
-            ``np.nan``) will also be masked out.
+            ``np.nan``) will also be masked out.  ``float64`` and ``float32`` arrays of any memory
+            layout are used without copying them by ``name="serial"`` and ``name="threaded"``,
+            as are C-contiguous ``float32`` ``x`` and ``y`` arrays.
         name (str): Algorithm name, one of ``"serial"``, ``"threaded"``, ``"mpl2005"`` or
             ``"mpl2014"``, default ``"serial"``.
         corner_mask (bool, optional): Enable/disable corner masking, which only has an effect if
@@ -156,6 +234,19 @@ def contour_generator(
             If ``thread_count=0`` and ``name="threaded"`` then it uses the maximum number of threads
             as determined by the C++11 call ``std::thread::hardware_concurrency()``. If ``name`` is
             something other than ``"threaded"`` then the ``thread_count`` will be set to ``1``.
+        copy (bool, optional): Whether to copy the ``x``, ``y`` and ``z`` arrays and the mask of
+            ``z``. If ``None``, the default, they are only copied if they cannot be used directly by
+            the algorithm ``name``, for example ``z`` that is not a ``float64`` or ``float32``
+            array. If ``True`` they are always copied so that changing them later does not affect
+            the :class:`~.ContourGenerator`. If ``False`` they are never copied and a
+            ``ValueError`` is raised if a copy would be needed. The mask of ``z`` is copied unless
+            ``copy=False`` or it is read-only. Note that ``name="mpl2005"`` and ``name="mpl2014"``
+            only support 2D ``x`` and ``y``, so 1D ``x`` and ``y`` are always expanded into new 2D
+            arrays for these algorithms even if ``copy=False``.
+        output_dtype (dtype, optional): The dtype of the point arrays returned, either
+            ``np.float64`` (the default) or ``np.float32``. Only ``name="serial"`` and
+            ``name="threaded"`` support ``np.float32``. Contours are always calculated in
+            ``float64`` and converted to ``float32`` when they are returned.
 
     Return:
         :class:`~.ContourGenerator`.
@@ -167,9 +258,11 @@ def contour_generator(
     Warning:
         The ``name="mpl2005"`` algorithm does not implement chunking for contour lines.
     """
-    x = np.asarray(x, dtype=np.float64)
-    y = np.asarray(y, dtype=np.float64)
-    z, mask = _remove_z_mask(z)
+    # float32 x and y are only used directly by algorithms that support float32 coordinates.
+    float32_xy = name in ("serial", "threaded")
+    x = _as_xy_array(x, "x", copy, float32_xy)
+    y = _as_xy_array(y, "y", copy, float32_xy)
+    z, mask = _remove_z_mask(z, copy)
 
     # Check arguments: z.
     if z.ndim != 2:
@@ -184,16 +277,25 @@ def contour_generator(
     if x.ndim != y.ndim:
         raise TypeError(f"Number of dimensions of x ({x.ndim}) and y ({y.ndim}) do not match")
 
+    # Check arguments: name.
+    if name not in _class_lookup:
+        raise ValueError(f"Unrecognised contour generator name: {name}")
+
+    # 1D x and y are only broadcast to 2D for algorithms that do not support them directly.
+    broadcast_xy = name in ("mpl2005", "mpl2014")
+
     if x.ndim == 0:
         x = np.arange(nx, dtype=np.float64)
         y = np.arange(ny, dtype=np.float64)
-        x, y = np.meshgrid(x, y)
+        if broadcast_xy:
+            x, y = np.meshgrid(x, y)
     elif x.ndim == 1:
         if len(x) != nx:
             raise TypeError(f"Length of x ({len(x)}) must match number of columns in z ({nx})")
         if len(y) != ny:
             raise TypeError(f"Length of y ({len(y)}) must match number of rows in z ({ny})")
-        x, y = np.meshgrid(x, y)
+        if broadcast_xy:
+            x, y = np.meshgrid(x, y)
     elif x.ndim == 2:
         if x.shape != z.shape:
             raise TypeError(f"Shapes of x {x.shape} and z {z.shape} do not match")
@@ -206,9 +308,15 @@ def contour_generator(
     if mask is not None and mask.shape != z.shape:
         raise ValueError("If mask is set it must be a 2D array with the same shape as z")
 
-    # Check arguments: name.
-    if name not in _class_lookup:
-        raise ValueError(f"Unrecognised contour generator name: {name}")
+    # Check arguments: copy.  Arrays that the algorithm cannot use directly are copied by the
+    # ContourGenerator constructor.
+    if copy is False:
+        if broadcast_xy and not (z.dtype == np.float64 and z.flags.c_contiguous):
+            raise ValueError(
+                f"Cannot avoid a copy of z as {name} contour generator requires a C-contiguous "
+                "float64 array")
+        if mask is not None and not mask.flags.c_contiguous:
+            raise ValueError("Cannot avoid a copy of the mask of z as it is not C-contiguous")
 
     # Check arguments: chunk_size, chunk_count and total_chunk_count.
     y_chunk_size, x_chunk_size = calc_chunk_sizes(
@@ -258,9 +366,17 @@ def contour_generator(
     if thread_count not in (0, 1) and not cls.supports_threads():
         raise ValueError(f"{name} contour generator does not support thread_count {thread_count}")
 
+    # Check arguments: output_dtype.
+    output_dtype = np.dtype(np.float64 if output_dtype is None else output_dtype)
+    if output_dtype not in (np.float64, np.float32):
+        raise ValueError(f"output_dtype must be float64 or float32, not {output_dtype}")
+
+    if output_dtype == np.float32 and not float32_xy:
+        raise ValueError(f"{name} contour generator does not support output_dtype {output_dtype}")
+
     # Prepare args and kwargs for contour generator constructor.
     args = [x, y, z, mask]
-    kwargs: dict[str, int | bool | LineType | FillType | ZInterp] = {
+    kwargs: dict[str, int | bool | LineType | FillType | ZInterp | np.dtype[Any]] = {
         "x_chunk_size": x_chunk_size,
         "y_chunk_size": y_chunk_size,
     }
@@ -268,6 +384,7 @@ def contour_generator(
     if name not in ("mpl2005", "mpl2014"):
         kwargs["line_type"] = line_type
         kwargs["fill_type"] = fill_type
+        kwargs["output_dtype"] = output_dtype
 
     if cls.supports_corner_mask():
         kwargs["corner_mask"] = corner_mask
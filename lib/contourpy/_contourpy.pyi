@@ -1,4 +1,5 @@
-from typing import ClassVar, NoReturn
+from collections.abc import Sequence
+from typing import Any, ClassVar, NoReturn
 
 import numpy as np
 import numpy.typing as npt
@@ -7,11 +8,13 @@ import contourpy._contourpy as cpy
 
 # Input numpy array types, the same as in common.h
 type CoordinateArray = npt.NDArray[np.float64]
+type XYArray = npt.NDArray[np.float64] | npt.NDArray[np.float32]
 type MaskArray = npt.NDArray[np.bool_]
 type LevelArray = npt.ArrayLike
+type ZArray = npt.NDArray[np.float64] | npt.NDArray[np.float32]
 
 # Output numpy array types, the same as in common.h
-type PointArray = npt.NDArray[np.float64]
+type PointArray = npt.NDArray[np.float64] | npt.NDArray[np.float32]
 type CodeArray = npt.NDArray[np.uint8]
 type OffsetArray = npt.NDArray[np.uint32]
 
@@ -96,15 +99,34 @@ class ZInterp:
     @property
     def value(self) -> int: ...
 
+def _convert_filled(
+    filled: FillReturn, fill_type_from: FillType, fill_type_to: FillType,
+) -> FillReturn: ...
+def _convert_lines(
+    lines: LineReturn, line_type_from: LineType, line_type_to: LineType,
+) -> LineReturn: ...
+def _dechunk_filled(filled: FillReturn_Chunk, fill_type: FillType) -> FillReturn_Chunk: ...
+def _dechunk_lines(lines: LineReturn_Chunk, line_type: LineType) -> LineReturn_Chunk: ...
 def max_threads() -> int: ...
+def set_thread_pool_size(size: int) -> None: ...
+def shutdown_thread_pool() -> None: ...
+def thread_pool_size() -> int: ...
 
 class ContourGenerator:
+    def clear_output_buffers(self) -> None: ...
+    def clear_result_cache(self) -> None: ...
     def create_contour(self, level: float) -> LineReturn: ...
     def create_filled_contour(self, lower_level: float, upper_level: float) -> FillReturn: ...
     def filled(self, lower_level: float, upper_level: float) -> FillReturn: ...
     def lines(self, level: float) -> LineReturn: ...
     def multi_filled(self, levels: LevelArray) -> list[FillReturn]: ...
     def multi_lines(self, levels: LevelArray) -> list[LineReturn]: ...
+    def result_cache_info(self) -> dict[str, int]: ...
+    def set_cache_quad_middles(self, cache: bool) -> None: ...
+    def set_keep_log_z(self, keep: bool) -> None: ...
+    def set_result_cache_size(self, max_nbytes: int) -> None: ...
+    def set_reuse_output_buffers(self, reuse: bool) -> None: ...
+    def set_single_pass(self, single_pass: bool) -> None: ...
     @staticmethod
     def supports_corner_mask() -> bool: ...
     @staticmethod
@@ -118,6 +140,8 @@ class ContourGenerator:
     @staticmethod
     def supports_z_interp() -> bool: ...
     @property
+    def cache_quad_middles(self) -> bool: ...
+    @property
     def chunk_count(self) -> tuple[int, int]: ...
     @property
     def chunk_size(self) -> tuple[int, int]: ...
@@ -126,10 +150,20 @@ class ContourGenerator:
     @property
     def fill_type(self) -> FillType: ...
     @property
+    def keep_log_z(self) -> bool: ...
+    @property
     def line_type(self) -> LineType: ...
     @property
+    def output_dtype(self) -> np.dtype[np.float64] | np.dtype[np.float32]: ...
+    @property
     def quad_as_tri(self) -> bool: ...
     @property
+    def quad_middles_nbytes(self) -> int: ...
+    @property
+    def reuse_output_buffers(self) -> bool: ...
+    @property
+    def single_pass(self) -> bool: ...
+    @property
     def thread_count(self) -> int: ...
     @property
     def z_interp(self) -> ZInterp: ...
@@ -164,9 +198,9 @@ class Mpl2014ContourGenerator(ContourGenerator):
 class SerialContourGenerator(ContourGenerator):
     def __init__(
         self,
-        x: CoordinateArray,
-        y: CoordinateArray,
-        z: CoordinateArray,
+        x: XYArray,
+        y: XYArray,
+        z: ZArray,
         mask: MaskArray,
         *,
         corner_mask: bool,
@@ -176,15 +210,55 @@ class SerialContourGenerator(ContourGenerator):
         z_interp: ZInterp,
         x_chunk_size: int = 0,
         y_chunk_size: int = 0,
+        output_dtype: npt.DTypeLike | None = None,
     ) -> None: ...
     def _write_cache(self) -> NoReturn: ...
+    def clear_output_buffers(self) -> None: ...
+    def clear_result_cache(self) -> None: ...
+    def filled(
+        self,
+        lower_level: float,
+        upper_level: float,
+        *,
+        bounds: tuple[int, int, int, int] | None = None,
+        chunks: Sequence[int] | None = None,
+    ) -> FillReturn: ...
+    def lines(
+        self,
+        level: float,
+        *,
+        bounds: tuple[int, int, int, int] | None = None,
+        chunks: Sequence[int] | None = None,
+    ) -> LineReturn: ...
+    def multi_filled_stack(self, z_stack: ZArray, levels: LevelArray) -> list[list[FillReturn]]: ...
+    def multi_lines_stack(self, z_stack: ZArray, levels: LevelArray) -> list[list[LineReturn]]: ...
+    def result_cache_info(self) -> dict[str, int]: ...
+    def set_cache_quad_middles(self, cache: bool) -> None: ...
+    def set_keep_log_z(self, keep: bool) -> None: ...
+    def set_result_cache_size(self, max_nbytes: int) -> None: ...
+    def set_reuse_output_buffers(self, reuse: bool) -> None: ...
+    def set_single_pass(self, single_pass: bool) -> None: ...
+    def set_z(self, z: npt.ArrayLike | np.ma.MaskedArray[Any, Any]) -> None: ...
+    def update_z(self, z_patch: npt.ArrayLike, row_slice: slice, col_slice: slice) -> None: ...
+    @property
+    def cache_quad_middles(self) -> bool: ...
+    @property
+    def keep_log_z(self) -> bool: ...
+    @property
+    def output_dtype(self) -> np.dtype[np.float64] | np.dtype[np.float32]: ...
+    @property
+    def quad_middles_nbytes(self) -> int: ...
+    @property
+    def reuse_output_buffers(self) -> bool: ...
+    @property
+    def single_pass(self) -> bool: ...
 
 class ThreadedContourGenerator(ContourGenerator):
     def __init__(
         self,
-        x: CoordinateArray,
-        y: CoordinateArray,
-        z: CoordinateArray,
+        x: XYArray,
+        y: XYArray,
+        z: ZArray,
         mask: MaskArray,
         *,
         corner_mask: bool,
@@ -195,5 +269,45 @@ class ThreadedContourGenerator(ContourGenerator):
         x_chunk_size: int = 0,
         y_chunk_size: int = 0,
         thread_count: int = 0,
+        output_dtype: npt.DTypeLike | None = None,
     ) -> None: ...
     def _write_cache(self) -> None: ...
+    def clear_output_buffers(self) -> None: ...
+    def clear_result_cache(self) -> None: ...
+    def filled(
+        self,
+        lower_level: float,
+        upper_level: float,
+        *,
+        bounds: tuple[int, int, int, int] | None = None,
+        chunks: Sequence[int] | None = None,
+    ) -> FillReturn: ...
+    def lines(
+        self,
+        level: float,
+        *,
+        bounds: tuple[int, int, int, int] | None = None,
+        chunks: Sequence[int] | None = None,
+    ) -> LineReturn: ...
+    def multi_filled_stack(self, z_stack: ZArray, levels: LevelArray) -> list[list[FillReturn]]: ...
+    def multi_lines_stack(self, z_stack: ZArray, levels: LevelArray) -> list[list[LineReturn]]: ...
+    def result_cache_info(self) -> dict[str, int]: ...
+    def set_cache_quad_middles(self, cache: bool) -> None: ...
+    def set_keep_log_z(self, keep: bool) -> None: ...
+    def set_result_cache_size(self, max_nbytes: int) -> None: ...
+    def set_reuse_output_buffers(self, reuse: bool) -> None: ...
+    def set_single_pass(self, single_pass: bool) -> None: ...
+    def set_z(self, z: npt.ArrayLike | np.ma.MaskedArray[Any, Any]) -> None: ...
+    def update_z(self, z_patch: npt.ArrayLike, row_slice: slice, col_slice: slice) -> None: ...
+    @property
+    def cache_quad_middles(self) -> bool: ...
+    @property
+    def keep_log_z(self) -> bool: ...
+    @property
+    def output_dtype(self) -> np.dtype[np.float64] | np.dtype[np.float32]: ...
+    @property
+    def quad_middles_nbytes(self) -> int: ...
+    @property
+    def reuse_output_buffers(self) -> bool: ...
+    @property
+    def single_pass(self) -> bool: ...
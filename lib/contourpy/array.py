@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from itertools import chain, pairwise
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
 
@@ -9,6 +9,10 @@ from contourpy.typecheck import check_code_array, check_offset_array, check_poin
 from contourpy.types import CLOSEPOLY, LINETO, MOVETO, code_dtype, offset_dtype, point_dtype
 
 if TYPE_CHECKING:
+    from collections.abc import Sequence
+
+    import numpy.typing as npt
+
     import contourpy._contourpy as cpy
 
 
@@ -203,6 +207,26 @@ def outer_offsets_from_list_of_offsets(list_of_offsets: list[cpy.OffsetArray]) -
     return np.cumsum([0] + [len(offsets)-1 for offsets in list_of_offsets], dtype=offset_dtype)
 
 
+def points_astype(
+    list_of_points_or_none: Sequence[cpy.PointArray | None],
+    dtype: npt.DTypeLike,
+) -> list[cpy.PointArray | None]:
+    """Return a list of point arrays or None with each point array cast to the specified dtype.
+    """
+    return [None if points is None else points.astype(dtype, copy=False)
+            for points in list_of_points_or_none]
+
+
+def points_dtype(list_of_points_or_none: Sequence[cpy.PointArray | None]) -> np.dtype[Any]:
+    """Return the dtype of the first point array in a list of point arrays or None, or the default
+    point dtype if there are no point arrays.
+    """
+    for points in list_of_points_or_none:
+        if points is not None:
+            return points.dtype
+    return np.dtype(point_dtype)
+
+
 def remove_nan(points: cpy.PointArray) -> tuple[cpy.PointArray, cpy.OffsetArray]:
     """Remove NaN from a points array, also return the offsets corresponding to the NaN removed.
     """
@@ -243,7 +267,7 @@ def split_points_by_offsets(
     check_offset_array(offsets)
 
     if len(offsets) > 2:
-        return np.split(points, offsets[1:-1])
+        return cast("list[cpy.PointArray]", np.split(points, offsets[1:-1]))
     else:
         return [points]
 
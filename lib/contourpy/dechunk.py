@@ -2,15 +2,11 @@ from __future__ import annotations
 
 from typing import TYPE_CHECKING, cast
 
-from contourpy._contourpy import FillType, LineType
-from contourpy.array import (
-    concat_codes_or_none,
-    concat_offsets_or_none,
-    concat_points_or_none,
-    concat_points_or_none_with_nan,
-)
+from contourpy._contourpy import FillType, LineType, _dechunk_filled, _dechunk_lines
+from contourpy.array import points_astype, points_dtype
 from contourpy.enum_util import as_fill_type, as_line_type
 from contourpy.typecheck import check_filled, check_lines
+from contourpy.types import point_dtype
 
 if TYPE_CHECKING:
     import contourpy._contourpy as cpy
@@ -21,7 +17,8 @@ def dechunk_filled(filled: cpy.FillReturn, fill_type: FillType | str) -> cpy.Fil
 
     Filled contours that are not chunked (``FillType.OuterCode`` and ``FillType.OuterOffset``) and
     those that are but only contain a single chunk are returned unmodified. Individual polygons are
-    unchanged, they are not geometrically combined.
+    unchanged, they are not geometrically combined. If only one chunk contains any polygons then
+    its arrays are returned without being copied.
 
     Args:
         filled (sequence of arrays): Filled contour data, such as returned by
@@ -47,44 +44,12 @@ def dechunk_filled(filled: cpy.FillReturn, fill_type: FillType | str) -> cpy.Fil
 
     if TYPE_CHECKING:
         filled = cast("cpy.FillReturn_Chunk", filled)
-    points = concat_points_or_none(filled[0])
-
-    if fill_type == FillType.ChunkCombinedCode:
-        if TYPE_CHECKING:
-            filled = cast("cpy.FillReturn_ChunkCombinedCode", filled)
-        if points is None:
-            ret1: cpy.FillReturn_ChunkCombinedCode = ([None], [None])
-        else:
-            ret1 = ([points], [concat_codes_or_none(filled[1])])
-        return ret1
-    elif fill_type == FillType.ChunkCombinedOffset:
-        if TYPE_CHECKING:
-            filled = cast("cpy.FillReturn_ChunkCombinedOffset", filled)
-        if points is None:
-            ret2: cpy.FillReturn_ChunkCombinedOffset = ([None], [None])
-        else:
-            ret2 = ([points], [concat_offsets_or_none(filled[1])])
-        return ret2
-    elif fill_type == FillType.ChunkCombinedCodeOffset:
-        if TYPE_CHECKING:
-            filled = cast("cpy.FillReturn_ChunkCombinedCodeOffset", filled)
-        if points is None:
-            ret3: cpy.FillReturn_ChunkCombinedCodeOffset = ([None], [None], [None])
-        else:
-            outer_offsets = concat_offsets_or_none(filled[2])
-            ret3 = ([points], [concat_codes_or_none(filled[1])], [outer_offsets])
-        return ret3
-    elif fill_type == FillType.ChunkCombinedOffsetOffset:
-        if TYPE_CHECKING:
-            filled = cast("cpy.FillReturn_ChunkCombinedOffsetOffset", filled)
-        if points is None:
-            ret4: cpy.FillReturn_ChunkCombinedOffsetOffset = ([None], [None], [None])
-        else:
-            outer_offsets = concat_offsets_or_none(filled[2])
-            ret4 = ([points], [concat_offsets_or_none(filled[1])], [outer_offsets])
-        return ret4
-    else:
-        raise ValueError(f"Invalid FillType {fill_type}")
+    dtype = points_dtype(filled[0])
+    dechunked = _dechunk_filled(filled, fill_type)
+    if dtype != point_dtype:
+        # Native dechunking is performed in float64.
+        dechunked = cast("cpy.FillReturn", (points_astype(dechunked[0], dtype), *dechunked[1:]))
+    return dechunked
 
 
 def dechunk_lines(lines: cpy.LineReturn, line_type: LineType | str) -> cpy.LineReturn:
@@ -92,7 +57,8 @@ def dechunk_lines(lines: cpy.LineReturn, line_type: LineType | str) -> cpy.LineR
 
     Contour lines that are not chunked (``LineType.Separate`` and ``LineType.SeparateCode``) and
     those that are but only contain a single chunk are returned unmodified. Individual lines are
-    unchanged, they are not geometrically combined.
+    unchanged, they are not geometrically combined. If only one chunk contains any lines then its
+    arrays are returned without being copied.
 
     Args:
         lines (sequence of arrays): Contour line data, such as returned by
@@ -118,33 +84,12 @@ def dechunk_lines(lines: cpy.LineReturn, line_type: LineType | str) -> cpy.LineR
 
     if TYPE_CHECKING:
         lines = cast("cpy.LineReturn_Chunk", lines)
-
-    if line_type == LineType.ChunkCombinedCode:
-        if TYPE_CHECKING:
-            lines = cast("cpy.LineReturn_ChunkCombinedCode", lines)
-        points = concat_points_or_none(lines[0])
-        if points is None:
-            ret1: cpy.LineReturn_ChunkCombinedCode = ([None], [None])
-        else:
-            ret1 = ([points], [concat_codes_or_none(lines[1])])
-        return ret1
-    elif line_type == LineType.ChunkCombinedOffset:
-        if TYPE_CHECKING:
-            lines = cast("cpy.LineReturn_ChunkCombinedOffset", lines)
-        points = concat_points_or_none(lines[0])
-        if points is None:
-            ret2: cpy.LineReturn_ChunkCombinedOffset = ([None], [None])
-        else:
-            ret2 = ([points], [concat_offsets_or_none(lines[1])])
-        return ret2
-    elif line_type == LineType.ChunkCombinedNan:
-        if TYPE_CHECKING:
-            lines = cast("cpy.LineReturn_ChunkCombinedNan", lines)
-        points = concat_points_or_none_with_nan(lines[0])
-        ret3: cpy.LineReturn_ChunkCombinedNan = ([points],)
-        return ret3
-    else:
-        raise ValueError(f"Invalid LineType {line_type}")
+    dtype = points_dtype(lines[0])
+    dechunked = _dechunk_lines(lines, line_type)
+    if dtype != point_dtype:
+        # Native dechunking is performed in float64.
+        dechunked = cast("cpy.LineReturn", (points_astype(dechunked[0], dtype), *dechunked[1:]))
+    return dechunked
 
 
 def dechunk_multi_filled(
@@ -0,0 +1,170 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any, cast
+
+import numpy as np
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import ArrayLike
+
+    import contourpy._contourpy as cpy
+
+
+def _stack_contour_generators(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    kwargs: dict[str, Any],
+) -> Iterator[tuple[
+    cpy.SerialContourGenerator | cpy.ThreadedContourGenerator, cpy.ZArray, list[int],
+]]:
+    # Yields a ContourGenerator, the z stack of the frames that it contours and their indices.
+    # Imported here to avoid a circular import.
+    from contourpy import _remove_z_mask, contour_generator
+
+    name = kwargs.get("name", "serial")
+    if name not in ("serial", "threaded"):
+        raise ValueError(f"{name} contour generator does not support stacked z")
+
+    z_data, masks = _remove_z_mask(z)
+    if z_data.ndim != 3:
+        raise TypeError(f"Input z must be 3D, not {z_data.ndim}D")
+
+    # Frames with the same mask are contoured together, in any order.
+    frames_by_mask: dict[bytes, list[int]] = {}
+    for frame in range(z_data.shape[0]):
+        key = b"" if masks is None else masks[frame].tobytes()
+        frames_by_mask.setdefault(key, []).append(frame)
+
+    # A single ContourGenerator is used for all frames, changing its mask using set_z.
+    cont_gen: cpy.SerialContourGenerator | cpy.ThreadedContourGenerator | None = None
+    for frames in frames_by_mask.values():
+        first, last = frames[0], frames[-1]
+        z_frame = z_data[first] if masks is None else np.ma.array(z_data[first], mask=masks[first])
+        if cont_gen is None:
+            cont_gen = cast(
+                "cpy.SerialContourGenerator | cpy.ThreadedContourGenerator",
+                contour_generator(x, y, z_frame, **kwargs))
+        else:
+            cont_gen.set_z(z_frame)
+
+        # Consecutive frames are a view of z rather than a copy.
+        z_stack = z_data[first:last + 1] if last - first == len(frames) - 1 else z_data[frames]
+        yield cont_gen, z_stack, frames
+
+
+def stacked_filled(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    lower_level: float,
+    upper_level: float,
+    **kwargs: Any,
+) -> list[cpy.FillReturn]:
+    """Calculate filled contours of each frame of a stack of z arrays.
+
+    Equivalent to :func:`stacked_multi_filled` with a single pair of levels, returning a list of
+    the filled contours of each frame.
+
+    .. versionadded:: 1.4.0
+    """
+    return [
+        multi_filled[0] for multi_filled in
+        stacked_multi_filled(x, y, z, [lower_level, upper_level], **kwargs)]
+
+
+def stacked_lines(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    level: float,
+    **kwargs: Any,
+) -> list[cpy.LineReturn]:
+    """Calculate contour lines of each frame of a stack of z arrays.
+
+    Equivalent to :func:`stacked_multi_lines` with a single level, returning a list of the contour
+    lines of each frame.
+
+    .. versionadded:: 1.4.0
+    """
+    return [multi_lines[0] for multi_lines in stacked_multi_lines(x, y, z, [level], **kwargs)]
+
+
+def stacked_multi_filled(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    levels: ArrayLike,
+    **kwargs: Any,
+) -> list[list[cpy.FillReturn]]:
+    """Calculate multiple sets of filled contours of each frame of a stack of z arrays.
+
+    Frames share the same ``x`` and ``y`` and a single :class:`~.ContourGenerator`, so the
+    coordinates are validated once rather than for every frame. Frames that have the same mask are
+    contoured together, so the grid part of the cache is calculated once per distinct mask, and
+    with ``name="threaded"`` they are contoured in parallel.
+
+    Args:
+        x (array-like of shape (ny, nx) or (nx,), optional): The x-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(nx)``.
+        y (array-like of shape (ny, nx) or (ny,), optional): The y-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(ny)``.
+        z (array-like of shape (nt, ny, nx), may be a masked array): The stack of ``nt`` 2D
+            gridded values to calculate the contours of. Values that are masked or not finite
+            are masked as for :func:`~.contour_generator`.
+        levels (array-like of floats): Levels to calculate filled contours between, as for
+            :meth:`~.ContourGenerator.multi_filled`.
+        **kwargs: Other keyword arguments passed to :func:`~.contour_generator`. ``name`` must be
+            ``"serial"`` or ``"threaded"``.
+
+    Return:
+        List of length ``nt`` of the filled contours of each frame, each a list of filled contours
+        with one per pair of levels, in the format determined by the ``fill_type``.
+
+    .. versionadded:: 1.4.0
+    """
+    ret: dict[int, list[cpy.FillReturn]] = {}
+    for cont_gen, z_stack, frames in _stack_contour_generators(x, y, z, kwargs):
+        ret.update(zip(frames, cont_gen.multi_filled_stack(z_stack, levels)))
+    return [ret[frame] for frame in range(len(ret))]
+
+
+def stacked_multi_lines(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    levels: ArrayLike,
+    **kwargs: Any,
+) -> list[list[cpy.LineReturn]]:
+    """Calculate multiple sets of contour lines of each frame of a stack of z arrays.
+
+    Frames share the same ``x`` and ``y`` and a single :class:`~.ContourGenerator`, so the
+    coordinates are validated once rather than for every frame. Frames that have the same mask are
+    contoured together, so the grid part of the cache is calculated once per distinct mask, and
+    with ``name="threaded"`` they are contoured in parallel.
+
+    Args:
+        x (array-like of shape (ny, nx) or (nx,), optional): The x-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(nx)``.
+        y (array-like of shape (ny, nx) or (ny,), optional): The y-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(ny)``.
+        z (array-like of shape (nt, ny, nx), may be a masked array): The stack of ``nt`` 2D
+            gridded values to calculate the contours of. Values that are masked or not finite
+            are masked as for :func:`~.contour_generator`.
+        levels (array-like of floats): Levels to calculate contour lines at, as for
+            :meth:`~.ContourGenerator.multi_lines`.
+        **kwargs: Other keyword arguments passed to :func:`~.contour_generator`. ``name`` must be
+            ``"serial"`` or ``"threaded"``.
+
+    Return:
+        List of length ``nt`` of the contour lines of each frame, each a list of contour lines
+        with one per level, in the format determined by the ``line_type``.
+
+    .. versionadded:: 1.4.0
+    """
+    ret: dict[int, list[cpy.LineReturn]] = {}
+    for cont_gen, z_stack, frames in _stack_contour_generators(x, y, z, kwargs):
+        ret.update(zip(frames, cont_gen.multi_lines_stack(z_stack, levels)))
+    return [ret[frame] for frame in range(len(ret))]
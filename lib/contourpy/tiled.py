@@ -0,0 +1,217 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, Any
+
+import numpy as np
+
+from contourpy.chunk import calc_chunk_sizes
+
+if TYPE_CHECKING:
+    from collections.abc import Iterator
+
+    from numpy.typing import ArrayLike
+
+    import contourpy._contourpy as cpy
+
+
+def _combine_tiles(tile_returns: list[Any]) -> Any:
+    # Concatenate the lists of arrays returned by each tile, in tile order.
+    if isinstance(tile_returns[0], list):
+        return [array for tile_return in tile_returns for array in tile_return]
+    return tuple(
+        [array for tile_return in tile_returns for array in tile_return[i]]
+        for i in range(len(tile_returns[0])))
+
+
+def _tile_contour_generators(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    tile_size: int | tuple[int, int],
+    kwargs: dict[str, Any],
+) -> Iterator[cpy.ContourGenerator]:
+    # Imported here to avoid a circular import.
+    from contourpy import contour_generator
+
+    # np.asanyarray keeps np.memmap and np.ma.MaskedArray without reading or copying their data.
+    z = np.asanyarray(z)
+    if z.ndim != 2:
+        raise TypeError(f"Input z must be 2D, not {z.ndim}D")
+    ny, nx = z.shape
+
+    if x is not None:
+        x = np.asanyarray(x)
+    if y is not None:
+        y = np.asanyarray(y)
+    if (x is None) != (y is None):
+        raise TypeError("Either both or neither of x and y must be specified")
+    if x is not None and y is not None:
+        if x.ndim == 1:
+            if x.shape != (nx,) or y.shape != (ny,):
+                raise TypeError(
+                    f"Shapes of x {x.shape} and y {y.shape} do not match z {z.shape}")
+        elif x.ndim == 2:
+            if x.shape != z.shape or y.shape != z.shape:
+                raise TypeError(
+                    f"Shapes of x {x.shape} and y {y.shape} do not match z {z.shape}")
+        else:
+            raise TypeError(f"Inputs x and y must be None, 1D or 2D, not {x.ndim}D")
+
+    y_tile_size, x_tile_size = calc_chunk_sizes(tile_size, None, None, ny, nx)
+    if y_tile_size == 0:
+        y_tile_size = ny - 1
+    if x_tile_size == 0:
+        x_tile_size = nx - 1
+
+    # Tiles are in the same order as chunks.  Each tile includes the row and column of points that
+    # it shares with the next tile.
+    for jstart in range(0, ny-1, y_tile_size):
+        jslice = slice(jstart, min(jstart + y_tile_size, ny-1) + 1)
+        for istart in range(0, nx-1, x_tile_size):
+            islice = slice(istart, min(istart + x_tile_size, nx-1) + 1)
+
+            if x is None or y is None:
+                x_tile = np.arange(islice.start, islice.stop, dtype=np.float64)
+                y_tile = np.arange(jslice.start, jslice.stop, dtype=np.float64)
+            elif x.ndim == 1:
+                x_tile, y_tile = x[islice], y[jslice]
+            else:
+                x_tile, y_tile = x[jslice, islice], y[jslice, islice]
+
+            yield contour_generator(x_tile, y_tile, z[jslice, islice], **kwargs)
+
+
+def tiled_filled(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    lower_level: float,
+    upper_level: float,
+    *,
+    tile_size: int | tuple[int, int],
+    **kwargs: Any,
+) -> cpy.FillReturn:
+    """Calculate filled contours of a large grid one tile at a time.
+
+    Equivalent to :func:`tiled_multi_filled` with a single pair of levels.
+
+    .. versionadded:: 1.4.0
+    """
+    return tiled_multi_filled(x, y, z, [lower_level, upper_level], tile_size=tile_size, **kwargs)[0]
+
+
+def tiled_lines(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    level: float,
+    *,
+    tile_size: int | tuple[int, int],
+    **kwargs: Any,
+) -> cpy.LineReturn:
+    """Calculate contour lines of a large grid one tile at a time.
+
+    Equivalent to :func:`tiled_multi_lines` with a single level, so lines are split at tile
+    boundaries.
+
+    .. versionadded:: 1.4.0
+    """
+    return tiled_multi_lines(x, y, z, [level], tile_size=tile_size, **kwargs)[0]
+
+
+def tiled_multi_filled(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    levels: ArrayLike,
+    *,
+    tile_size: int | tuple[int, int],
+    **kwargs: Any,
+) -> list[cpy.FillReturn]:
+    """Calculate multiple sets of filled contours of a large grid one tile at a time.
+
+    A separate :class:`~.ContourGenerator` is created for each tile so that only one tile of ``x``,
+    ``y`` and ``z`` and its cache is in memory at a time. This allows contouring of grids that are
+    too large to fit in memory, such as ``np.memmap`` arrays, which are read one tile at a time.
+
+    Args:
+        x (array-like of shape (ny, nx) or (nx,), optional): The x-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(nx)``.
+        y (array-like of shape (ny, nx) or (ny,), optional): The y-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(ny)``.
+        z (array-like of shape (ny, nx), may be a masked array): The 2D gridded values to calculate
+            the contours of. ``np.memmap`` and masked arrays are not read until each tile is used.
+        levels (array-like of floats): Levels to calculate filled contours between, as for
+            :meth:`~.ContourGenerator.multi_filled`.
+        tile_size (int or tuple(int, int)): Tile size in (y, x) directions, or the same size in
+            both directions if only one value is specified, in the same way as ``chunk_size``.
+        **kwargs: Other keyword arguments passed to :func:`~.contour_generator` for each tile.
+
+    Return:
+        List of filled contours, one per pair of levels, in the format determined by the
+        ``fill_type``.
+
+    The results are the same as those of contouring the whole grid using ``chunk_size=tile_size``,
+    i.e. each tile is a separate chunk and polygons are split at tile boundaries. If ``chunk_size``,
+    ``chunk_count`` or ``total_chunk_count`` is also specified then each tile is further divided
+    into chunks.
+
+    .. versionadded:: 1.4.0
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    tile_returns: list[list[cpy.FillReturn]] = [[] for _ in range(max(len(levels) - 1, 0))]
+    for cont_gen in _tile_contour_generators(x, y, z, tile_size, kwargs):
+        for level_returns, filled in zip(tile_returns, cont_gen.multi_filled(levels)):
+            level_returns.append(filled)
+    return [_combine_tiles(level_returns) for level_returns in tile_returns]
+
+
+def tiled_multi_lines(
+    x: ArrayLike | None,
+    y: ArrayLike | None,
+    z: ArrayLike | np.ma.MaskedArray[Any, Any],
+    levels: ArrayLike,
+    *,
+    tile_size: int | tuple[int, int],
+    **kwargs: Any,
+) -> list[cpy.LineReturn]:
+    """Calculate multiple sets of contour lines of a large grid one tile at a time.
+
+    A separate :class:`~.ContourGenerator` is created for each tile so that only one tile of ``x``,
+    ``y`` and ``z`` and its cache is in memory at a time. This allows contouring of grids that are
+    too large to fit in memory, such as ``np.memmap`` arrays, which are read one tile at a time.
+
+    Args:
+        x (array-like of shape (ny, nx) or (nx,), optional): The x-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(nx)``.
+        y (array-like of shape (ny, nx) or (ny,), optional): The y-coordinates of the ``z`` values.
+            If ``None`` are assumed to be ``np.arange(ny)``.
+        z (array-like of shape (ny, nx), may be a masked array): The 2D gridded values to calculate
+            the contours of. ``np.memmap`` and masked arrays are not read until each tile is used.
+        levels (array-like of floats): Levels to calculate contour lines at, as for
+            :meth:`~.ContourGenerator.multi_lines`.
+        tile_size (int or tuple(int, int)): Tile size in (y, x) directions, or the same size in
+            both directions if only one value is specified, in the same way as ``chunk_size``.
+        **kwargs: Other keyword arguments passed to :func:`~.contour_generator` for each tile.
+
+    Return:
+        List of contour lines, one per level, in the format determined by the ``line_type``.
+
+    The results are the same as those of contouring the whole grid using ``chunk_size=tile_size``,
+    i.e. each tile is a separate chunk and lines are split at tile boundaries. If ``chunk_size``,
+    ``chunk_count`` or ``total_chunk_count`` is also specified then each tile is further divided
+    into chunks.
+
+    .. warning::
+        Lines are not stitched together across tile boundaries. A line that crosses ``n`` tiles
+        is returned as ``n`` separate lines, each ending at a point on the shared tile edge that is
+        identical to the start or end point of the line in the neighbouring tile.
+
+    .. versionadded:: 1.4.0
+    """
+    levels = np.asarray(levels, dtype=np.float64)
+    tile_returns: list[list[cpy.LineReturn]] = [[] for _ in range(len(levels))]
+    for cont_gen in _tile_contour_generators(x, y, z, tile_size, kwargs):
+        for level_returns, lines in zip(tile_returns, cont_gen.multi_lines(levels)):
+            level_returns.append(lines)
+    return [_combine_tiles(level_returns) for level_returns in tile_returns]
@@ -13,6 +13,7 @@ if TYPE_CHECKING:
         FillReturn,
         LineReturn,
         LineReturn_ChunkCombinedNan,
+        PointArray,
     )
 
 
@@ -62,7 +63,7 @@ def filled_to_bokeh(
 def lines_to_bokeh(
     lines: LineReturn,
     line_type: LineType,
-) -> tuple[CoordinateArray | None, CoordinateArray | None]:
+) -> tuple[PointArray | None, PointArray | None]:
     lines = convert_lines(lines, line_type, LineType.ChunkCombinedNan)
     lines = dechunk_lines(lines, LineType.ChunkCombinedNan)
     if TYPE_CHECKING:
@@ -16,6 +16,8 @@
 #include "line_type.h"
 #include "outer_or_hole.h"
 #include "z_interp.h"
+#include <list>
+#include <memory>
 #include <vector>
 
 namespace contourpy {
@@ -29,8 +31,21 @@ public:
     static FillType default_fill_type();
     static LineType default_line_type();
 
+    // Release the reusable output buffers.
+    void clear_output_buffers();
+
+    // Clear the result cache, including its hit and miss counts.
+    void clear_result_cache();
+
     py::tuple filled(double lower_level, double upper_level) override;
 
+    // As filled() but only contours a subset of chunks, either those containing quads that use any
+    // of the points in the region z[j0:j1, i0:i1] given by bounds = (j0, j1, i0, i1) or those in
+    // the sequence of chunk indices chunks.  All chunks if both are None.
+    py::tuple filled(
+        double lower_level, double upper_level, const py::object& bounds,
+        const py::object& chunks);
+
     py::tuple get_chunk_count() const;  // Return (y_chunk_count, x_chunk_count)
     py::tuple get_chunk_size() const;   // Return (y_chunk_size, x_chunk_size)
 
@@ -39,28 +54,112 @@ public:
     FillType get_fill_type() const;
     LineType get_line_type() const;
 
+    // Return dtype of returned points, float64 or float32.
+    py::dtype get_output_dtype() const;
+
     bool get_quad_as_tri() const;
 
+    // Return approximate size in bytes of the cached quad middles, zero if not cached.
+    index_t get_quad_middles_nbytes() const;
+
+    // Return dict of result cache statistics: hits, misses, entries, nbytes and max_nbytes.
+    py::dict get_result_cache_info() const;
+
+    bool get_cache_quad_middles() const;
+
+    bool get_keep_log_z() const;
+
+    bool get_reuse_output_buffers() const;
+
+    bool get_single_pass() const;
+
     ZInterp get_z_interp() const;
 
     py::sequence lines(double level) override;
 
+    // As lines() but only contours a subset of chunks, as for filled().
+    py::sequence lines(double level, const py::object& bounds, const py::object& chunks);
+
     py::list multi_filled(const LevelArray levels) override;
     py::list multi_lines(const LevelArray levels) override;
 
+    // Contour each frame of z_stack, a 3D array of shape (nt, ny, nx) of z values that share the
+    // x, y and mask of this ContourGenerator, at multiple levels.  Return a list of the
+    // multi_filled() or multi_lines() results of each frame.  The grid part of the cache is
+    // shared by all frames.
+    py::list multi_filled_stack(const ZArray& z_stack, const LevelArray levels);
+    py::list multi_lines_stack(const ZArray& z_stack, const LevelArray levels);
+
+    // If cache is true and using quad_as_tri, the x, y and z of the middle of every quad are
+    // calculated once and kept rather than being recalculated whenever they are needed.  x and y
+    // are kept until disabled, z until z is changed.
+    void set_cache_quad_middles(bool cache);
+
+    // If keep is true and using ZInterp::Log, log(z) is kept between calls rather than being
+    // calculated once per call and then released.
+    void set_keep_log_z(bool keep);
+
+    // If reuse is true, the NumPy arrays of chunked line and fill types returned by subsequent
+    // calls are views into output buffers that are kept by this ContourGenerator and reused by
+    // later calls, rather than new arrays.  Buffers are only reallocated if they are too small.
+    void set_reuse_output_buffers(bool reuse);
+
+    // Results of lines() and filled() calls, including those of multi_lines() and multi_filled(),
+    // are kept up to a total size of max_nbytes and returned by subsequent calls for the same
+    // level(s), evicting the least recently used first.  Zero, the default, disables it.
+    void set_result_cache_size(index_t max_nbytes);
+
+    // If single_pass is true, each chunk is marched once, writing to C++ buffers that grow as
+    // required, rather than counting in pass 0 and then writing to arrays of the correct size in
+    // pass 1.  Fill types that identify holes always use two passes.
+    void set_single_pass(bool single_pass);
+
+    // Replace z, which may be a masked array, with a new array of the same shape.  The grid part
+    // of the cache is kept if the mask is unchanged, otherwise it is recalculated when next needed.
+    void set_z(const ZArray& z);
+
     static bool supports_fill_type(FillType fill_type);
     static bool supports_line_type(LineType line_type);
 
+    // Replace the z values of the rectangular region of points given by row_slice and col_slice.
+    // Subsequent calls that return chunked output only re-march the chunks containing quads that
+    // use any of those points, reusing the results of the other chunks from previous calls.
+    void update_z(
+        const CoordinateArray& z_patch, const py::slice& row_slice, const py::slice& col_slice);
+
     void write_cache() const;  // For debug purposes only.
 
 protected:
     BaseContourGenerator(
-        const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+        const XYArray& x, const XYArray& y, const ZArray& z,
         const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size);
+        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+        const py::object& output_dtype);
+
+    // Tag to select the worker constructor.
+    struct WorkerTag {};
 
-    typedef uint32_t CacheItem;
+    // Worker that shares the x, y and z arrays, settings and level indices of another
+    // ContourGenerator but has its own copy of the cache, so that it can contour a different level
+    // at the same time.  Must be called with the GIL held.
+    BaseContourGenerator(const BaseContourGenerator& other, WorkerTag);
+
+    typedef uint16_t CacheItem;
     typedef CacheItem ZLevel;
+    typedef uint8_t MaskCacheItem;
+    typedef uint16_t LevelIndex;
+
+    // multi_filled only.  Per-point count of levels that are below z, so that the z-levels of all
+    // pairs of adjacent levels can be obtained using integer comparisons without classifying z
+    // against each level in turn.  Also the min and max of these across blocks of points in each
+    // row, to quickly identify blocks that are entirely below or above a pair of levels.  Read-only
+    // once calculated so can be shared between workers contouring different levels.
+    struct LevelIndices
+    {
+        std::vector<LevelIndex> point;
+        std::vector<LevelIndex> block_min, block_max;
+        index_t n_blocks;  // Number of blocks per row.
+    };
 
     // C++11 scoped enum for direction of movement from one quad to the next.
     enum class Direction
@@ -92,7 +191,11 @@ protected:
     // Calculate, set and return z-level at middle of quad.
     ZLevel calc_and_set_middle_z_level(index_t quad);
 
-    // Calculate and return z at middle of quad.
+    // Calculate and return existence of quad from the mask, only valid if there is a mask.
+    MaskCacheItem calc_mask_cache_item(index_t quad) const;
+
+    // Calculate and return z at middle of quad, in interpolation space (log(z) if using
+    // ZInterp::Log).  Returns the cached value if quad middles are cached.
     double calc_middle_z(index_t quad) const;
 
     void closed_line(const Location& start_location, OuterOrHole outer_or_hole, ChunkLocal& local);
@@ -103,6 +206,13 @@ protected:
     // If point/line/hole counts not consistent, throw runtime error.
     void check_consistent_counts(const ChunkLocal& local) const;
 
+    // Return NumPy array for item list_index of the return lists of chunk, of shape (shape0,) if
+    // shape1 is zero otherwise (shape0, shape1).  If reusing output buffers it is a view into the
+    // output buffer of that item, otherwise it is a new array.  Must be called with the GIL held.
+    template <typename T>
+    py::array_t<T> create_output_array(
+        index_t chunk, index_t list_index, count_t shape0, count_t shape1 = 0);
+
     index_t find_look_S(index_t look_N_quad) const;
 
     // Return true if finished (i.e. back to start quad, direction and upper).
@@ -121,18 +231,47 @@ protected:
     // chunk is index in range 0.._n_chunks-1.
     void get_chunk_limits(index_t chunk, ChunkLocal& local) const;
 
+    // Chunks whose grid part of the cache is initialised in the current contouring operation, in
+    // increasing order.  These are the init chunks and their W and S neighbours that have not been
+    // initialised by a previous operation, and must be initialised before any of the init chunks.
+    const std::vector<index_t>& get_grid_chunks() const;
+
     index_t get_interior_start_left_point(
         const Location& location, bool& start_corner_diagonal) const;
 
+    // Chunks whose cache z-levels and starts are initialised in the current contouring
+    // operation, in increasing order.  These are the trace chunks and their W, S and SW neighbours
+    // as the latter set the z-levels of the points on the W and S edges of the trace chunks.
+    const std::vector<index_t>& get_init_chunks() const;
+
+    // Fraction of the way from z1 to z0 that level is, all in interpolation space.
     double get_interp_fraction(double z0, double z1, double level) const;
 
+    // z of a grid point in interpolation space, log(z) if using ZInterp::Log otherwise z.
+    double get_interp_z(index_t point) const;
+
+    // Return the cached value if quad middles are cached.
     double get_middle_x(index_t quad) const;
     double get_middle_y(index_t quad) const;
 
     index_t get_n_chunks() const;
 
+    // Chunks, in increasing order, containing quads that use any of the points in the region
+    // z[jstart:jstop, istart:istop].  The region must already be clipped to the domain.
+    std::vector<index_t> get_region_chunks(
+        index_t jstart, index_t jstop, index_t istart, index_t istop) const;
+
+    // Return true if all points of block in rows j-1 and j have the same z-level, either below the
+    // lower level or above the upper level, and return that z-level.  Only valid if level indices
+    // have been initialised.
+    bool get_uniform_block_z_level(index_t j, index_t block, ZLevel& z_level) const;
+
     void get_point_xy(index_t point, double*& points) const;
 
+    // Chunks that are traced in the current contouring operation, in increasing order.  All
+    // chunks unless reusing the results of chunks that have not been changed by update_z().
+    const std::vector<index_t>& get_trace_chunks() const;
+
     double get_point_x(index_t point) const;
     double get_point_y(index_t point) const;
     double get_point_z(index_t point) const;
@@ -141,7 +280,48 @@ protected:
     bool has_direct_outer_offsets() const;
     bool has_direct_points() const;
 
-    void init_cache_grid(const MaskArray& mask);
+    // Whether per-chunk results are kept for reuse by subsequent calls, which is the case once
+    // update_z() has been called.
+    bool has_chunk_results() const;
+
+    // Whether returned points are float32 rather than float64.  If so, points are written to C++
+    // vectors and converted when they are exported.
+    bool has_float32_output() const;
+
+    // Whether the result cache is in use.
+    bool has_result_cache() const;
+
+    // Whether output arrays are views into reused output buffers.  Output buffers are not reused
+    // whilst results are kept by the result cache or for update_z(), as they share the arrays.
+    bool is_reusing_output_buffers() const;
+
+    // Whether the current contouring operation is filled rather than lines.
+    bool is_filled() const;
+
+    // Initialise the grid part of the cache for a single chunk, including the points on the W and
+    // S edges of the domain if it is a W or S chunk.
+    void init_cache_grid(const ChunkLocal& local);
+
+    // Clear per-point level indices, and blocks thereof, used by multi_filled.
+    void clear_level_indices();
+
+    // Release log(z) at the end of a call unless it is being kept between calls.
+    void clear_log_z();
+
+    // Calculate per-point level indices, and blocks thereof, used by multi_filled.
+    void init_level_indices(const LevelArray& levels);
+
+    // Calculate log(z) of all points if using ZInterp::Log and it has not already been calculated.
+    // Must be called whilst holding the GIL, which is released during the calculation.
+    void init_log_z();
+
+    // Calculate the cached quad middles if they are enabled and have not already been calculated,
+    // after init_log_z().  Must be called whilst holding the GIL.
+    void init_quad_middles();
+
+    // Set the cache z-levels and clear the start flags of points istart to iend inclusive of row
+    // j, using a loop that can be vectorised.
+    void init_row_z_levels(index_t j, index_t istart, index_t iend);
 
     // Either for a single chunk, or the whole domain (all chunks) if local == nullptr.
     void init_cache_levels_and_starts(const ChunkLocal* local = nullptr);
@@ -153,6 +333,9 @@ protected:
     void interp(
         index_t point0, double x1, double y1, double z1, bool is_upper, double*& points) const;
 
+    // As z_to_zlevel() for a z value in interpolation space.
+    ZLevel interp_z_to_zlevel(double interp_z) const;
+
     bool is_point_in_chunk(index_t point, const ChunkLocal& local) const;
 
     bool is_quad_in_bounds(
@@ -164,7 +347,19 @@ protected:
 
     void march_chunk(ChunkLocal& local, std::vector<py::list>& return_lists);
 
-    py::sequence march_wrapper();
+    // Contour each frame of z_stack in turn, storing the results of multi_filled() or multi_lines()
+    // in ret.  Derived classes may reimplement this to contour frames in parallel.
+    void march_frames(
+        const py::array& z_stack, const LevelArray& levels, bool filled, py::list& ret);
+
+    // Contour each of the levels (multi_lines) or pairs of adjacent levels (multi_filled) in turn,
+    // storing the results in ret.  Derived classes may reimplement this to contour levels in
+    // parallel.
+    void march_levels(const std::vector<double>& levels, py::list& ret);
+
+    // Contour the current level(s) and return the results.  If chunks is not nullptr only those
+    // chunks, in increasing order, are contoured and the results of the other chunks are None.
+    py::sequence march_wrapper(const std::vector<index_t>* chunks = nullptr);
 
     void move_to_next_boundary_edge(index_t& quad, index_t& forward, index_t& left) const;
 
@@ -172,18 +367,127 @@ protected:
     void pre_filled();
     void pre_lines();
 
+    // Set the chunks to initialise the grid of from the init chunks.
+    void set_grid_chunks();
+
     void set_look_flags(index_t hole_start_quad);
 
+    // Set the chunks to trace, and hence the chunks to initialise, to all chunks or to a subset.
+    void set_trace_chunks();
+    void set_trace_chunks(const std::vector<index_t>& chunks);
+
+    // Set the current level(s) to those at index of multi_lines or multi_filled levels.
+    void set_multi_level(const std::vector<double>& levels, index_t index);
+
+    // Temporarily use frame of z_stack, which has been validated, as z until restore_z() is
+    // called.  Does not use any Python objects so can be called without the GIL.
+    void set_z_frame(const py::array& z_stack, index_t frame);
+    void restore_z();
+
     void write_cache_quad(index_t quad) const;
 
+    // z-level of a grid point, using the level indices if they have been initialised.
+    ZLevel point_to_zlevel(index_t point) const;
+
     ZLevel z_to_zlevel(double z_value) const;
 
 
 private:
-    const CoordinateArray _x, _y, _z;
-    const double* _xptr;                   // For quick access to _x.data().
-    const double* _yptr;
-    const double* _zptr;
+    // Per-chunk results of a previous contouring operation with chunked output, reused by later
+    // calls for the same level(s) for chunks that have not been changed by update_z().
+    struct ChunkResults
+    {
+        bool filled;
+        double lower_level, upper_level;
+        std::vector<py::list> lists;  // Same layout as return lists, one item per chunk.
+        std::vector<bool> valid;      // Whether each chunk's items are up to date.
+        bool used;                    // Whether used since update_z() was last called.
+    };
+
+    // Return the chunk results for the current contouring operation, creating them if necessary.
+    ChunkResults& get_chunk_results();
+
+    // Return the chunks overlapping the region given by bounds = (j0, j1, i0, i1) of filled() or
+    // lines().  Negative indices count from the end and the region is clipped to the domain, as
+    // for Python slices.
+    std::vector<index_t> get_bounds_chunks(const py::object& bounds) const;
+
+    // Return the chunks to contour given the bounds and chunks of filled() or lines(), at least
+    // one of which is not None.  Chunks are in increasing order without duplicates.
+    std::vector<index_t> get_subset_chunks(
+        const py::object& bounds, const py::object& chunks) const;
+
+    // Result of a previous contouring operation held in the result cache.
+    struct ResultCacheEntry
+    {
+        bool filled;
+        double lower_level, upper_level;
+        py::sequence result;  // Arrays are read-only.
+        index_t nbytes;       // Approximate size of result.
+    };
+
+    // Return a copy of result that shares its arrays but not its lists and tuples, so that
+    // changing the copy does not change result.
+    static py::object copy_result(const py::handle& result);
+
+    // Make all arrays in result read-only and return the approximate size of result in bytes,
+    // which is the nbytes of its arrays plus a pointer per list or tuple and each of their items.
+    static index_t make_result_read_only(const py::handle& result);
+
+    // Evict least recently used result cache entries until their total nbytes is no more than
+    // max_nbytes, or all entries if max_nbytes is zero.
+    void trim_result_cache(index_t max_nbytes);
+
+    // Return obj as an index, raising a TypeError with message if it is a bool or not an integer.
+    static index_t as_index(const py::handle& obj, const char* message);
+
+    // Return x or y as a C-contiguous float64 or float32 array, converting other types to float64.
+    static py::array as_xy_array(const XYArray& xy);
+
+    // Return z as a float64 or float32 array, converting other types to float64.
+    static py::array as_z_array(const ZArray& z);
+
+    // Return z of set_z() as a float64 or float32 array and its mask, which has ndim == 0 if no
+    // values are masked.  The mask of a masked array and invalid values are masked, as by
+    // contour_generator().
+    std::pair<py::array, MaskArray> as_z_array_and_mask(const ZArray& z) const;
+
+    // Return whether output_dtype is float32, it must be float64 or float32.
+    static bool is_float32_dtype(const py::object& output_dtype);
+
+    // Return the float64 or float32 value at ptr as a double.
+    static double read_z_value(const char* ptr, bool float32);
+
+    // z value of a point of a z array that is not C-contiguous float64.
+    template <typename T>
+    double get_strided_point_z(index_t point) const;
+
+    // Check that unmasked z values are positive if using ZInterp::Log.
+    void check_z_positive() const;
+
+    // Set the members used to access _z, which has been validated.
+    void init_z_access();
+
+    // Validate z_stack of multi_filled_stack() or multi_lines_stack() and return it as a float64
+    // or float32 array.
+    py::array check_z_stack(const ZArray& z_stack) const;
+
+    py::list multi_stack(const ZArray& z_stack, const LevelArray& levels, bool filled);
+
+    const py::array _x, _y;                // C-contiguous float64 or float32.
+    py::array _z;                          // float64 or float32 with any strides, or a private
+                                           // float64 copy once update_z() has been called.
+                                           // Replaced by set_z().
+    const double* _xptr;                   // For quick access to _x.data() if float64,
+    const double* _yptr;                   //   otherwise nullptr.
+    const float* _xptr_float32;            // For quick access to _x.data() if float32,
+    const float* _yptr_float32;            //   otherwise nullptr.
+    const double* _zptr;                   // For quick access to _z.data() if C-contiguous
+                                           // float64, otherwise nullptr.
+    const char* _zdata;                    // For strided access to _z if _zptr is nullptr.
+    index_t _z_row_stride, _z_col_stride;  // In bytes.
+    bool _z_float32;
+    const bool _rectilinear;               // Whether x and y are 1D, of lengths _nx and _ny.
     const index_t _nx, _ny;                // Number of points in each direction.
     const index_t _n;                      // Total number of points (and quads).
     const index_t _x_chunk_size, _y_chunk_size;
@@ -194,12 +498,21 @@ private:
     const FillType _fill_type;
     const bool _quad_as_tri;
     const ZInterp _z_interp;
+    const bool _output_float32;
 
     CacheItem* _cache;
+    MaskCacheItem* _mask_cache;  // Quad existence and mask-only starts, nullptr if no mask.
+
+    // The grid part of the cache (quad existence and boundaries) is initialised lazily per chunk,
+    // the first time that each chunk is needed, and again if set_z() changes the mask.
+    MaskArray _mask;
+    std::vector<bool> _grid_chunk_initialised;
+    index_t _grid_chunk_initialised_count;
 
     // Current contouring operation.
     bool _filled;
     double _lower_level, _upper_level;
+    double _interp_lower_level, _interp_upper_level;  // In interpolation space.
 
     // Current contouring operation, based on return type and filled or lines.
     bool _identify_holes;
@@ -210,6 +523,50 @@ private:
     bool _outer_offsets_into_points;  // Otherwise into line offsets.  Only used if _identify_holes.
     bool _nan_separated;              // Whether adjacent lines' points are separated by nans.
     unsigned int _return_list_count;
+
+    // Chunks to initialise the grid of, initialise and trace in the current contouring operation.
+    std::vector<index_t> _grid_chunks, _init_chunks, _trace_chunks;
+
+    // Whether z is temporarily a frame of a z stack, for which results are not kept by the result
+    // cache or for update_z() and output buffers are not reused.
+    bool _z_frame;
+
+    // Only used once update_z() has been called.
+    bool _z_updated;
+    bool _used_since_update_z;  // Whether contoured since update_z() was last called.
+    std::vector<ChunkResults> _chunk_results;
+
+    // Result cache, most recently used entry first.
+    std::list<ResultCacheEntry> _result_cache;
+    index_t _result_cache_nbytes, _result_cache_max_nbytes;
+    index_t _result_cache_hits, _result_cache_misses;
+
+    // multi_filled only.
+    std::shared_ptr<const LevelIndices> _level_indices;  // nullptr if not in use.
+    LevelIndex _lower_level_index;                       // Index of _lower_level in levels.
+
+    // ZInterp::Log only.  log(z) of each point, so that interpolation is linear in log space.
+    // Calculated once per call, covering all levels of multi_lines and multi_filled, or kept
+    // between calls if _keep_log_z.  Read-only once calculated so can be shared between workers
+    // contouring different levels.
+    std::shared_ptr<const std::vector<double>> _log_z;  // nullptr if not in use.
+    bool _keep_log_z;
+
+    // quad_as_tri only.  Cached x and y (interleaved) and z (in interpolation space) of the middle
+    // of each quad, indexed by quad.  x and y depend only on the grid so are kept until disabled,
+    // z is released whenever z changes.  Read-only once calculated so can be shared between
+    // workers contouring different levels.
+    std::shared_ptr<const std::vector<double>> _middle_xy;  // nullptr if not in use.
+    std::shared_ptr<const std::vector<double>> _middle_z;   // nullptr if not in use.
+    bool _cache_quad_middles;
+
+    // Reusable output buffers, which are byte arrays so that any item can be used for codes or
+    // offsets.  Indexed by level (of multi_lines or multi_filled), chunk and return list.
+    bool _reuse_output_buffers;
+    std::vector<py::object> _output_buffers;
+    index_t _output_level;  // Index of current level within multi_lines or multi_filled, else 0.
+
+    bool _single_pass;      // Whether to march each chunk in a single pass.
 };
 
 } // namespace contourpy
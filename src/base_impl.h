@@ -4,7 +4,18 @@
 #include "base.h"
 #include "converter.h"
 #include "util.h"
+#include <algorithm>
+#include <cmath>
+#include <cstring>
 #include <iostream>
+#include <limits>
+#include <numeric>
+
+// SSE2 is always available on x86-64, so no runtime check is needed.
+#if defined(__SSE2__) || defined(_M_X64)
+#define CONTOURPY_SSE2
+#include <emmintrin.h>
+#endif
 
 namespace contourpy {
 
@@ -25,30 +36,39 @@ namespace contourpy {
 #define MASK_MIDDLE            (MASK_MIDDLE_Z_LEVEL_1 | MASK_MIDDLE_Z_LEVEL_2)
 #define MASK_BOUNDARY_E        (0x1 <<  4)  // E edge of quad is a boundary.
 #define MASK_BOUNDARY_N        (0x1 <<  5)  // N edge of quad is a boundary.
+#define MASK_START_E           (0x1 <<  6)  // E to N, filled and lines.
+#define MASK_START_N           (0x1 <<  7)  // N to E, filled and lines.
+#define MASK_START_BOUNDARY_E  (0x1 <<  8)  // Lines only.
+#define MASK_START_BOUNDARY_N  (0x1 <<  9)  // Lines only.
+#define MASK_START_BOUNDARY_S  (0x1 << 10)  // Filled and lines.
+#define MASK_START_BOUNDARY_W  (0x1 << 11)  // Filled and lines.
+#define MASK_ANY_START         (MASK_START_N | MASK_START_E | MASK_START_BOUNDARY_N | MASK_START_BOUNDARY_E | MASK_START_BOUNDARY_S | MASK_START_BOUNDARY_W)
+#define MASK_LOOK_N            (0x1 << 12)
+#define MASK_LOOK_S            (0x1 << 13)
+#define MASK_NO_STARTS_IN_ROW  (0x1 << 14)
+#define MASK_NO_MORE_STARTS    (0x1 << 15)
+
+// MaskCacheItem masks, only accessed directly to set.  These are only needed if there is a mask,
+// otherwise all quads not on the W or S edges of the domain exist and there are no hole or corner
+// starts.
 // EXISTS_QUAD bit is always used, but the 4 EXISTS_CORNER are only used if _corner_mask is true.
 // Only one of EXISTS_QUAD or EXISTS_??_CORNER is ever set per quad.
-#define MASK_EXISTS_QUAD       (0x1 <<  6)  // All of quad exists (is not masked).
-#define MASK_EXISTS_NE_CORNER  (0x1 <<  7)  // NE corner exists, SW corner is masked.
-#define MASK_EXISTS_NW_CORNER  (0x1 <<  8)
-#define MASK_EXISTS_SE_CORNER  (0x1 <<  9)
-#define MASK_EXISTS_SW_CORNER  (0x1 << 10)
+#define MASK_EXISTS_QUAD       (0x1 <<  0)  // All of quad exists (is not masked).
+#define MASK_EXISTS_NE_CORNER  (0x1 <<  1)  // NE corner exists, SW corner is masked.
+#define MASK_EXISTS_NW_CORNER  (0x1 <<  2)
+#define MASK_EXISTS_SE_CORNER  (0x1 <<  3)
+#define MASK_EXISTS_SW_CORNER  (0x1 <<  4)
 #define MASK_EXISTS_ANY_CORNER (MASK_EXISTS_NE_CORNER | MASK_EXISTS_NW_CORNER | MASK_EXISTS_SE_CORNER | MASK_EXISTS_SW_CORNER)
 #define MASK_EXISTS_ANY        (MASK_EXISTS_QUAD | MASK_EXISTS_ANY_CORNER)
-#define MASK_START_E           (0x1 << 11)  // E to N, filled and lines.
-#define MASK_START_N           (0x1 << 12)  // N to E, filled and lines.
-#define MASK_START_BOUNDARY_E  (0x1 << 13)  // Lines only.
-#define MASK_START_BOUNDARY_N  (0x1 << 14)  // Lines only.
-#define MASK_START_BOUNDARY_S  (0x1 << 15)  // Filled and lines.
-#define MASK_START_BOUNDARY_W  (0x1 << 16)  // Filled and lines.
-#define MASK_START_CORNER      (0x1 << 18)  // Filled and lines.
-#define MASK_START_HOLE_N      (0x1 << 17)  // N boundary of EXISTS, E to W, filled only.
-#define MASK_ANY_START         (MASK_START_N | MASK_START_E | MASK_START_BOUNDARY_N | MASK_START_BOUNDARY_E | MASK_START_BOUNDARY_S | MASK_START_BOUNDARY_W | MASK_START_HOLE_N | MASK_START_CORNER)
-#define MASK_LOOK_N            (0x1 << 19)
-#define MASK_LOOK_S            (0x1 << 20)
-#define MASK_NO_STARTS_IN_ROW  (0x1 << 21)
-#define MASK_NO_MORE_STARTS    (0x1 << 22)
-
-// Accessors for various CacheItem masks.
+#define MASK_START_HOLE_N      (0x1 <<  5)  // N boundary of EXISTS, E to W, filled only.
+#define MASK_START_CORNER      (0x1 <<  6)  // Filled and lines.
+#define MASK_ANY_MASK_START    (MASK_START_HOLE_N | MASK_START_CORNER)
+
+// MaskCacheItem of quad, or that of an unmasked quad if there is no mask.
+#define MASK_CACHE(quad)           (_mask_cache == nullptr ? MASK_EXISTS_QUAD : _mask_cache[quad])
+
+// Accessors for various CacheItem and MaskCacheItem masks.  EXISTS accessors are only valid for
+// quads that are not on the W or S edges of the domain.
 #define Z_LEVEL(quad)              (_cache[quad] & MASK_Z_LEVEL)
 #define Z_NE                       Z_LEVEL(POINT_NE)
 #define Z_NW                       Z_LEVEL(POINT_NW)
@@ -59,17 +79,17 @@ namespace contourpy {
 #define BOUNDARY_N(quad)           (_cache[quad] & MASK_BOUNDARY_N)
 #define BOUNDARY_S(quad)           (_cache[quad-_nx] & MASK_BOUNDARY_N)
 #define BOUNDARY_W(quad)           (_cache[quad-1] & MASK_BOUNDARY_E)
-#define EXISTS_QUAD(quad)          (_cache[quad] & MASK_EXISTS_QUAD)
-#define EXISTS_NE_CORNER(quad)     (_cache[quad] & MASK_EXISTS_NE_CORNER)
-#define EXISTS_NW_CORNER(quad)     (_cache[quad] & MASK_EXISTS_NW_CORNER)
-#define EXISTS_SE_CORNER(quad)     (_cache[quad] & MASK_EXISTS_SE_CORNER)
-#define EXISTS_SW_CORNER(quad)     (_cache[quad] & MASK_EXISTS_SW_CORNER)
-#define EXISTS_ANY(quad)           (_cache[quad] & MASK_EXISTS_ANY)
-#define EXISTS_ANY_CORNER(quad)    (_cache[quad] & MASK_EXISTS_ANY_CORNER)
-#define EXISTS_E_EDGE(quad)        (_cache[quad] & (MASK_EXISTS_QUAD | MASK_EXISTS_NE_CORNER | MASK_EXISTS_SE_CORNER))
-#define EXISTS_N_EDGE(quad)        (_cache[quad] & (MASK_EXISTS_QUAD | MASK_EXISTS_NW_CORNER | MASK_EXISTS_NE_CORNER))
-#define EXISTS_S_EDGE(quad)        (_cache[quad] & (MASK_EXISTS_QUAD | MASK_EXISTS_SW_CORNER | MASK_EXISTS_SE_CORNER))
-#define EXISTS_W_EDGE(quad)        (_cache[quad] & (MASK_EXISTS_QUAD | MASK_EXISTS_NW_CORNER | MASK_EXISTS_SW_CORNER))
+#define EXISTS_QUAD(quad)          (MASK_CACHE(quad) & MASK_EXISTS_QUAD)
+#define EXISTS_NE_CORNER(quad)     (MASK_CACHE(quad) & MASK_EXISTS_NE_CORNER)
+#define EXISTS_NW_CORNER(quad)     (MASK_CACHE(quad) & MASK_EXISTS_NW_CORNER)
+#define EXISTS_SE_CORNER(quad)     (MASK_CACHE(quad) & MASK_EXISTS_SE_CORNER)
+#define EXISTS_SW_CORNER(quad)     (MASK_CACHE(quad) & MASK_EXISTS_SW_CORNER)
+#define EXISTS_ANY(quad)           (MASK_CACHE(quad) & MASK_EXISTS_ANY)
+#define EXISTS_ANY_CORNER(quad)    (MASK_CACHE(quad) & MASK_EXISTS_ANY_CORNER)
+#define EXISTS_E_EDGE(quad)        (MASK_CACHE(quad) & (MASK_EXISTS_QUAD | MASK_EXISTS_NE_CORNER | MASK_EXISTS_SE_CORNER))
+#define EXISTS_N_EDGE(quad)        (MASK_CACHE(quad) & (MASK_EXISTS_QUAD | MASK_EXISTS_NW_CORNER | MASK_EXISTS_NE_CORNER))
+#define EXISTS_S_EDGE(quad)        (MASK_CACHE(quad) & (MASK_EXISTS_QUAD | MASK_EXISTS_SW_CORNER | MASK_EXISTS_SE_CORNER))
+#define EXISTS_W_EDGE(quad)        (MASK_CACHE(quad) & (MASK_EXISTS_QUAD | MASK_EXISTS_NW_CORNER | MASK_EXISTS_SW_CORNER))
 // Note that EXISTS_NE_CORNER(quad) is equivalent to BOUNDARY_SW(quad), etc.
 #define START_E(quad)              (_cache[quad] & MASK_START_E)
 #define START_N(quad)              (_cache[quad] & MASK_START_N)
@@ -77,9 +97,10 @@ namespace contourpy {
 #define START_BOUNDARY_N(quad)     (_cache[quad] & MASK_START_BOUNDARY_N)
 #define START_BOUNDARY_S(quad)     (_cache[quad] & MASK_START_BOUNDARY_S)
 #define START_BOUNDARY_W(quad)     (_cache[quad] & MASK_START_BOUNDARY_W)
-#define START_CORNER(quad)         (_cache[quad] & MASK_START_CORNER)
-#define START_HOLE_N(quad)         (_cache[quad] & MASK_START_HOLE_N)
-#define ANY_START(quad)            ((_cache[quad] & MASK_ANY_START) != 0)
+#define START_CORNER(quad)         (MASK_CACHE(quad) & MASK_START_CORNER)
+#define START_HOLE_N(quad)         (MASK_CACHE(quad) & MASK_START_HOLE_N)
+#define ANY_START(quad)            ((_cache[quad] & MASK_ANY_START) != 0 || \
+                                    (_mask_cache != nullptr && (_mask_cache[quad] & MASK_ANY_MASK_START) != 0))
 #define LOOK_N(quad)               (_cache[quad] & MASK_LOOK_N)
 #define LOOK_S(quad)               (_cache[quad] & MASK_LOOK_S)
 #define NO_STARTS_IN_ROW(quad)     (_cache[quad] & MASK_NO_STARTS_IN_ROW)
@@ -87,18 +108,31 @@ namespace contourpy {
 // Contour line/fill goes to the left or right of quad middle (quad_as_tri only).
 #define LEFT_OF_MIDDLE(quad, is_upper) (MIDDLE_Z_LEVEL(quad) == (is_upper ? 2 : 0))
 
+// Number of quads in each row of a level block (multi_filled only).
+#define LEVEL_BLOCK_SIZE 32
+
 
 template <typename Derived>
 BaseContourGenerator<Derived>::BaseContourGenerator(
-    const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+    const XYArray& x, const XYArray& y, const ZArray& z,
     const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size)
-    : _x(x),
-      _y(y),
-      _z(z),
-      _xptr(_x.data()),
-      _yptr(_y.data()),
-      _zptr(_z.data()),
+    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+    const py::object& output_dtype)
+    : _x(as_xy_array(x)),
+      _y(as_xy_array(y)),
+      _z(as_z_array(z)),
+      _xptr(py::isinstance<py::array_t<double>>(_x) ?
+            static_cast<const double*>(_x.data()) : nullptr),
+      _yptr(py::isinstance<py::array_t<double>>(_y) ?
+            static_cast<const double*>(_y.data()) : nullptr),
+      _xptr_float32(_xptr == nullptr ? static_cast<const float*>(_x.data()) : nullptr),
+      _yptr_float32(_yptr == nullptr ? static_cast<const float*>(_y.data()) : nullptr),
+      _zptr(nullptr),
+      _zdata(nullptr),
+      _z_row_stride(0),
+      _z_col_stride(0),
+      _z_float32(false),
+      _rectilinear(_x.ndim() == 1 && _y.ndim() == 1),
       _nx(_z.ndim() > 1 ? _z.shape(1) : 0),
       _ny(_z.ndim() > 0 ? _z.shape(0) : 0),
       _n(_nx*_ny),
@@ -112,10 +146,16 @@ BaseContourGenerator<Derived>::BaseContourGenerator(
       _fill_type(fill_type),
       _quad_as_tri(quad_as_tri),
       _z_interp(z_interp),
+      _output_float32(is_float32_dtype(output_dtype)),
       _cache(new CacheItem[_n]),
+      _mask_cache(mask.ndim() == 0 ? nullptr : new MaskCacheItem[_n]),
+      _mask(mask),
+      _grid_chunk_initialised_count(0),
       _filled(false),
       _lower_level(0.0),
       _upper_level(0.0),
+      _interp_lower_level(0.0),
+      _interp_upper_level(0.0),
       _identify_holes(false),
       _output_chunked(false),
       _direct_points(false),
@@ -123,13 +163,31 @@ BaseContourGenerator<Derived>::BaseContourGenerator(
       _direct_outer_offsets(false),
       _outer_offsets_into_points(false),
       _nan_separated(false),
-      _return_list_count(0)
+      _return_list_count(0),
+      _z_frame(false),
+      _z_updated(false),
+      _used_since_update_z(false),
+      _result_cache_nbytes(0),
+      _result_cache_max_nbytes(0),
+      _result_cache_hits(0),
+      _result_cache_misses(0),
+      _lower_level_index(0),
+      _keep_log_z(false),
+      _cache_quad_middles(false),
+      _reuse_output_buffers(false),
+      _output_level(0),
+      _single_pass(false)
 {
-    if (_x.ndim() != 2 || _y.ndim() != 2 || _z.ndim() != 2)
-        throw std::invalid_argument("x, y and z must all be 2D arrays");
+    if (_z.ndim() != 2 || (!_rectilinear && (_x.ndim() != 2 || _y.ndim() != 2)))
+        throw std::invalid_argument("x, y and z must all be 2D arrays, or x and y both 1D");
 
-    if (_x.shape(1) != _nx || _x.shape(0) != _ny ||
-        _y.shape(1) != _nx || _y.shape(0) != _ny)
+    if (_rectilinear) {
+        if (_x.shape(0) != _nx || _y.shape(0) != _ny)
+            throw std::invalid_argument(
+                "1D x and y arrays must have lengths matching the number of columns and rows of z");
+    }
+    else if (_x.shape(1) != _nx || _x.shape(0) != _ny ||
+             _y.shape(1) != _nx || _y.shape(0) != _ny)
         throw std::invalid_argument("x, y and z arrays must have the same shape");
 
     if (_nx < 2 || _ny < 2)
@@ -153,49 +211,254 @@ BaseContourGenerator<Derived>::BaseContourGenerator(
     if (x_chunk_size < 0 || y_chunk_size < 0)
         throw std::invalid_argument("x_chunk_size and y_chunk_size cannot be negative");
 
-    if (_z_interp == ZInterp::Log) {
-        const bool* mask_ptr = (mask.ndim() == 0 ? nullptr : mask.data());
-        for (index_t point = 0; point < _n; ++point) {
-            if ( (mask_ptr == nullptr || !mask_ptr[point]) && _zptr[point] <= 0.0)
-                throw std::invalid_argument("z values must be positive if using ZInterp.Log");
-        }
-    }
+    init_z_access();
+    check_z_positive();
+
+    // The grid part of the cache is initialised lazily per chunk when contouring.
+    _grid_chunk_initialised.assign(_n_chunks, false);
+}
 
-    init_cache_grid(mask);
+template <typename Derived>
+BaseContourGenerator<Derived>::BaseContourGenerator(
+    const BaseContourGenerator& other, WorkerTag)
+    : _x(other._x),
+      _y(other._y),
+      _z(other._z),
+      _xptr(other._xptr),
+      _yptr(other._yptr),
+      _xptr_float32(other._xptr_float32),
+      _yptr_float32(other._yptr_float32),
+      _zptr(other._zptr),
+      _zdata(other._zdata),
+      _z_row_stride(other._z_row_stride),
+      _z_col_stride(other._z_col_stride),
+      _z_float32(other._z_float32),
+      _rectilinear(other._rectilinear),
+      _nx(other._nx),
+      _ny(other._ny),
+      _n(other._n),
+      _x_chunk_size(other._x_chunk_size),
+      _y_chunk_size(other._y_chunk_size),
+      _nx_chunks(other._nx_chunks),
+      _ny_chunks(other._ny_chunks),
+      _n_chunks(other._n_chunks),
+      _corner_mask(other._corner_mask),
+      _line_type(other._line_type),
+      _fill_type(other._fill_type),
+      _quad_as_tri(other._quad_as_tri),
+      _z_interp(other._z_interp),
+      _output_float32(other._output_float32),
+      _cache(new CacheItem[_n]),
+      _mask_cache(other._mask_cache == nullptr ? nullptr : new MaskCacheItem[_n]),
+      _mask(other._mask),
+      _grid_chunk_initialised(other._grid_chunk_initialised),
+      _grid_chunk_initialised_count(other._grid_chunk_initialised_count),
+      _filled(other._filled),
+      _lower_level(other._lower_level),
+      _upper_level(other._upper_level),
+      _interp_lower_level(other._interp_lower_level),
+      _interp_upper_level(other._interp_upper_level),
+      _identify_holes(other._identify_holes),
+      _output_chunked(other._output_chunked),
+      _direct_points(other._direct_points),
+      _direct_line_offsets(other._direct_line_offsets),
+      _direct_outer_offsets(other._direct_outer_offsets),
+      _outer_offsets_into_points(other._outer_offsets_into_points),
+      _nan_separated(other._nan_separated),
+      _return_list_count(other._return_list_count),
+      _z_frame(other._z_frame),
+      _z_updated(false),
+      _used_since_update_z(false),
+      _result_cache_nbytes(0),
+      _result_cache_max_nbytes(0),
+      _result_cache_hits(0),
+      _result_cache_misses(0),
+      _level_indices(other._level_indices),
+      _lower_level_index(other._lower_level_index),
+      _log_z(other._log_z),
+      _keep_log_z(other._keep_log_z),
+      _middle_xy(other._middle_xy),
+      _middle_z(other._middle_z),
+      _cache_quad_middles(other._cache_quad_middles),
+      _reuse_output_buffers(false),
+      _output_level(0),
+      _single_pass(other._single_pass)
+{
+    // Only the grid part of the cache of chunks that have already been initialised is needed, the
+    // z-levels and starts are recalculated for each level.
+    std::copy(other._cache, other._cache + _n, _cache);
+    if (_mask_cache != nullptr)
+        std::copy(other._mask_cache, other._mask_cache + _n, _mask_cache);
 }
 
 template <typename Derived>
 BaseContourGenerator<Derived>::~BaseContourGenerator()
 {
     delete [] _cache;
+    delete [] _mask_cache;
+}
+
+template <typename Derived>
+index_t BaseContourGenerator<Derived>::as_index(const py::handle& obj, const char* message)
+{
+    // bool is an int subclass but is rejected to avoid True being used as index 1.
+    if (py::isinstance<py::bool_>(obj))
+        throw py::type_error(message);
+
+    auto index = py::reinterpret_steal<py::object>(PyNumber_Index(obj.ptr()));
+    if (!index) {
+        PyErr_Clear();
+        throw py::type_error(message);
+    }
+    return index.cast<index_t>();
+}
+
+template <typename Derived>
+py::array BaseContourGenerator<Derived>::as_xy_array(const XYArray& xy)
+{
+    if ((py::isinstance<py::array_t<double>>(xy) || py::isinstance<py::array_t<float>>(xy)) &&
+        (py::reinterpret_borrow<py::array>(xy).flags() & py::array::c_style) != 0)
+        return py::reinterpret_borrow<py::array>(xy);
+    else
+        return CoordinateArray(xy);
+}
+
+template <typename Derived>
+py::array BaseContourGenerator<Derived>::as_z_array(const ZArray& z)
+{
+    if (py::isinstance<py::array_t<double>>(z) || py::isinstance<py::array_t<float>>(z))
+        return py::reinterpret_borrow<py::array>(z);
+    else
+        return CoordinateArray(z);
+}
+
+template <typename Derived>
+std::pair<py::array, MaskArray> BaseContourGenerator<Derived>::as_z_array_and_mask(
+    const ZArray& z) const
+{
+    auto masked_array_type = py::module_::import("numpy.ma").attr("MaskedArray");
+    bool is_masked = py::isinstance(z, masked_array_type);
+    auto new_z = as_z_array(is_masked ? py::object(z.attr("data")) : z);
+    if (new_z.ndim() != 2 || new_z.shape(0) != _ny || new_z.shape(1) != _nx)
+        throw std::invalid_argument("z must be a 2D array with the same shape as the current z");
+
+    // The mask of a masked array has ndim == 0 if it is np.ma.nomask.
+    MaskArray given_mask = is_masked ? MaskArray(z.attr("mask")) : MaskArray(py::none());
+    const bool* given_ptr = (given_mask.ndim() == 0 ? nullptr : given_mask.data());
+
+    MaskArray mask(std::vector<py::ssize_t>{_ny, _nx});
+    auto mask_ptr = mask.mutable_data();
+    bool any_masked = false;
+    bool float32 = py::isinstance<py::array_t<float>>(new_z);
+    auto data = static_cast<const char*>(new_z.data());
+    for (index_t j = 0; j < _ny; ++j) {
+        for (index_t i = 0; i < _nx; ++i) {
+            auto point = j*_nx + i;
+            auto value = read_z_value(data + j*new_z.strides(0) + i*new_z.strides(1), float32);
+            mask_ptr[point] = (given_ptr != nullptr && given_ptr[point]) || !std::isfinite(value);
+            any_masked = any_masked || mask_ptr[point];
+        }
+    }
+
+    return {new_z, any_masked ? mask : MaskArray(py::none())};
 }
 
 template <typename Derived>
 typename BaseContourGenerator<Derived>::ZLevel
     BaseContourGenerator<Derived>::calc_and_set_middle_z_level(index_t quad)
 {
-    ZLevel zlevel = z_to_zlevel(calc_middle_z(quad));
+    ZLevel zlevel = interp_z_to_zlevel(calc_middle_z(quad));
     _cache[quad] |= (zlevel << 2);
     return zlevel;
 }
 
+template <typename Derived>
+typename BaseContourGenerator<Derived>::MaskCacheItem
+    BaseContourGenerator<Derived>::calc_mask_cache_item(index_t quad) const
+{
+    assert(_mask_cache != nullptr && "Only valid if there is a mask");
+
+    if (quad % _nx == 0 || quad < _nx)
+        return 0;  // Quads on W or S edges of domain do not exist.
+
+    const bool* mask_ptr = _mask.data();
+    unsigned int config = (mask_ptr[POINT_NW] << 3) |
+                          (mask_ptr[POINT_NE] << 2) |
+                          (mask_ptr[POINT_SW] << 1) |
+                          (mask_ptr[POINT_SE] << 0);
+    if (_corner_mask) {
+        switch (config) {
+            case 0: return MASK_EXISTS_QUAD;
+            case 1: return MASK_EXISTS_NW_CORNER;
+            case 2: return MASK_EXISTS_NE_CORNER;
+            case 4: return MASK_EXISTS_SW_CORNER;
+            case 8: return MASK_EXISTS_SE_CORNER;
+            default: return 0;  // Quad is masked out.
+        }
+    }
+    else
+        return (config == 0) ? MASK_EXISTS_QUAD : 0;
+}
+
 template <typename Derived>
 double BaseContourGenerator<Derived>::calc_middle_z(index_t quad) const
 {
     assert(quad >= 0 && quad < _n);
 
-    switch (_z_interp) {
-        case ZInterp::Log:
-            return exp(0.25*(log(get_point_z(POINT_SW)) +
-                             log(get_point_z(POINT_SE)) +
-                             log(get_point_z(POINT_NW)) +
-                             log(get_point_z(POINT_NE))));
-        default:  // ZInterp::Linear
-            return 0.25*(get_point_z(POINT_SW) +
-                         get_point_z(POINT_SE) +
-                         get_point_z(POINT_NW) +
-                         get_point_z(POINT_NE));
+    if (_middle_z)
+        return (*_middle_z)[quad];
+
+    return 0.25*(get_interp_z(POINT_SW) +
+                 get_interp_z(POINT_SE) +
+                 get_interp_z(POINT_NW) +
+                 get_interp_z(POINT_NE));
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::check_z_positive() const
+{
+    if (_z_interp == ZInterp::Log) {
+        const bool* mask_ptr = (_mask.ndim() == 0 ? nullptr : _mask.data());
+        for (index_t point = 0; point < _n; ++point) {
+            if ( (mask_ptr == nullptr || !mask_ptr[point]) && get_point_z(point) <= 0.0)
+                throw std::invalid_argument("z values must be positive if using ZInterp.Log");
+        }
+    }
+}
+
+template <typename Derived>
+py::array BaseContourGenerator<Derived>::check_z_stack(const ZArray& z_stack) const
+{
+    auto stack = as_z_array(z_stack);
+    if (stack.ndim() != 3 || stack.shape(1) != _ny || stack.shape(2) != _nx)
+        throw std::invalid_argument(
+            "z_stack must be a 3D array with the shape of z in its last two dimensions");
+
+    // Every frame uses the mask of z, so unmasked values must be finite, and positive if using
+    // ZInterp::Log.
+    const bool* mask_ptr = (_mask.ndim() == 0 ? nullptr : _mask.data());
+    bool log = (_z_interp == ZInterp::Log);
+    auto n_frames = static_cast<index_t>(stack.shape(0));
+    bool float32 = py::isinstance<py::array_t<float>>(stack);
+    auto data = static_cast<const char*>(stack.data());
+    for (index_t frame = 0; frame < n_frames; ++frame) {
+        for (index_t point = 0; point < _n; ++point) {
+            if (mask_ptr != nullptr && mask_ptr[point])
+                continue;
+
+            auto ptr = data + frame*stack.strides(0) + (point / _nx)*stack.strides(1) +
+                (point % _nx)*stack.strides(2);
+            auto z = read_z_value(ptr, float32);
+
+            if (!std::isfinite(z))
+                throw std::invalid_argument(
+                    "z_stack cannot contain NaN or infinity at points that are not masked");
+            if (log && z <= 0.0)
+                throw std::invalid_argument("z values must be positive if using ZInterp.Log");
+        }
     }
+
+    return stack;
 }
 
 template <typename Derived>
@@ -256,6 +519,37 @@ void BaseContourGenerator<Derived>::check_consistent_counts(const ChunkLocal& lo
     }
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::clear_level_indices()
+{
+    // Memory is released when the last worker sharing the level indices has finished with them.
+    _level_indices.reset();
+    _lower_level_index = 0;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::clear_log_z()
+{
+    // Memory is released when the last worker sharing log(z) has finished with it.
+    if (!_keep_log_z || _z_frame)
+        _log_z.reset();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::clear_output_buffers()
+{
+    _output_buffers.clear();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::clear_result_cache()
+{
+    _result_cache.clear();
+    _result_cache_nbytes = 0;
+    _result_cache_hits = 0;
+    _result_cache_misses = 0;
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::closed_line(
     const Location& start_location, OuterOrHole outer_or_hole, ChunkLocal& local)
@@ -277,8 +571,10 @@ void BaseContourGenerator<Derived>::closed_line(
         location.on_boundary = !location.on_boundary;
     }
 
-    if (local.pass > 0) {
-        assert(local.line_offsets.current = local.line_offsets.start + local.line_count);
+    if (local.pass > 0 || local.single_pass) {
+        if (local.single_pass)
+            local.line_offsets.ensure_space(1);
+        assert(local.line_offsets.current == local.line_offsets.start + local.line_count);
         *local.line_offsets.current++ = local.total_point_count;
         if (outer_or_hole == Outer && _identify_holes) {
             assert(local.outer_offsets.current ==
@@ -334,6 +630,56 @@ void BaseContourGenerator<Derived>::closed_line_wrapper(
     }
 }
 
+template <typename Derived>
+template <typename T>
+py::array_t<T> BaseContourGenerator<Derived>::create_output_array(
+    index_t chunk, index_t list_index, count_t shape0, count_t shape1)
+{
+    std::vector<index_t> shape{static_cast<index_t>(shape0)};
+    if (shape1 > 0)
+        shape.push_back(static_cast<index_t>(shape1));
+
+    if (!is_reusing_output_buffers())
+        return py::array_t<T>(shape);
+
+    auto index = static_cast<std::size_t>((_output_level*_n_chunks + chunk)*3 + list_index);
+    if (index >= _output_buffers.size())
+        _output_buffers.resize(index + 1);
+
+    auto& buffer = _output_buffers[index];
+    auto nbytes = static_cast<index_t>(shape0*std::max<count_t>(shape1, 1)*sizeof(T));
+    auto capacity = buffer ? py::reinterpret_borrow<py::array>(buffer).nbytes() : 0;
+    if (capacity < nbytes) {
+        // Grow geometrically so that gradually increasing sizes do not reallocate every call.
+        // Arrays returned by previous calls keep the old buffer alive for as long as they need it.
+        buffer = py::array_t<uint8_t>(std::max(nbytes, capacity + capacity/2));
+    }
+
+    auto data = reinterpret_cast<T*>(py::reinterpret_borrow<py::array>(buffer).mutable_data());
+    return py::array_t<T>(shape, data, buffer);
+}
+
+template <typename Derived>
+py::object BaseContourGenerator<Derived>::copy_result(const py::handle& result)
+{
+    if (py::isinstance<py::list>(result)) {
+        auto list = py::reinterpret_borrow<py::list>(result);
+        py::list copy(list.size());
+        for (std::size_t i = 0; i < list.size(); ++i)
+            copy[i] = copy_result(list[i]);
+        return std::move(copy);
+    }
+    else if (py::isinstance<py::tuple>(result)) {
+        auto tuple = py::reinterpret_borrow<py::tuple>(result);
+        py::tuple copy(tuple.size());
+        for (std::size_t i = 0; i < tuple.size(); ++i)
+            copy[i] = copy_result(tuple[i]);
+        return std::move(copy);
+    }
+    else
+        return py::reinterpret_borrow<py::object>(result);
+}
+
 template <typename Derived>
 FillType BaseContourGenerator<Derived>::default_fill_type()
 {
@@ -358,7 +704,27 @@ py::tuple BaseContourGenerator<Derived>::filled(double lower_level, double upper
 
     _lower_level = lower_level;
     _upper_level = upper_level;
-    return march_wrapper();
+    auto ret = march_wrapper();
+    clear_log_z();
+    return ret;
+}
+
+template <typename Derived>
+py::tuple BaseContourGenerator<Derived>::filled(
+    double lower_level, double upper_level, const py::object& bounds, const py::object& chunks)
+{
+    if (bounds.is_none() && chunks.is_none())
+        return filled(lower_level, upper_level);
+
+    check_levels(lower_level, upper_level);
+    auto subset_chunks = get_subset_chunks(bounds, chunks);
+    pre_filled();
+
+    _lower_level = lower_level;
+    _upper_level = upper_level;
+    auto ret = march_wrapper(&subset_chunks);
+    clear_log_z();
+    return ret;
 }
 
 template <typename Derived>
@@ -412,6 +778,8 @@ bool BaseContourGenerator<Derived>::follow_boundary(
     auto start_forward = start_location.forward;
     auto start_left = start_location.left;
     auto pass = local.pass;
+    auto single_pass = local.single_pass;
+    bool write_points = (pass > 0 || single_pass);
     double*& points = local.points.current;
 
     auto start_point = get_boundary_start_point(location);
@@ -426,7 +794,9 @@ bool BaseContourGenerator<Derived>::follow_boundary(
     // Add new point, somewhere along start line.  May be at start point of edge if this is a
     // boundary start.
     point_count++;
-    if (pass > 0) {
+    if (write_points) {
+        if (single_pass)
+            local.points.ensure_space(2);
         if (start_z == 1)
             get_point_xy(start_point, points);
         else  // start_z != 1
@@ -461,7 +831,7 @@ bool BaseContourGenerator<Derived>::follow_boundary(
             else if (left == -_nx) {
                 if (START_HOLE_N(quad)) {
                     assert(forward == -1);
-                    _cache[quad] &= ~MASK_START_HOLE_N;
+                    _mask_cache[quad] &= ~MASK_START_HOLE_N;
                 }
             }
             else {
@@ -469,25 +839,25 @@ bool BaseContourGenerator<Derived>::follow_boundary(
                     case MASK_EXISTS_NE_CORNER:
                         if (left == _nx+1) {
                             assert(forward == -_nx+1);
-                            _cache[quad] &= ~MASK_START_CORNER;
+                            _mask_cache[quad] &= ~MASK_START_CORNER;
                         }
                         break;
                     case MASK_EXISTS_NW_CORNER:
                         if (forward == _nx+1) {
                             assert(left == _nx-1);
-                            _cache[quad] &= ~MASK_START_CORNER;
+                            _mask_cache[quad] &= ~MASK_START_CORNER;
                         }
                         break;
                     case MASK_EXISTS_SE_CORNER:
                         if (forward == -_nx-1) {
                             assert(left == -_nx+1);
-                            _cache[quad] &= ~MASK_START_CORNER;
+                            _mask_cache[quad] &= ~MASK_START_CORNER;
                         }
                         break;
                     case MASK_EXISTS_SW_CORNER:
                         if (left == -_nx-1) {
                             assert(forward == _nx-1);
-                            _cache[quad] &= ~MASK_START_CORNER;
+                            _mask_cache[quad] &= ~MASK_START_CORNER;
                         }
                         break;
                     default:
@@ -508,7 +878,9 @@ bool BaseContourGenerator<Derived>::follow_boundary(
 
         // Add end point.
         point_count++;
-        if (pass > 0) {
+        if (write_points) {
+            if (single_pass)
+                local.points.ensure_space(2);
             get_point_xy(end_point, points);
 
             if (LOOK_N(quad) && _identify_holes &&
@@ -551,6 +923,8 @@ bool BaseContourGenerator<Derived>::follow_interior(
     auto start_forward = start_location.forward;
     auto start_left = start_location.left;
     auto pass = local.pass;
+    auto single_pass = local.single_pass;
+    bool write_points = (pass > 0 || single_pass);
     double*& points = local.points.current;
 
     // left direction, and indices of points on entry edge.
@@ -565,8 +939,12 @@ bool BaseContourGenerator<Derived>::follow_interior(
         assert(is_point_in_chunk(left_point, local));
         assert(is_point_in_chunk(right_point, local));
 
-        if (pass > 0)
+        if (write_points) {
+            // Maximum of 5 points per quad: entry, 3 quad_as_tri and boundary exit.
+            if (single_pass)
+                local.points.ensure_space(10);
             interp(left_point, right_point, is_upper, points);
+        }
         point_count++;
 
         if (quad == start_quad && forward == start_forward &&
@@ -657,23 +1035,27 @@ bool BaseContourGenerator<Derived>::follow_interior(
                 (is_upper ? Z_NE > 0 : Z_NE < 2)) {
                 _cache[quad] &= ~MASK_START_E;  // E high if is_upper else low.
 
-                if (!_filled && quad < start_location.quad)
-                    // Already counted points from here onwards.
+                if (!_filled && quad < start_location.quad &&
+                    !(single_pass && start_location.on_boundary))
+                    // Already counted points from here onwards, or if single_pass this is part of
+                    // a line strip that is traced later from the boundary.
                     break;
             }
             else if (START_N(quad) && forward == -_nx && left == 1 &&
                      direction == Direction::Left && (is_upper ? Z_NW > 0 : Z_NW < 2)) {
                 _cache[quad] &= ~MASK_START_N;  // E high if is_upper else low.
 
-                if (!_filled && quad < start_location.quad)
-                    // Already counted points from here onwards.
+                if (!_filled && quad < start_location.quad &&
+                    !(single_pass && start_location.on_boundary))
+                    // Already counted points from here onwards, or if single_pass this is part of
+                    // a line strip that is traced later from the boundary.
                     break;
             }
         }
 
         // Extra quad_as_tri points.
         if (_quad_as_tri && EXISTS_QUAD(quad)) {
-            if (pass == 0) {
+            if (!write_points) {
                 switch (direction) {
                     case Direction::Left:
                         point_count += (LEFT_OF_MIDDLE(quad, is_upper) ? 1 : 3);
@@ -686,7 +1068,7 @@ bool BaseContourGenerator<Derived>::follow_interior(
                         break;
                 }
             }
-            else {  // pass == 1
+            else {
                 auto mid_x = get_middle_x(quad);
                 auto mid_y = get_middle_y(quad);
                 auto mid_z = calc_middle_z(quad);
@@ -827,7 +1209,7 @@ bool BaseContourGenerator<Derived>::follow_interior(
         if (reached_boundary) {
             if (!_filled) {
                 point_count++;
-                if (pass > 0)
+                if (write_points)
                     interp(left_point, right_point, false, points);
             }
             break;
@@ -892,6 +1274,36 @@ index_t BaseContourGenerator<Derived>::get_boundary_start_point(const Location&
     return start_point;
 }
 
+template <typename Derived>
+std::vector<index_t> BaseContourGenerator<Derived>::get_bounds_chunks(
+    const py::object& bounds) const
+{
+    const char* message = "bounds must be None or a tuple of 4 ints (j0, j1, i0, i1)";
+    if (!py::isinstance<py::sequence>(bounds) || py::isinstance<py::str>(bounds))
+        throw py::type_error(message);
+
+    auto sequence = py::reinterpret_borrow<py::sequence>(bounds);
+    if (sequence.size() != 4)
+        throw std::invalid_argument(message);
+
+    index_t indices[4];
+    for (int k = 0; k < 4; ++k)
+        indices[k] = as_index(sequence[k], message);
+
+    py::slice row_slice(indices[0], indices[1], 1);
+    py::slice col_slice(indices[2], indices[3], 1);
+
+    py::ssize_t jstart, jstop, jstep, nj, istart, istop, istep, ni;
+    if (!row_slice.compute(_ny, &jstart, &jstop, &jstep, &nj) ||
+        !col_slice.compute(_nx, &istart, &istop, &istep, &ni))
+        throw py::error_already_set();
+
+    if (nj == 0 || ni == 0)
+        return {};
+
+    return get_region_chunks(jstart, jstop, istart, istop);
+}
+
 template <typename Derived>
 py::tuple BaseContourGenerator<Derived>::get_chunk_count() const
 {
@@ -915,6 +1327,28 @@ void BaseContourGenerator<Derived>::get_chunk_limits(index_t chunk, ChunkLocal&
     local.jend = (jchunk < _ny_chunks-1 ? (jchunk+1)*_y_chunk_size : _ny-1);
 }
 
+template <typename Derived>
+typename BaseContourGenerator<Derived>::ChunkResults&
+    BaseContourGenerator<Derived>::get_chunk_results()
+{
+    for (auto& results : _chunk_results) {
+        if (results.filled == _filled && results.lower_level == _lower_level &&
+            results.upper_level == _upper_level)
+            return results;
+    }
+
+    ChunkResults results;
+    results.filled = _filled;
+    results.lower_level = _lower_level;
+    results.upper_level = _upper_level;
+    for (decltype(_return_list_count) i = 0; i < _return_list_count; ++i)
+        results.lists.emplace_back(_n_chunks);
+    results.valid.assign(_n_chunks, false);
+    results.used = false;
+    _chunk_results.push_back(std::move(results));
+    return _chunk_results.back();
+}
+
 template <typename Derived>
 py::tuple BaseContourGenerator<Derived>::get_chunk_size() const
 {
@@ -933,6 +1367,18 @@ FillType BaseContourGenerator<Derived>::get_fill_type() const
     return _fill_type;
 }
 
+template <typename Derived>
+const std::vector<index_t>& BaseContourGenerator<Derived>::get_grid_chunks() const
+{
+    return _grid_chunks;
+}
+
+template <typename Derived>
+const std::vector<index_t>& BaseContourGenerator<Derived>::get_init_chunks() const
+{
+    return _init_chunks;
+}
+
 template <typename Derived>
 index_t BaseContourGenerator<Derived>::get_interior_start_left_point(
     const Location& location, bool& start_corner_diagonal) const
@@ -988,15 +1434,32 @@ index_t BaseContourGenerator<Derived>::get_interior_start_left_point(
 template <typename Derived>
 double BaseContourGenerator<Derived>::get_interp_fraction(double z0, double z1, double level) const
 {
-    switch (_z_interp) {
-        case ZInterp::Log:
-            // Equivalent to
-            //   (log(z1) - log(level)) / (log(z1) - log(z0))
-            // Same result obtained regardless of logarithm base.
-            return log(z1/level) / log(z1/z0);
-        default:  // ZInterp::Linear
-            return (z1 - level) / (z1 - z0);
-    }
+    // Linear in interpolation space, so for ZInterp::Log this is
+    //   (log(z1) - log(level)) / (log(z1) - log(z0))
+    // which gives the same result regardless of logarithm base.
+    return (z1 - level) / (z1 - z0);
+}
+
+template <typename Derived>
+double BaseContourGenerator<Derived>::get_interp_z(index_t point) const
+{
+    assert(point >= 0 && point < _n && "point index out of bounds");
+    if (_log_z)
+        return (*_log_z)[point];
+    else
+        return get_point_z(point);
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::get_cache_quad_middles() const
+{
+    return _cache_quad_middles;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::get_keep_log_z() const
+{
+    return _keep_log_z;
 }
 
 template <typename Derived>
@@ -1008,6 +1471,9 @@ LineType BaseContourGenerator<Derived>::get_line_type() const
 template <typename Derived>
 double BaseContourGenerator<Derived>::get_middle_x(index_t quad) const
 {
+    if (_middle_xy)
+        return (*_middle_xy)[2*quad];
+
     return 0.25*(get_point_x(POINT_SW) + get_point_x(POINT_SE) +
                  get_point_x(POINT_NW) + get_point_x(POINT_NE));
 }
@@ -1015,6 +1481,9 @@ double BaseContourGenerator<Derived>::get_middle_x(index_t quad) const
 template <typename Derived>
 double BaseContourGenerator<Derived>::get_middle_y(index_t quad) const
 {
+    if (_middle_xy)
+        return (*_middle_xy)[2*quad + 1];
+
     return 0.25*(get_point_y(POINT_SW) + get_point_y(POINT_SE) +
                  get_point_y(POINT_NW) + get_point_y(POINT_NE));
 }
@@ -1025,33 +1494,109 @@ index_t BaseContourGenerator<Derived>::get_n_chunks() const
     return _n_chunks;
 }
 
+template <typename Derived>
+std::vector<index_t> BaseContourGenerator<Derived>::get_region_chunks(
+    index_t jstart, index_t jstop, index_t istart, index_t istop) const
+{
+    assert(jstart >= 0 && jstart < jstop && jstop <= _ny && "Invalid j region");
+    assert(istart >= 0 && istart < istop && istop <= _nx && "Invalid i region");
+
+    // Quads that use the points of the region.
+    index_t quad_istart = std::max<index_t>(istart, 1);
+    index_t quad_iend = std::min<index_t>(istop, _nx-1);
+    index_t quad_jstart = std::max<index_t>(jstart, 1);
+    index_t quad_jend = std::min<index_t>(jstop, _ny-1);
+
+    std::vector<index_t> chunks;
+    for (index_t jchunk = (quad_jstart-1) / _y_chunk_size;
+         jchunk <= (quad_jend-1) / _y_chunk_size; ++jchunk) {
+        for (index_t ichunk = (quad_istart-1) / _x_chunk_size;
+             ichunk <= (quad_iend-1) / _x_chunk_size; ++ichunk)
+            chunks.push_back(ichunk + jchunk*_nx_chunks);
+    }
+    return chunks;
+}
+
+template <typename Derived>
+std::vector<index_t> BaseContourGenerator<Derived>::get_subset_chunks(
+    const py::object& bounds, const py::object& chunks) const
+{
+    assert((!bounds.is_none() || !chunks.is_none()) && "Need bounds or chunks");
+
+    if (chunks.is_none())
+        return get_bounds_chunks(bounds);
+
+    if (!bounds.is_none())
+        throw std::invalid_argument("bounds and chunks cannot both be specified");
+
+    const char* message = "chunks must be None or a sequence of ints";
+    if (!py::isinstance<py::iterable>(chunks) || py::isinstance<py::str>(chunks))
+        throw py::type_error(message);
+
+    std::vector<bool> selected(_n_chunks, false);
+    for (auto item : py::iter(chunks)) {
+        auto chunk = as_index(item, message);
+        if (chunk < 0 || chunk >= _n_chunks)
+            throw std::invalid_argument(
+                "chunks must be in the range 0 to chunk_count[0]*chunk_count[1] - 1");
+        selected[chunk] = true;
+    }
+
+    std::vector<index_t> ret;
+    for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+        if (selected[chunk])
+            ret.push_back(chunk);
+    }
+    return ret;
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::get_point_xy(index_t point, double*& points) const
 {
-    assert(point >= 0 && point < _n && "point index out of bounds");
-    *points++ = _xptr[point];
-    *points++ = _yptr[point];
+    *points++ = get_point_x(point);
+    *points++ = get_point_y(point);
 }
 
 template <typename Derived>
 double BaseContourGenerator<Derived>::get_point_x(index_t point) const
 {
     assert(point >= 0 && point < _n && "point index out of bounds");
-    return _xptr[point];
+    auto index = _rectilinear ? point % _nx : point;
+    return _xptr != nullptr ? _xptr[index] : static_cast<double>(_xptr_float32[index]);
 }
 
 template <typename Derived>
 double BaseContourGenerator<Derived>::get_point_y(index_t point) const
 {
     assert(point >= 0 && point < _n && "point index out of bounds");
-    return _yptr[point];
+    auto index = _rectilinear ? point / _nx : point;
+    return _yptr != nullptr ? _yptr[index] : static_cast<double>(_yptr_float32[index]);
 }
 
 template <typename Derived>
 double BaseContourGenerator<Derived>::get_point_z(index_t point) const
 {
     assert(point >= 0 && point < _n && "point index out of bounds");
-    return _zptr[point];
+    if (_zptr != nullptr)
+        return _zptr[point];
+    else
+        return _z_float32 ? get_strided_point_z<float>(point) : get_strided_point_z<double>(point);
+}
+
+template <typename Derived>
+template <typename T>
+double BaseContourGenerator<Derived>::get_strided_point_z(index_t point) const
+{
+    T value;
+    std::memcpy(
+        &value, _zdata + (point / _nx)*_z_row_stride + (point % _nx)*_z_col_stride, sizeof(T));
+    return static_cast<double>(value);
+}
+
+template <typename Derived>
+py::dtype BaseContourGenerator<Derived>::get_output_dtype() const
+{
+    return _output_float32 ? py::dtype::of<float>() : py::dtype::of<double>();
 }
 
 template <typename Derived>
@@ -1060,12 +1605,84 @@ bool BaseContourGenerator<Derived>::get_quad_as_tri() const
     return _quad_as_tri;
 }
 
+template <typename Derived>
+bool BaseContourGenerator<Derived>::get_reuse_output_buffers() const
+{
+    return _reuse_output_buffers;
+}
+
+template <typename Derived>
+py::dict BaseContourGenerator<Derived>::get_result_cache_info() const
+{
+    py::dict info;
+    info["hits"] = _result_cache_hits;
+    info["misses"] = _result_cache_misses;
+    info["entries"] = _result_cache.size();
+    info["nbytes"] = _result_cache_nbytes;
+    info["max_nbytes"] = _result_cache_max_nbytes;
+    return info;
+}
+
+template <typename Derived>
+index_t BaseContourGenerator<Derived>::get_quad_middles_nbytes() const
+{
+    std::size_t count = (_middle_xy ? _middle_xy->size() : 0) + (_middle_z ? _middle_z->size() : 0);
+    return static_cast<index_t>(count*sizeof(double));
+}
+
+template <typename Derived>
+const std::vector<index_t>& BaseContourGenerator<Derived>::get_trace_chunks() const
+{
+    return _trace_chunks;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::get_uniform_block_z_level(
+    index_t j, index_t block, ZLevel& z_level) const
+{
+    assert(_level_indices);
+    const auto& level_indices = *_level_indices;
+    auto n_blocks = level_indices.n_blocks;
+    assert(j >= 0 && j < _ny && block >= 0 && block < n_blocks);
+
+    auto index = block + j*n_blocks;
+    auto min_level_index = level_indices.block_min[index];
+    auto max_level_index = level_indices.block_max[index];
+    if (j > 0) {
+        min_level_index = std::min(min_level_index, level_indices.block_min[index-n_blocks]);
+        max_level_index = std::max(max_level_index, level_indices.block_max[index-n_blocks]);
+    }
+
+    if (max_level_index <= _lower_level_index) {
+        z_level = 0;  // All below lower level.
+        return true;
+    }
+    else if (min_level_index > _lower_level_index + 1) {
+        z_level = 2;  // All above upper level.
+        return true;
+    }
+    else
+        return false;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::get_single_pass() const
+{
+    return _single_pass;
+}
+
 template <typename Derived>
 ZInterp BaseContourGenerator<Derived>::get_z_interp() const
 {
     return _z_interp;
 }
 
+template <typename Derived>
+bool BaseContourGenerator<Derived>::has_chunk_results() const
+{
+    return _z_updated;
+}
+
 template <typename Derived>
 bool BaseContourGenerator<Derived>::has_direct_line_offsets() const
 {
@@ -1085,17 +1702,32 @@ bool BaseContourGenerator<Derived>::has_direct_points() const
 }
 
 template <typename Derived>
-void BaseContourGenerator<Derived>::init_cache_grid(const MaskArray& mask)
+bool BaseContourGenerator<Derived>::has_float32_output() const
 {
-    index_t i, j, quad;
-    if (mask.ndim() == 0) {
-        // No mask, easy to calculate quad existence and boundaries together.
-        for (j = 0, quad = 0; j < _ny; ++j) {
-            for (i = 0; i < _nx; ++i, ++quad) {
-                _cache[quad] = 0;
+    return _output_float32;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::has_result_cache() const
+{
+    return _result_cache_max_nbytes > 0;
+}
 
-                if (i > 0 && j > 0)
-                    _cache[quad] |= MASK_EXISTS_QUAD;
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_cache_grid(const ChunkLocal& local)
+{
+    // Points on the W and S edges of the domain belong to the W and S chunks.  Existence of quads
+    // in neighbouring chunks is calculated from the mask rather than read from the cache as those
+    // chunks may not have been initialised yet.
+    index_t istart = local.istart > 1 ? local.istart : 0;
+    index_t jstart = local.jstart > 1 ? local.jstart : 0;
+
+    if (_mask_cache == nullptr) {
+        // No mask so all quads not on the W or S edges exist, only need to calculate boundaries.
+        for (index_t j = jstart; j <= local.jend; ++j) {
+            index_t quad = istart + j*_nx;
+            for (index_t i = istart; i <= local.iend; ++i, ++quad) {
+                _cache[quad] = 0;
 
                 if ((i % _x_chunk_size == 0 || i == _nx-1) && j > 0)
                     _cache[quad] |= MASK_BOUNDARY_E;
@@ -1106,73 +1738,44 @@ void BaseContourGenerator<Derived>::init_cache_grid(const MaskArray& mask)
         }
     }
     else {
-        // Could maybe speed this up and just have a single pass.
-        // Care would be needed with lookback of course.
-        const bool* mask_ptr = mask.data();
-
-        // Have mask so use two stages.
-        // Stage 1, determine if quads/corners exist.
-        quad = 0;
-        for (j = 0; j < _ny; ++j) {
-            for (i = 0; i < _nx; ++i, ++quad) {
-                _cache[quad] = 0;
-
-                if (i > 0 && j > 0) {
-                    unsigned int config = (mask_ptr[POINT_NW] << 3) |
-                                          (mask_ptr[POINT_NE] << 2) |
-                                          (mask_ptr[POINT_SW] << 1) |
-                                          (mask_ptr[POINT_SE] << 0);
-                    if (_corner_mask) {
-                         switch (config) {
-                            case 0: _cache[quad] = MASK_EXISTS_QUAD; break;
-                            case 1: _cache[quad] = MASK_EXISTS_NW_CORNER; break;
-                            case 2: _cache[quad] = MASK_EXISTS_NE_CORNER; break;
-                            case 4: _cache[quad] = MASK_EXISTS_SW_CORNER; break;
-                            case 8: _cache[quad] = MASK_EXISTS_SE_CORNER; break;
-                            default:
-                                // Do nothing, quad is masked out.
-                                break;
-                        }
-                    }
-                    else if (config == 0)
-                        _cache[quad] = MASK_EXISTS_QUAD;
-                }
-            }
-        }
-
-        // Stage 2, calculate N and E boundaries.
-        quad = 0;
-        for (j = 0; j < _ny; ++j) {
+        // Have mask so determine if quads/corners exist, and hence N and E boundaries.  Without
+        // corner_mask only MASK_EXISTS_QUAD is used which is included in all of the edge masks.
+        constexpr MaskCacheItem mask_E_edge =
+            MASK_EXISTS_QUAD | MASK_EXISTS_NE_CORNER | MASK_EXISTS_SE_CORNER;
+        constexpr MaskCacheItem mask_N_edge =
+            MASK_EXISTS_QUAD | MASK_EXISTS_NW_CORNER | MASK_EXISTS_NE_CORNER;
+        constexpr MaskCacheItem mask_S_edge =
+            MASK_EXISTS_QUAD | MASK_EXISTS_SW_CORNER | MASK_EXISTS_SE_CORNER;
+        constexpr MaskCacheItem mask_W_edge =
+            MASK_EXISTS_QUAD | MASK_EXISTS_NW_CORNER | MASK_EXISTS_SW_CORNER;
+
+        for (index_t j = jstart; j <= local.jend; ++j) {
             bool j_chunk_boundary = j % _y_chunk_size == 0;
+            index_t quad = istart + j*_nx;
+            MaskCacheItem exists = calc_mask_cache_item(quad);
 
-            for (i = 0; i < _nx; ++i, ++quad) {
+            for (index_t i = istart; i <= local.iend; ++i, ++quad) {
                 bool i_chunk_boundary = i % _x_chunk_size == 0;
+                MaskCacheItem E_exists = (i < _nx-1 ? calc_mask_cache_item(quad+1) : 0);
+                MaskCacheItem N_exists = (j < _ny-1 ? calc_mask_cache_item(quad+_nx) : 0);
 
-                if (_corner_mask) {
-                    bool exists_E_edge = EXISTS_E_EDGE(quad);
-                    bool E_exists_W_edge = (i < _nx-1 && EXISTS_W_EDGE(quad+1));
-                    bool exists_N_edge = EXISTS_N_EDGE(quad);
-                    bool N_exists_S_edge = (j < _ny-1 && EXISTS_S_EDGE(quad+_nx));
+                _mask_cache[quad] = exists;
+                _cache[quad] = 0;
 
-                    if (exists_E_edge != E_exists_W_edge ||
-                        (i_chunk_boundary && exists_E_edge && E_exists_W_edge))
-                        _cache[quad] |= MASK_BOUNDARY_E;
+                bool exists_E_edge = (exists & mask_E_edge) != 0;
+                bool E_exists_W_edge = (E_exists & mask_W_edge) != 0;
+                bool exists_N_edge = (exists & mask_N_edge) != 0;
+                bool N_exists_S_edge = (N_exists & mask_S_edge) != 0;
 
-                    if (exists_N_edge != N_exists_S_edge ||
-                        (j_chunk_boundary && exists_N_edge && N_exists_S_edge))
-                         _cache[quad] |= MASK_BOUNDARY_N;
-                }
-                else {
-                    bool E_exists_quad = (i < _nx-1 && EXISTS_QUAD(quad+1));
-                    bool N_exists_quad = (j < _ny-1 && EXISTS_QUAD(quad+_nx));
-                    bool exists = EXISTS_QUAD(quad);
+                if (exists_E_edge != E_exists_W_edge ||
+                    (i_chunk_boundary && exists_E_edge && E_exists_W_edge))
+                    _cache[quad] |= MASK_BOUNDARY_E;
 
-                    if (exists != E_exists_quad || (i_chunk_boundary && exists && E_exists_quad))
-                        _cache[quad] |= MASK_BOUNDARY_E;
+                if (exists_N_edge != N_exists_S_edge ||
+                    (j_chunk_boundary && exists_N_edge && N_exists_S_edge))
+                    _cache[quad] |= MASK_BOUNDARY_N;
 
-                    if (exists != N_exists_quad || (j_chunk_boundary && exists && N_exists_quad))
-                        _cache[quad] |= MASK_BOUNDARY_N;
-                }
+                exists = E_exists;
             }
         }
     }
@@ -1195,8 +1798,6 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
     // cache items already set and so must temporarily calculate those z-levels rather than reading
     // the cache.
 
-    constexpr CacheItem keep_mask = (MASK_EXISTS_ANY | MASK_BOUNDARY_N | MASK_BOUNDARY_E);
-
     index_t istart, iend, jstart, jend;  // Loop indices.
     index_t chunk_istart;  // Actual start i-index of chunk.
 
@@ -1218,30 +1819,61 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
     index_t j_final_start = jstart - 1;
     bool calc_W_z_level = (!ordered_chunks && istart == chunk_istart);
 
+    // If level indices are available (multi_filled only), blocks of quads whose points are all
+    // below the lower level or all above the upper level cannot contain any starts and so can be
+    // quickly skipped over just setting their z-levels.
+    bool use_level_blocks = static_cast<bool>(_level_indices);
+
     for (index_t j = jstart; j <= jend; ++j) {
+        // z-levels of the NE points of the row of quads are calculated first so that the loop over
+        // quads only has to check for starts.
+        init_row_z_levels(j, istart, iend);
+
         index_t quad = istart + j*_nx;
-        const double* z_ptr = _zptr + quad;
         bool start_in_row = false;
         bool calc_S_z_level = (!ordered_chunks && j == jstart);
+        index_t next_block_i = istart;  // Next i at which to check for uniform level block.
 
         // z-level of NW point not needed if i == 0.
-        ZLevel z_nw = (istart == 0) ? 0 : (calc_W_z_level ? z_to_zlevel(*(z_ptr-1)) : Z_NW);
+        ZLevel z_nw = (istart == 0) ? 0 : (calc_W_z_level ? point_to_zlevel(quad-1) : Z_NW);
 
         // z-level of SW point not needed if i == 0 or j == 0.
         ZLevel z_sw = (istart == 0 || j == 0) ? 0 :
-            ((calc_W_z_level || calc_S_z_level) ? z_to_zlevel(*(z_ptr-_nx-1)) : Z_SW);
+            ((calc_W_z_level || calc_S_z_level) ? point_to_zlevel(quad-_nx-1) : Z_SW);
+
+        for (index_t i = istart; i <= iend; ++i, ++quad) {
+            if (use_level_blocks && i == next_block_i) {
+                index_t block = i / LEVEL_BLOCK_SIZE;
+                next_block_i = (block+1)*LEVEL_BLOCK_SIZE;
+
+                ZLevel z_level;
+                if (get_uniform_block_z_level(j, block, z_level)) {
+                    // z-levels have already been set so skip to the end of the block.
+                    index_t block_iend = std::min(next_block_i-1, iend);
+                    quad += block_iend - i;
+                    i = block_iend;
+                    z_nw = z_sw = z_level;
+                    continue;
+                }
+            }
 
-        for (index_t i = istart; i <= iend; ++i, ++quad, ++z_ptr) {
             // z-level of SE point not needed if j == 0.
-            ZLevel z_se = (j == 0) ? 0 : (calc_S_z_level ? z_to_zlevel(*(z_ptr-_nx)) : Z_SE);
-
-            _cache[quad] &= keep_mask;
-
-            // Calculate and cache z-level of NE point.
-            ZLevel z_ne = z_to_zlevel(*z_ptr);
-            _cache[quad] |= z_ne;
+            ZLevel z_se = (j == 0) ? 0 : (calc_S_z_level ? point_to_zlevel(quad-_nx) : Z_SE);
+            ZLevel z_ne = Z_NE;
+
+            // A quad with all of its points at the same z-level cannot contain a start, except
+            // for a filled quad between the two levels which may be a corner start or a start on
+            // a N or S boundary.
+            if (z_ne == z_se && z_ne == z_nw && z_ne == z_sw &&
+                (!_filled || z_ne != 1 ||
+                 (EXISTS_QUAD(quad) && !BOUNDARY_N(quad) && !BOUNDARY_S(quad)))) {
+                z_nw = z_ne;
+                z_sw = z_se;
+                continue;
+            }
 
-            switch (EXISTS_ANY(quad)) {
+            // Quads on the W and S edges of the domain do not exist.
+            switch ((i == 0 || j == 0) ? 0 : EXISTS_ANY(quad)) {
                 case MASK_EXISTS_QUAD:
                     if (_filled) {
                         switch ((z_nw << 6) | (z_ne << 4) | (z_sw << 2) | z_se) {  // config
@@ -1391,7 +2023,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 if (BOUNDARY_W(quad)) _cache[quad] |= MASK_START_BOUNDARY_W;
                                 if (BOUNDARY_N(quad) && !START_HOLE_N(quad-1) &&
                                     j % _y_chunk_size > 0 && j != _ny-1 && i % _x_chunk_size > 1)
-                                    _cache[quad] |= MASK_START_HOLE_N;
+                                    _mask_cache[quad] |= MASK_START_HOLE_N;
                                 start_in_row |= ANY_START(quad);
                                 break;
                             case  81:  // 1101
@@ -1403,7 +2035,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 if (BOUNDARY_W(quad)) _cache[quad] |= MASK_START_BOUNDARY_W;
                                 if (BOUNDARY_N(quad) && !START_HOLE_N(quad-1) &&
                                     j % _y_chunk_size > 0 && j != _ny-1 && i % _x_chunk_size > 1)
-                                    _cache[quad] |= MASK_START_HOLE_N;
+                                    _mask_cache[quad] |= MASK_START_HOLE_N;
                                 start_in_row |= ANY_START(quad);
                                 break;
                             case  84:  // 1110
@@ -1413,7 +2045,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 if (BOUNDARY_S(quad)) _cache[quad] |= MASK_START_BOUNDARY_S;
                                 if (BOUNDARY_N(quad) && !START_HOLE_N(quad-1) &&
                                     j % _y_chunk_size > 0 && j != _ny-1 && i % _x_chunk_size > 1)
-                                    _cache[quad] |= MASK_START_HOLE_N;
+                                    _mask_cache[quad] |= MASK_START_HOLE_N;
                                 start_in_row |= ANY_START(quad);
                                 break;
                             case 130:  // 2002
@@ -1542,14 +2174,14 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                             case 36:  // 210
                             case 40:  // 220
                                 if (BOUNDARY_W(quad)) _cache[quad] |= MASK_START_BOUNDARY_W;
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case  4:  // 010
                             case  8:  // 020
                             case 34:  // 202
                             case 38:  // 212
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case 20:  // 110
@@ -1557,15 +2189,15 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 if (BOUNDARY_W(quad)) _cache[quad] |= MASK_START_BOUNDARY_W;
                                 if (BOUNDARY_N(quad) && !START_HOLE_N(quad-1) &&
                                     j % _y_chunk_size > 0 && j != _ny-1 && i % _x_chunk_size > 1)
-                                    _cache[quad] |= MASK_START_HOLE_N;
-                                _cache[quad] |= MASK_START_CORNER;
+                                    _mask_cache[quad] |= MASK_START_HOLE_N;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case 21:  // 111
                                 if (BOUNDARY_W(quad)) _cache[quad] |= MASK_START_BOUNDARY_W;
                                 if (BOUNDARY_N(quad) && !START_HOLE_N(quad-1) &&
                                     j % _y_chunk_size > 0 && j != _ny-1 && i % _x_chunk_size > 1)
-                                    _cache[quad] |= MASK_START_HOLE_N;
+                                    _mask_cache[quad] |= MASK_START_HOLE_N;
                                 start_in_row |= ANY_START(quad);
                                 break;
                         }
@@ -1574,7 +2206,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                         switch ((z_nw << 2) | (z_ne << 1) | z_sw) {  // config
                             case 1:  // 001
                             case 5:  // 101
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case 2:  // 010
@@ -1609,7 +2241,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                             case 37:  // 211
                             case 40:  // 220
                             case 41:  // 221
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case  4:  // 010
@@ -1629,7 +2261,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                             case 24:  // 120
                             case 25:  // 121
                             case 33:  // 201
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 _cache[quad] |= MASK_START_E;
                                 start_in_row = true;
                                 break;
@@ -1638,8 +2270,8 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                             case 22:  // 112
                                 if (BOUNDARY_N(quad) && !START_HOLE_N(quad-1) &&
                                     j % _y_chunk_size > 0 && j != _ny-1 && i % _x_chunk_size > 1)
-                                    _cache[quad] |= MASK_START_HOLE_N;
-                                _cache[quad] |= MASK_START_CORNER;
+                                    _mask_cache[quad] |= MASK_START_HOLE_N;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                         }
@@ -1667,7 +2299,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 break;
                             case 4:  // 100
                             case 6:  // 110
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case 5:  // 101
@@ -1721,7 +2353,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                             case 25:  // 121
                                 if (BOUNDARY_S(quad)) _cache[quad] |= MASK_START_BOUNDARY_S;
                                 if (BOUNDARY_W(quad)) _cache[quad] |= MASK_START_BOUNDARY_W;
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case 20:  // 110
@@ -1730,7 +2362,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 if (BOUNDARY_S(quad))
                                     _cache[quad] |= MASK_START_BOUNDARY_S;
                                 else
-                                    _cache[quad] |= MASK_START_CORNER;
+                                    _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                         }
@@ -1739,7 +2371,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                         switch ((z_nw << 2) | (z_sw << 1) | z_se) {  // config
                             case 1:  // 001
                             case 3:  // 011
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                             case 2:  // 010
@@ -1792,7 +2424,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                             case 16:  // 100
                             case 26:  // 122
                             case 32:  // 200
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                         }
@@ -1815,7 +2447,7 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
                                 break;
                             case 4:  // 100
                             case 5:  // 101
-                                _cache[quad] |= MASK_START_CORNER;
+                                _mask_cache[quad] |= MASK_START_CORNER;
                                 start_in_row = true;
                                 break;
                         }
@@ -1838,13 +2470,187 @@ void BaseContourGenerator<Derived>::init_cache_levels_and_starts(const ChunkLoca
 }
 
 template <typename Derived>
-void BaseContourGenerator<Derived>::interp(
-    index_t point0, index_t point1, bool is_upper, double*& points) const
+void BaseContourGenerator<Derived>::init_level_indices(const LevelArray& levels)
 {
-    auto frac = get_interp_fraction(
-        get_point_z(point0), get_point_z(point1), is_upper ? _upper_level : _lower_level);
+    assert(_filled);
 
-    assert(frac >= 0.0 && frac <= 1.0 && "Interp fraction out of bounds");
+    auto levels_proxy = levels.unchecked<1>();
+    auto n_levels = levels_proxy.size();
+    assert(n_levels <= std::numeric_limits<LevelIndex>::max());
+
+    // Levels have already been checked to be increasing.
+    std::vector<double> sorted_levels(n_levels);
+    for (decltype(n_levels) k = 0; k < n_levels; ++k)
+        sorted_levels[k] = levels_proxy[k];
+
+    // Level index of each point is the number of levels that are below the point's z so that
+    // z > levels[k] is equivalent to level_index > k.  NaN is below all levels as z_to_zlevel()
+    // treats it as such.
+    auto level_indices = std::make_shared<LevelIndices>();
+    level_indices->point.resize(_n);
+    for (index_t point = 0; point < _n; ++point) {
+        auto z = get_point_z(point);
+        level_indices->point[point] = Util::is_nan(z) ? 0 : static_cast<LevelIndex>(
+            std::lower_bound(sorted_levels.begin(), sorted_levels.end(), z) -
+            sorted_levels.begin());
+    }
+
+    // Each block contains the points needed for LEVEL_BLOCK_SIZE quads in a single row, i.e. the
+    // NE points of those quads plus the point to the W of the first.
+    auto n_blocks = (_nx-1) / LEVEL_BLOCK_SIZE + 1;
+    level_indices->n_blocks = n_blocks;
+    level_indices->block_min.resize(n_blocks*_ny);
+    level_indices->block_max.resize(n_blocks*_ny);
+    for (index_t j = 0; j < _ny; ++j) {
+        const auto* row_level_indices = level_indices->point.data() + j*_nx;
+        for (index_t block = 0; block < n_blocks; ++block) {
+            auto ifirst = std::max<index_t>(block*LEVEL_BLOCK_SIZE - 1, 0);
+            auto ilast = std::min<index_t>((block+1)*LEVEL_BLOCK_SIZE - 1, _nx-1);
+            auto [min_it, max_it] = std::minmax_element(
+                row_level_indices + ifirst, row_level_indices + ilast + 1);
+            level_indices->block_min[block + j*n_blocks] = *min_it;
+            level_indices->block_max[block + j*n_blocks] = *max_it;
+        }
+    }
+
+    _level_indices = std::move(level_indices);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_log_z()
+{
+    if (_z_interp != ZInterp::Log || _log_z)
+        return;
+
+    // Python objects are not used so release the GIL, allowing other threads to contour other
+    // frames of a z stack at the same time.  Masked points may have invalid log(z) but are never
+    // interpolated.
+    py::gil_scoped_release release;
+    auto log_z = std::make_shared<std::vector<double>>(_n);
+    for (index_t point = 0; point < _n; ++point)
+        (*log_z)[point] = std::log(get_point_z(point));
+    _log_z = std::move(log_z);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_quad_middles()
+{
+    if (!_cache_quad_middles || !_quad_as_tri || (_middle_xy && _middle_z))
+        return;
+
+    // Python objects are not used so release the GIL.  Values are calculated in the same way as
+    // when they are not cached, so that results are identical.  Points on the W and S edges of
+    // the domain are not the NE points of quads so are not set.
+    py::gil_scoped_release release;
+    if (!_middle_xy) {
+        auto middle_xy = std::make_shared<std::vector<double>>(2*_n, 0.0);
+        for (index_t j = 1; j < _ny; ++j) {
+            for (index_t quad = 1 + j*_nx; quad < (j+1)*_nx; ++quad) {
+                (*middle_xy)[2*quad] = get_middle_x(quad);
+                (*middle_xy)[2*quad + 1] = get_middle_y(quad);
+            }
+        }
+        _middle_xy = std::move(middle_xy);
+    }
+
+    if (!_middle_z) {
+        // Uses log(z) if using ZInterp::Log, which has already been calculated.
+        auto middle_z = std::make_shared<std::vector<double>>(_n, 0.0);
+        for (index_t j = 1; j < _ny; ++j) {
+            for (index_t quad = 1 + j*_nx; quad < (j+1)*_nx; ++quad)
+                (*middle_z)[quad] = calc_middle_z(quad);
+        }
+        _middle_z = std::move(middle_z);
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_row_z_levels(index_t j, index_t istart, index_t iend)
+{
+    // Sets the z-levels and clears the start flags of points istart to iend inclusive of row j.
+    // Separate simple loops without branches for each source of z so that they can be
+    // auto-vectorised.
+    constexpr CacheItem keep_mask = (MASK_BOUNDARY_N | MASK_BOUNDARY_E);
+    CacheItem* cache = _cache + j*_nx;
+
+    if (_level_indices) {
+        const LevelIndex* point = _level_indices->point.data() + j*_nx;
+        const LevelIndex lower = _lower_level_index;
+        for (index_t i = istart; i <= iend; ++i) {
+            CacheItem z_level = (point[i] > lower) + (point[i] > lower + 1);
+            cache[i] = (cache[i] & keep_mask) | z_level;
+        }
+    }
+    else if (_zptr != nullptr) {
+        // Equivalent to z_to_zlevel() as upper_level > lower_level if filled, and NaN is below
+        // both levels.  No z is above an infinite upper level.
+        const double* z = _zptr + j*_nx;
+        const double lower = _lower_level;
+        const double upper = _filled ? _upper_level : std::numeric_limits<double>::infinity();
+        index_t i = istart;
+#ifdef CONTOURPY_SSE2
+        // Compilers do not auto-vectorise the narrowing from double to CacheItem using SSE2, so
+        // process 8 points at a time explicitly.  Comparisons give -1 if true and 0 if false.
+        const __m128d lower2 = _mm_set1_pd(lower);
+        const __m128d upper2 = _mm_set1_pd(upper);
+        const __m128i keep8 = _mm_set1_epi16(static_cast<short>(keep_mask));
+        auto minus_z_levels4 = [&](const double* z4) {
+            __m128d z01 = _mm_loadu_pd(z4), z23 = _mm_loadu_pd(z4 + 2);
+            __m128 above_lower = _mm_shuffle_ps(
+                _mm_castpd_ps(_mm_cmpgt_pd(z01, lower2)), _mm_castpd_ps(_mm_cmpgt_pd(z23, lower2)),
+                _MM_SHUFFLE(2, 0, 2, 0));
+            __m128 above_upper = _mm_shuffle_ps(
+                _mm_castpd_ps(_mm_cmpgt_pd(z01, upper2)), _mm_castpd_ps(_mm_cmpgt_pd(z23, upper2)),
+                _MM_SHUFFLE(2, 0, 2, 0));
+            return _mm_add_epi32(_mm_castps_si128(above_lower), _mm_castps_si128(above_upper));
+        };
+        for (; i + 7 <= iend; i += 8) {
+            __m128i z_levels = _mm_sub_epi16(
+                _mm_setzero_si128(),
+                _mm_packs_epi32(minus_z_levels4(z + i), minus_z_levels4(z + i + 4)));
+            auto cache8 = reinterpret_cast<__m128i*>(cache + i);
+            _mm_storeu_si128(
+                cache8, _mm_or_si128(_mm_and_si128(_mm_loadu_si128(cache8), keep8), z_levels));
+        }
+#endif
+        for (; i <= iend; ++i) {
+            CacheItem z_level = (z[i] > lower) + (z[i] > upper);
+            cache[i] = (cache[i] & keep_mask) | z_level;
+        }
+    }
+    else {
+        for (index_t i = istart; i <= iend; ++i)
+            cache[i] = (cache[i] & keep_mask) | z_to_zlevel(get_point_z(i + j*_nx));
+    }
+
+    if (_mask_cache != nullptr) {
+        MaskCacheItem* mask_cache = _mask_cache + j*_nx;
+        for (index_t i = istart; i <= iend; ++i)
+            mask_cache[i] &= MASK_EXISTS_ANY;
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::init_z_access()
+{
+    _z_float32 = py::isinstance<py::array_t<float>>(_z);
+    _zdata = static_cast<const char*>(_z.data());
+    _z_row_stride = _z.strides(0);
+    _z_col_stride = _z.strides(1);
+
+    bool c_contiguous = (_z.flags() & py::array::c_style) != 0;
+    _zptr = (!_z_float32 && c_contiguous) ? static_cast<const double*>(_z.data()) : nullptr;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::interp(
+    index_t point0, index_t point1, bool is_upper, double*& points) const
+{
+    auto frac = get_interp_fraction(
+        get_interp_z(point0), get_interp_z(point1),
+        is_upper ? _interp_upper_level : _interp_lower_level);
+
+    assert(frac >= 0.0 && frac <= 1.0 && "Interp fraction out of bounds");
 
     *points++ = get_point_x(point0)*frac + get_point_x(point1)*(1.0 - frac);
     *points++ = get_point_y(point0)*frac + get_point_y(point1)*(1.0 - frac);
@@ -1855,7 +2661,7 @@ void BaseContourGenerator<Derived>::interp(
     index_t point0, double x1, double y1, double z1, bool is_upper, double*& points) const
 {
     auto frac = get_interp_fraction(
-        get_point_z(point0), z1, is_upper ? _upper_level : _lower_level);
+        get_interp_z(point0), z1, is_upper ? _interp_upper_level : _interp_lower_level);
 
     assert(frac >= 0.0 && frac <= 1.0 && "Interp fraction out of bounds");
 
@@ -1863,6 +2669,32 @@ void BaseContourGenerator<Derived>::interp(
     *points++ = get_point_y(point0)*frac + y1*(1.0 - frac);
 }
 
+template <typename Derived>
+typename BaseContourGenerator<Derived>::ZLevel BaseContourGenerator<Derived>::interp_z_to_zlevel(
+    double interp_z) const
+{
+    return (_filled && interp_z > _interp_upper_level) ? 2 :
+        (interp_z > _interp_lower_level ? 1 : 0);
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_filled() const
+{
+    return _filled;
+}
+
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_float32_dtype(const py::object& output_dtype)
+{
+    auto dtype = py::dtype::from_args(output_dtype);
+    if (dtype.equal(py::dtype::of<double>()))
+        return false;
+    else if (dtype.equal(py::dtype::of<float>()))
+        return true;
+    else
+        throw std::invalid_argument("output_dtype must be float64 or float32");
+}
+
 template <typename Derived>
 bool BaseContourGenerator<Derived>::is_point_in_chunk(index_t point, const ChunkLocal& local) const
 {
@@ -1883,6 +2715,12 @@ bool BaseContourGenerator<Derived>::is_quad_in_chunk(index_t quad, const ChunkLo
     return is_quad_in_bounds(quad, local.istart, local.iend, local.jstart, local.jend);
 }
 
+template <typename Derived>
+bool BaseContourGenerator<Derived>::is_reusing_output_buffers() const
+{
+    return _reuse_output_buffers && !_z_updated && !_z_frame && _result_cache_max_nbytes == 0;
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLocal& local)
 {
@@ -1892,9 +2730,13 @@ void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLo
 
     Location location = start_location;
     count_t point_count = 0;
+    bool write_points = (local.pass > 0 || local.single_pass);
+    auto point_start = local.points.current - local.points.start;
 
     // Insert nan if required before start of new line.
-    if (_nan_separated and local.pass > 0 && local.line_count > 0) {
+    if (_nan_separated and write_points && local.line_count > 0) {
+        if (local.single_pass)
+            local.points.ensure_space(2);
         *local.points.current++ = Util::nan;
         *local.points.current++ = Util::nan;
     }
@@ -1902,36 +2744,85 @@ void BaseContourGenerator<Derived>::line(const Location& start_location, ChunkLo
     // finished == true indicates closed line loop.
     bool finished = follow_interior(location, start_location, local, point_count);
 
-    if (local.pass > 0) {
-        assert(local.line_offsets.current == local.line_offsets.start + local.line_count);
-        *local.line_offsets.current++ = local.total_point_count;
-    }
-
-    if (local.pass == 0 && !start_location.on_boundary && !finished)
+    if (local.pass == 0 && !start_location.on_boundary && !finished) {
         // An internal start that isn't a line loop is part of a line strip that starts on a
         // boundary and will be traced later.  Do not count it as a valid start in pass 0 and remove
         // the first point or it will be duplicated by the correct boundary-started line later.
-        point_count--;
-    else
+        // If single_pass the whole line strip is traced later so discard all of its points.
+        if (local.single_pass) {
+            local.points.current = local.points.start + point_start;
+            point_count = 0;
+        }
+        else
+            point_count--;
+    }
+    else {
+        if (write_points) {
+            if (local.single_pass)
+                local.line_offsets.ensure_space(1);
+            assert(local.line_offsets.current == local.line_offsets.start + local.line_count);
+            *local.line_offsets.current++ = local.total_point_count;
+        }
         local.line_count++;
+    }
 
     local.total_point_count += point_count;
 }
 
+template <typename Derived>
+index_t BaseContourGenerator<Derived>::make_result_read_only(const py::handle& result)
+{
+    if (py::isinstance<py::list>(result) || py::isinstance<py::tuple>(result)) {
+        // Include pointers to the items so that results without arrays have a non-zero size.
+        index_t nbytes = static_cast<index_t>((py::len(result) + 1)*sizeof(PyObject*));
+        for (auto item : result)
+            nbytes += make_result_read_only(item);
+        return nbytes;
+    }
+    else if (py::isinstance<py::array>(result)) {
+        result.attr("setflags")(py::arg("write") = false);
+        return static_cast<index_t>(py::reinterpret_borrow<py::array>(result).nbytes());
+    }
+    else
+        return 0;
+}
+
 template <typename Derived>
 py::sequence BaseContourGenerator<Derived>::lines(double level)
 {
     pre_lines();
 
     _lower_level = _upper_level = level;
-    return march_wrapper();
+    auto ret = march_wrapper();
+    clear_log_z();
+    return ret;
+}
+
+template <typename Derived>
+py::sequence BaseContourGenerator<Derived>::lines(
+    double level, const py::object& bounds, const py::object& chunks)
+{
+    if (bounds.is_none() && chunks.is_none())
+        return lines(level);
+
+    auto subset_chunks = get_subset_chunks(bounds, chunks);
+    pre_lines();
+
+    _lower_level = _upper_level = level;
+    auto ret = march_wrapper(&subset_chunks);
+    clear_log_z();
+    return ret;
 }
 
 template <typename Derived>
 void BaseContourGenerator<Derived>::march_chunk(
     ChunkLocal& local, std::vector<py::list>& return_lists)
 {
-    for (local.pass = 0; local.pass < 2; ++local.pass) {
+    // Holes are identified in pass 1 using flags set in pass 0, so cannot be done in a single pass.
+    local.single_pass = (_single_pass && !_identify_holes);
+    int pass_count = local.single_pass ? 1 : 2;
+
+    for (local.pass = 0; local.pass < pass_count; ++local.pass) {
         bool ignore_holes = (_identify_holes && local.pass == 1);
 
         index_t j_final_start = local.jstart;
@@ -2061,7 +2952,7 @@ void BaseContourGenerator<Derived>::march_chunk(
             local.total_point_count += local.line_count - 1;
         }
 
-        if (local.pass == 0) {
+        if (local.pass == 0 && !local.single_pass) {
             if (local.total_point_count == 0) {
                 local.points.clear();
                 local.line_offsets.clear();
@@ -2071,23 +2962,29 @@ void BaseContourGenerator<Derived>::march_chunk(
 
             // Create arrays for points, line_offsets and optionally outer_offsets.  Arrays may be
             // either C++ vectors or Python NumPy arrays.  Want to group creation of the latter as
-            // threaded code needs to lock creation of these to limit access to a single thread.
-            if (_direct_points || _direct_line_offsets || _direct_outer_offsets) {
-                typename Derived::Lock lock(static_cast<Derived&>(*this));
-
-                // Strictly speaking adding the NumPy arrays to return_lists does not need to be
-                // within the lock.
-                if (_direct_points) {
-                    return_lists[0][local.chunk] =
-                        local.points.create_python(local.total_point_count, 2);
-                }
-                if (_direct_line_offsets) {
-                    return_lists[1][local.chunk] =
-                        local.line_offsets.create_python(local.line_count + 1);
-                }
-                if (_direct_outer_offsets) {
-                    return_lists[2][local.chunk] =
-                        local.outer_offsets.create_python(local.line_count - local.hole_count + 1);
+            // it requires a lock.  If Derived defers the creation of NumPy arrays they are all C++
+            // vectors.
+            if constexpr (!Derived::defer_python_arrays) {
+                if (_direct_points || _direct_line_offsets || _direct_outer_offsets) {
+                    typename Derived::Lock lock(static_cast<Derived&>(*this));
+
+                    // Strictly speaking adding the NumPy arrays to return_lists does not need to
+                    // be within the lock.
+                    if (_direct_points) {
+                        return_lists[0][local.chunk] = local.points.use_python(
+                            create_output_array<double>(
+                                local.chunk, 0, local.total_point_count, 2));
+                    }
+                    if (_direct_line_offsets) {
+                        return_lists[1][local.chunk] = local.line_offsets.use_python(
+                            create_output_array<offset_t>(
+                                local.chunk, 1, local.line_count + 1));
+                    }
+                    if (_direct_outer_offsets) {
+                        return_lists[2][local.chunk] = local.outer_offsets.use_python(
+                            create_output_array<offset_t>(
+                                local.chunk, 2, local.line_count - local.hole_count + 1));
+                    }
                 }
             }
 
@@ -2113,6 +3010,8 @@ void BaseContourGenerator<Derived>::march_chunk(
 
     // Set final line and outer offsets.
     if (local.line_count > 0) {
+        if (local.single_pass)
+            local.line_offsets.ensure_space(1);
         *local.line_offsets.current++ = local.total_point_count;
 
         if (_identify_holes) {
@@ -2123,14 +3022,53 @@ void BaseContourGenerator<Derived>::march_chunk(
         }
     }
 
+    if (local.single_pass) {
+        local.points.trim();
+        local.line_offsets.trim();
+
+        // Arrays that are returned directly to Python take ownership of the C++ vectors, or are
+        // copied into the output buffers if reusing them.
+        if constexpr (!Derived::defer_python_arrays) {
+            if (local.total_point_count > 0 && (_direct_points || _direct_line_offsets)) {
+                typename Derived::Lock lock(static_cast<Derived&>(*this));
+                bool reuse = is_reusing_output_buffers();
+                if (_direct_points) {
+                    auto point_count = static_cast<index_t>(local.total_point_count);
+                    if (reuse) {
+                        auto points = create_output_array<double>(
+                            local.chunk, 0, local.total_point_count, 2);
+                        std::copy(local.points.start, local.points.current, points.mutable_data());
+                        return_lists[0][local.chunk] = points;
+                    }
+                    else
+                        return_lists[0][local.chunk] = local.points.take_python({point_count, 2});
+                }
+                if (_direct_line_offsets) {
+                    auto offset_count = static_cast<index_t>(local.line_count + 1);
+                    if (reuse) {
+                        auto line_offsets = create_output_array<offset_t>(
+                            local.chunk, 1, local.line_count + 1);
+                        std::copy(local.line_offsets.start, local.line_offsets.current,
+                                  line_offsets.mutable_data());
+                        return_lists[1][local.chunk] = line_offsets;
+                    }
+                    else
+                        return_lists[1][local.chunk] = local.line_offsets.take_python({offset_count});
+                }
+            }
+        }
+    }
+
     // Throw exception if the two passes returned different number of points, lines, etc.
     check_consistent_counts(local);
 
     if (local.total_point_count == 0) {
-        if (_output_chunked) {
-            typename Derived::Lock lock(static_cast<Derived&>(*this));
-            for (auto& list : return_lists)
-                list[local.chunk] = py::none();
+        if constexpr (!Derived::defer_python_arrays) {
+            if (_output_chunked) {
+                typename Derived::Lock lock(static_cast<Derived&>(*this));
+                for (auto& list : return_lists)
+                    list[local.chunk] = py::none();
+            }
         }
     }
     else if (_filled)
@@ -2140,8 +3078,40 @@ void BaseContourGenerator<Derived>::march_chunk(
 }
 
 template <typename Derived>
-py::sequence BaseContourGenerator<Derived>::march_wrapper()
+py::sequence BaseContourGenerator<Derived>::march_wrapper(const std::vector<index_t>* chunks)
 {
+    // The result cache is only used when contouring all chunks of z.  NaN levels are not cached
+    // as they never compare equal, so each call would add a new entry that is never hit.
+    bool use_result_cache = (_result_cache_max_nbytes > 0 && chunks == nullptr && !_z_frame &&
+        !Util::is_nan(_lower_level) && !(_filled && Util::is_nan(_upper_level)));
+
+    if (use_result_cache) {
+        for (auto it = _result_cache.begin(); it != _result_cache.end(); ++it) {
+            // Lines only use the lower level.
+            if (it->filled == _filled && it->lower_level == _lower_level &&
+                (!_filled || it->upper_level == _upper_level)) {
+                _result_cache_hits++;
+                _result_cache.splice(_result_cache.begin(), _result_cache, it);
+                return copy_result(it->result);
+            }
+        }
+        _result_cache_misses++;
+    }
+
+    if (_z_interp == ZInterp::Log) {
+        // Interpolate linearly in log space.  All z are above a level that is not positive.
+        init_log_z();
+        init_quad_middles();
+        constexpr double minus_infinity = -std::numeric_limits<double>::infinity();
+        _interp_lower_level = _lower_level > 0.0 ? std::log(_lower_level) : minus_infinity;
+        _interp_upper_level = _upper_level > 0.0 ? std::log(_upper_level) : minus_infinity;
+    }
+    else {
+        _interp_lower_level = _lower_level;
+        _interp_upper_level = _upper_level;
+        init_quad_middles();
+    }
+
     index_t list_len = _n_chunks;
     if ((_filled && (_fill_type == FillType::OuterCode|| _fill_type == FillType::OuterOffset)) ||
         (!_filled && (_line_type == LineType::Separate || _line_type == LineType::SeparateCode)))
@@ -2153,23 +3123,121 @@ py::sequence BaseContourGenerator<Derived>::march_wrapper()
     for (decltype(_return_list_count) i = 0; i < _return_list_count; ++i)
         return_lists.emplace_back(list_len);
 
+    // Whether each chunk is contoured, only needed if not contouring all chunks.
+    std::vector<bool> contour_chunk;
+    if (chunks != nullptr) {
+        contour_chunk.assign(_n_chunks, false);
+        for (auto chunk : *chunks)
+            contour_chunk[chunk] = true;
+    }
+
+    // If chunk results are kept, only trace the chunks that are not already up to date.
+    ChunkResults* results = nullptr;
+    if (_z_updated && _output_chunked && !_z_frame) {
+        results = &get_chunk_results();
+        results->used = true;
+        _used_since_update_z = true;
+
+        std::vector<index_t> invalid_chunks;
+        for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+            if (!results->valid[chunk] && (chunks == nullptr || contour_chunk[chunk]))
+                invalid_chunks.push_back(chunk);
+        }
+        set_trace_chunks(invalid_chunks);
+    }
+    else if (chunks != nullptr)
+        set_trace_chunks(*chunks);
+    else
+        set_trace_chunks();
+
     static_cast<Derived*>(this)->march(return_lists);
 
+    if (chunks != nullptr && _output_chunked) {
+        // Chunks that are not contoured have no results.
+        for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+            if (!contour_chunk[chunk]) {
+                for (auto& list : return_lists)
+                    list[chunk] = py::none();
+            }
+        }
+    }
+
+    if (results != nullptr) {
+        // Items are shared between calls so arrays are made read-only.
+        for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+            if (chunks != nullptr && !contour_chunk[chunk])
+                continue;
+
+            for (decltype(_return_list_count) i = 0; i < _return_list_count; ++i) {
+                if (results->valid[chunk])
+                    return_lists[i][chunk] = results->lists[i][chunk];
+                else {
+                    py::object item = return_lists[i][chunk];
+                    if (!item.is_none())
+                        item.attr("setflags")(py::arg("write") = false);
+                    results->lists[i][chunk] = item;
+                }
+            }
+            results->valid[chunk] = true;
+        }
+    }
+
     // Return to python objects.
+    py::sequence result;
     if (_return_list_count == 1) {
         assert(!_filled);
         if (_line_type == LineType::Separate)
-            return return_lists[0];
+            result = return_lists[0];
         else {
             assert(_line_type == LineType::ChunkCombinedNan);
-            return py::make_tuple(return_lists[0]);
+            result = py::make_tuple(return_lists[0]);
         }
     }
     else if (_return_list_count == 2)
-        return py::make_tuple(return_lists[0], return_lists[1]);
+        result = py::make_tuple(return_lists[0], return_lists[1]);
     else {
         assert(_return_list_count == 3);
-        return py::make_tuple(return_lists[0], return_lists[1], return_lists[2]);
+        result = py::make_tuple(return_lists[0], return_lists[1], return_lists[2]);
+    }
+
+    if (use_result_cache) {
+        auto nbytes = make_result_read_only(result);
+        if (nbytes <= _result_cache_max_nbytes) {
+            _result_cache.push_front({_filled, _lower_level, _upper_level, result, nbytes});
+            _result_cache_nbytes += nbytes;
+            trim_result_cache(_result_cache_max_nbytes);
+            return copy_result(result);
+        }
+    }
+
+    return result;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::march_frames(
+    const py::array& z_stack, const LevelArray& levels, bool filled, py::list& ret)
+{
+    auto n = static_cast<index_t>(ret.size());
+    try {
+        for (index_t frame = 0; frame < n; ++frame) {
+            set_z_frame(z_stack, frame);
+            ret[frame] = filled ? multi_filled(levels) : multi_lines(levels);
+        }
+    }
+    catch (...) {
+        restore_z();
+        throw;
+    }
+    restore_z();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::march_levels(const std::vector<double>& levels, py::list& ret)
+{
+    auto n = static_cast<index_t>(ret.size());
+    for (index_t i = 0; i < n; i++) {
+        set_multi_level(levels, i);
+        ret[i] = march_wrapper();
     }
 }
 
@@ -2332,17 +3400,49 @@ py::list BaseContourGenerator<Derived>::multi_filled(const LevelArray levels)
     auto levels_proxy = levels.unchecked<1>();
     auto n = levels_proxy.size();
 
-    py::list ret(n-1);
-    _lower_level = levels_proxy[0];
-    for (decltype(n) i = 0; i < n-1; i++) {
-        _upper_level = levels_proxy[i+1];
-        ret[i] = march_wrapper();
-        _lower_level = _upper_level;
+    // If there is more than one pair of levels, classify each point against all levels just once
+    // rather than once for each pair of levels.
+    bool use_level_indices = (n > 2 && n <= std::numeric_limits<LevelIndex>::max());
+
+    // Level indices and log(z) are only valid for this call, so they are released when it ends
+    // even if an exception is thrown.
+    struct ClearOnExit
+    {
+        BaseContourGenerator& generator;
+        ~ClearOnExit()
+        {
+            generator.clear_level_indices();
+            generator.clear_log_z();
+        }
+    } clear_on_exit{*this};
+
+    if (use_level_indices) {
+        // Python objects are not used so release the GIL, allowing other threads to contour other
+        // frames of a z stack at the same time.
+        py::gil_scoped_release release;
+        init_level_indices(levels);
     }
 
+    // log(z) and quad middles are calculated once for all levels, and shared with any workers.
+    init_log_z();
+    init_quad_middles();
+
+    std::vector<double> level_values(n);
+    for (decltype(n) i = 0; i < n; i++)
+        level_values[i] = levels_proxy[i];
+
+    py::list ret(n-1);
+    static_cast<Derived*>(this)->march_levels(level_values, ret);
     return ret;
 }
 
+template <typename Derived>
+py::list BaseContourGenerator<Derived>::multi_filled_stack(
+    const ZArray& z_stack, const LevelArray levels)
+{
+    return multi_stack(z_stack, levels, true);
+}
+
 template <typename Derived>
 py::list BaseContourGenerator<Derived>::multi_lines(const LevelArray levels)
 {
@@ -2352,28 +3452,70 @@ py::list BaseContourGenerator<Derived>::multi_lines(const LevelArray levels)
     auto levels_proxy = levels.unchecked<1>();
     auto n = levels_proxy.size();
 
+    // log(z) and quad middles are calculated once for all levels, and shared with any workers.
+    init_log_z();
+    init_quad_middles();
+
+    std::vector<double> level_values(n);
+    for (decltype(n) i = 0; i < n; i++)
+        level_values[i] = levels_proxy[i];
+
     py::list ret(n);
-    for (decltype(n) i = 0; i < n; i++) {
-        _lower_level = _upper_level = levels_proxy[i];
-        ret[i] = march_wrapper();
-    }
+    static_cast<Derived*>(this)->march_levels(level_values, ret);
+    clear_log_z();
+
+    return ret;
+}
+
+template <typename Derived>
+py::list BaseContourGenerator<Derived>::multi_lines_stack(
+    const ZArray& z_stack, const LevelArray levels)
+{
+    return multi_stack(z_stack, levels, false);
+}
 
+template <typename Derived>
+py::list BaseContourGenerator<Derived>::multi_stack(
+    const ZArray& z_stack, const LevelArray& levels, bool filled)
+{
+    auto stack = check_z_stack(z_stack);
+    check_levels(levels, filled);
+
+    py::list ret(stack.shape(0));
+    static_cast<Derived*>(this)->march_frames(stack, levels, filled, ret);
     return ret;
 }
 
+template <typename Derived>
+typename BaseContourGenerator<Derived>::ZLevel BaseContourGenerator<Derived>::point_to_zlevel(
+    index_t point) const
+{
+    if (!_level_indices)
+        return z_to_zlevel(get_point_z(point));
+
+    assert(_filled);
+    auto level_index = _level_indices->point[point];
+    return level_index > _lower_level_index + 1 ? 2 : (level_index > _lower_level_index ? 1 : 0);
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::pre_filled()
 {
     _filled = true;
+    _output_level = 0;
+
+    if (_level_indices)
+        clear_level_indices();
 
     _identify_holes = !(_fill_type == FillType::ChunkCombinedCode ||
                         _fill_type == FillType::ChunkCombinedOffset);
     _output_chunked = !(_fill_type == FillType::OuterCode || _fill_type == FillType::OuterOffset);
-    _direct_points = _output_chunked;
-    _direct_line_offsets = (_fill_type == FillType::ChunkCombinedOffset||
-                            _fill_type == FillType::ChunkCombinedOffsetOffset);
-    _direct_outer_offsets = (_fill_type == FillType::ChunkCombinedCodeOffset ||
-                             _fill_type == FillType::ChunkCombinedOffsetOffset);
+    bool direct = !Derived::defer_python_arrays;
+    _direct_points = direct && _output_chunked && !_output_float32;
+    _direct_line_offsets = direct && (_fill_type == FillType::ChunkCombinedOffset||
+                                      _fill_type == FillType::ChunkCombinedOffsetOffset);
+    _direct_outer_offsets = direct && (_fill_type == FillType::ChunkCombinedCodeOffset ||
+                                       _fill_type == FillType::ChunkCombinedOffsetOffset);
     _outer_offsets_into_points = (_fill_type == FillType::ChunkCombinedCodeOffset);
     _nan_separated = false;
     _return_list_count = (_fill_type == FillType::ChunkCombinedCodeOffset ||
@@ -2384,11 +3526,16 @@ template <typename Derived>
 void BaseContourGenerator<Derived>::pre_lines()
 {
     _filled = false;
+    _output_level = 0;
+
+    if (_level_indices)
+        clear_level_indices();
 
     _identify_holes = false;
     _output_chunked = !(_line_type == LineType::Separate || _line_type == LineType::SeparateCode);
-    _direct_points = _output_chunked;
-    _direct_line_offsets = (_line_type == LineType::ChunkCombinedOffset);
+    bool direct = !Derived::defer_python_arrays;
+    _direct_points = direct && _output_chunked && !_output_float32;
+    _direct_line_offsets = direct && (_line_type == LineType::ChunkCombinedOffset);
     _direct_outer_offsets = false;
     _outer_offsets_into_points = false;
     _return_list_count = (_line_type == LineType::Separate ||
@@ -2399,6 +3546,60 @@ void BaseContourGenerator<Derived>::pre_lines()
         Util::ensure_nan_loaded();
 }
 
+template <typename Derived>
+double BaseContourGenerator<Derived>::read_z_value(const char* ptr, bool float32)
+{
+    // memcpy as ptr may not be aligned.
+    if (float32) {
+        float value;
+        std::memcpy(&value, ptr, sizeof(float));
+        return value;
+    }
+    else {
+        double value;
+        std::memcpy(&value, ptr, sizeof(double));
+        return value;
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::restore_z()
+{
+    _z_frame = false;
+    _log_z.reset();
+    _middle_z.reset();
+    init_z_access();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_grid_chunks()
+{
+    _grid_chunks.clear();
+    if (_grid_chunk_initialised_count == _n_chunks)
+        return;  // Already all chunks.
+
+    // Initialisation of the cache z-levels and starts of a chunk reads the N and E boundaries of
+    // its W and S neighbours.
+    std::vector<bool> grid(_n_chunks, false);
+    for (auto chunk : _init_chunks) {
+        grid[chunk] = true;
+        if (chunk % _nx_chunks > 0)
+            grid[chunk-1] = true;
+        if (chunk / _nx_chunks > 0)
+            grid[chunk-_nx_chunks] = true;
+    }
+
+    // Chunks are marked as initialised here as they are always initialised by the march() that
+    // follows.
+    for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+        if (grid[chunk] && !_grid_chunk_initialised[chunk]) {
+            _grid_chunks.push_back(chunk);
+            _grid_chunk_initialised[chunk] = true;
+            _grid_chunk_initialised_count++;
+        }
+    }
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::set_look_flags(index_t hole_start_quad)
 {
@@ -2460,6 +3661,250 @@ bool BaseContourGenerator<Derived>::supports_line_type(LineType line_type)
     }
 }
 
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_cache_quad_middles(bool cache)
+{
+    _cache_quad_middles = cache;
+    if (!cache) {
+        _middle_xy.reset();
+        _middle_z.reset();
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_keep_log_z(bool keep)
+{
+    _keep_log_z = keep;
+    clear_log_z();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_multi_level(
+    const std::vector<double>& levels, index_t index)
+{
+    _output_level = index;
+
+    if (_filled) {
+        assert(index >= 0 && index+1 < static_cast<index_t>(levels.size()));
+        _lower_level = levels[index];
+        _upper_level = levels[index+1];
+        _lower_level_index = static_cast<LevelIndex>(index);
+    }
+    else {
+        assert(index >= 0 && index < static_cast<index_t>(levels.size()));
+        _lower_level = _upper_level = levels[index];
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_reuse_output_buffers(bool reuse)
+{
+    _reuse_output_buffers = reuse;
+    if (!reuse)
+        clear_output_buffers();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_result_cache_size(index_t max_nbytes)
+{
+    if (max_nbytes < 0)
+        throw std::invalid_argument("Result cache size must be non-negative");
+
+    _result_cache_max_nbytes = max_nbytes;
+    trim_result_cache(max_nbytes);
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_single_pass(bool single_pass)
+{
+    _single_pass = single_pass;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_trace_chunks()
+{
+    if (static_cast<index_t>(_trace_chunks.size()) != _n_chunks) {
+        _trace_chunks.resize(_n_chunks);
+        std::iota(_trace_chunks.begin(), _trace_chunks.end(), 0);
+        _init_chunks = _trace_chunks;
+    }
+
+    set_grid_chunks();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_trace_chunks(const std::vector<index_t>& chunks)
+{
+    assert(std::is_sorted(chunks.begin(), chunks.end()));
+    _trace_chunks = chunks;
+
+    std::vector<bool> init(_n_chunks, false);
+    for (auto chunk : chunks) {
+        auto ichunk = chunk % _nx_chunks;
+        auto jchunk = chunk / _nx_chunks;
+        init[chunk] = true;
+        if (ichunk > 0)
+            init[chunk-1] = true;
+        if (jchunk > 0)
+            init[chunk-_nx_chunks] = true;
+        if (ichunk > 0 && jchunk > 0)
+            init[chunk-_nx_chunks-1] = true;
+    }
+
+    _init_chunks.clear();
+    for (index_t chunk = 0; chunk < _n_chunks; ++chunk) {
+        if (init[chunk])
+            _init_chunks.push_back(chunk);
+    }
+
+    set_grid_chunks();
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_z_frame(const py::array& z_stack, index_t frame)
+{
+    _z_frame = true;
+    _log_z.reset();
+    _middle_z.reset();
+    _z_float32 = py::isinstance<py::array_t<float>>(z_stack);
+    _zdata = static_cast<const char*>(z_stack.data()) + frame*z_stack.strides(0);
+    _z_row_stride = z_stack.strides(1);
+    _z_col_stride = z_stack.strides(2);
+
+    bool c_contiguous = (_z_col_stride == sizeof(double) && _z_row_stride == _nx*_z_col_stride);
+    _zptr = (!_z_float32 && c_contiguous) ? reinterpret_cast<const double*>(_zdata) : nullptr;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::trim_result_cache(index_t max_nbytes)
+{
+    // Evict least recently used entries.
+    while (_result_cache_nbytes > max_nbytes || (max_nbytes == 0 && !_result_cache.empty())) {
+        _result_cache_nbytes -= _result_cache.back().nbytes;
+        _result_cache.pop_back();
+    }
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::set_z(const ZArray& z)
+{
+    auto [new_z, new_mask] = as_z_array_and_mask(z);
+
+    bool mask_changed = (new_mask.ndim() != _mask.ndim() ||
+        (new_mask.ndim() != 0 && !std::equal(new_mask.data(), new_mask.data() + _n, _mask.data())));
+
+    if (_z_interp == ZInterp::Log) {
+        // Check the new z and mask, restoring the old ones if they are not valid.
+        auto old_z = _z;
+        auto old_mask = _mask;
+        _z = new_z;
+        _mask = new_mask;
+        init_z_access();
+        try {
+            check_z_positive();
+        }
+        catch (...) {
+            _z = old_z;
+            _mask = old_mask;
+            init_z_access();
+            throw;
+        }
+    }
+    else {
+        _z = new_z;
+        _mask = new_mask;
+        init_z_access();
+    }
+
+    if (mask_changed) {
+        if (_mask.ndim() == 0) {
+            delete [] _mask_cache;
+            _mask_cache = nullptr;
+        }
+        else if (_mask_cache == nullptr)
+            _mask_cache = new MaskCacheItem[_n];
+
+        _grid_chunk_initialised.assign(_n_chunks, false);
+        _grid_chunk_initialised_count = 0;
+    }
+
+    // All cached results and those kept for update_z() are out of date, as are log(z) and the z
+    // of quad middles.
+    trim_result_cache(0);
+    _chunk_results.clear();
+    _log_z.reset();
+    _middle_z.reset();
+    _z_updated = false;
+    _used_since_update_z = false;
+}
+
+template <typename Derived>
+void BaseContourGenerator<Derived>::update_z(
+    const CoordinateArray& z_patch, const py::slice& row_slice, const py::slice& col_slice)
+{
+    py::ssize_t jstart, jstop, jstep, nj, istart, istop, istep, ni;
+    if (!row_slice.compute(_ny, &jstart, &jstop, &jstep, &nj) ||
+        !col_slice.compute(_nx, &istart, &istop, &istep, &ni))
+        throw py::error_already_set();
+
+    if ((nj > 0 && jstep != 1) || (ni > 0 && istep != 1))
+        throw std::invalid_argument("row_slice and col_slice must have a step of 1");
+
+    if (z_patch.ndim() != 2 || z_patch.shape(0) != nj || z_patch.shape(1) != ni)
+        throw std::invalid_argument(
+            "z_patch must be a 2D array with shape matching row_slice and col_slice");
+
+    if (nj == 0 || ni == 0)
+        return;
+
+    const double* patch = z_patch.data();
+    for (py::ssize_t k = 0; k < nj*ni; ++k) {
+        if (!std::isfinite(patch[k]))
+            throw std::invalid_argument(
+                "z_patch cannot contain NaN or infinity as the mask cannot be changed");
+        if (_z_interp == ZInterp::Log && patch[k] <= 0.0)
+            throw std::invalid_argument("z values must be positive if using ZInterp.Log");
+    }
+
+    if (!_z_updated) {
+        // z may be shared with the caller so it is copied to a C-contiguous float64 array before
+        // it is first changed.
+        CoordinateArray z({_ny, _nx});
+        auto z_data = z.mutable_data();
+        for (index_t point = 0; point < _n; ++point)
+            z_data[point] = get_point_z(point);
+        _z = z;
+        init_z_access();
+        _z_updated = true;
+    }
+
+    double* z = static_cast<double*>(_z.mutable_data());
+    for (py::ssize_t j = 0; j < nj; ++j)
+        std::copy(patch + j*ni, patch + (j+1)*ni, z + (jstart + j)*_nx + istart);
+
+    // All cached results are out of date, as are log(z) and the z of quad middles.
+    trim_result_cache(0);
+    _log_z.reset();
+    _middle_z.reset();
+
+    // Chunk results not used since update_z() was last called are no longer needed.
+    if (_used_since_update_z) {
+        _chunk_results.erase(
+            std::remove_if(_chunk_results.begin(), _chunk_results.end(),
+                           [](const ChunkResults& results) { return !results.used; }),
+            _chunk_results.end());
+        for (auto& results : _chunk_results)
+            results.used = false;
+        _used_since_update_z = false;
+    }
+
+    // Chunks containing quads that use the updated points.
+    for (auto chunk : get_region_chunks(jstart, jstop, istart, istop)) {
+        for (auto& results : _chunk_results)
+            results.valid[chunk] = false;
+    }
+}
+
 template <typename Derived>
 void BaseContourGenerator<Derived>::write_cache() const
 {
@@ -2486,7 +3931,8 @@ void BaseContourGenerator<Derived>::write_cache_quad(index_t quad) const
     assert(quad >= 0 && quad < _n && "quad index out of bounds");
     std::cout << (NO_MORE_STARTS(quad) ? 'x' :
                     (NO_STARTS_IN_ROW(quad) ? 'i' : '.'));
-    std::cout << (EXISTS_QUAD(quad) ? "Q_" :
+    bool edge_quad = (quad % _nx == 0 || quad < _nx);  // On W or S edge of domain.
+    std::cout << (edge_quad ? ".." : EXISTS_QUAD(quad) ? "Q_" :
                    (EXISTS_NW_CORNER(quad) ? "NW" :
                      (EXISTS_NE_CORNER(quad) ? "NE" :
                        (EXISTS_SW_CORNER(quad) ? "SW" :
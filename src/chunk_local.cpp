@@ -15,6 +15,7 @@ void ChunkLocal::clear()
     chunk = -1;
     istart = iend = jstart = jend = -1;
     pass = -1;
+    single_pass = false;
 
     total_point_count = 0;
     line_count = 0;
@@ -19,13 +19,15 @@ struct ChunkLocal
     index_t chunk;                       // Index in range 0 to _n_chunks-1.
     index_t istart, iend, jstart, jend;  // Chunk limits, inclusive.
     int pass;
+    bool single_pass;                    // Whether pass 0 also writes the output arrays.
 
     // Data for whole pass.
     count_t total_point_count;           // Includes nan separators if used.
     count_t line_count;                  // Count of all lines
     count_t hole_count;                  // Count of holes only.
 
-    // Output arrays that are initialised at the end of pass 0 and written to during pass 1.
+    // Output arrays that are initialised at the end of pass 0 and written to during pass 1, or that
+    // grow as they are written to if single_pass.
     OutputArray<double> points;
     OutputArray<offset_t> line_offsets;  // Into array of points.
     OutputArray<offset_t> outer_offsets; // Into array of points or line offsets depending on
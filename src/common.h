@@ -22,6 +22,12 @@ typedef uint32_t offset_t;
 typedef py::array_t<double, py::array::c_style | py::array::forcecast> CoordinateArray;
 typedef py::array_t<bool,   py::array::c_style | py::array::forcecast> MaskArray;
 typedef py::array_t<double> LevelArray;  // Doesn't have to be contiguous.
+// x or y array, or anything convertible to one.  C-contiguous float64 and float32 arrays are used
+// without copying, anything else is converted to a C-contiguous float64 array.
+typedef py::object XYArray;
+// z array, or anything convertible to one.  float64 and float32 arrays with any strides are used
+// without copying, anything else is converted to a C-contiguous float64 array.
+typedef py::object ZArray;
 
 // Output numpy array classes.
 typedef py::array_t<double>   PointArray;
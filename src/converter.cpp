@@ -1,6 +1,9 @@
 #include "converter.h"
 #include "mpl_kind_code.h"
+#include <algorithm>
+#include <cmath>
 #include <limits>
+#include <optional>
 
 namespace contourpy {
 
@@ -10,6 +13,190 @@ void Converter::check_max_offset(count_t max_offset)
         throw std::range_error("Max offset too large to fit in np.uint32. Use smaller chunks.");
 }
 
+Converter::ContiguousCodeArray Converter::codes_from_offsets(
+    const ContiguousOffsetArray& offsets, const double* points)
+{
+    auto offset_count = static_cast<count_t>(offsets.shape(0));
+    auto offsets_ptr = offsets.data();
+    auto point_count = static_cast<count_t>(offsets_ptr[offset_count-1]);
+
+    ContiguousCodeArray codes(static_cast<index_t>(point_count));
+    auto codes_ptr = codes.mutable_data();
+
+    {
+        std::optional<py::gil_scoped_release> release;
+        if (point_count >= release_gil_threshold)
+            release.emplace();
+
+        if (points == nullptr)
+            convert_codes(point_count, offset_count, offsets_ptr, 0, codes_ptr);
+        else
+            convert_codes_check_closed(point_count, offset_count, offsets_ptr, points, codes_ptr);
+    }
+
+    return codes;
+}
+
+std::vector<Converter::Combined> Converter::combine_filled(
+    const py::tuple& filled, FillType fill_type)
+{
+    auto all_points = filled[0].cast<py::list>();
+    auto all_second = filled[1].cast<py::list>();
+
+    std::vector<Combined> chunks;
+    if (fill_type == FillType::OuterCode || fill_type == FillType::OuterOffset) {
+        // All polygons are combined into a single chunk.
+        chunks.resize(1);
+        if (!all_points.empty()) {
+            auto& chunk = chunks.front();
+            chunk.points = concat<double>(all_points, 2);
+            if (fill_type == FillType::OuterCode) {
+                chunk.codes = concat<uint8_t>(all_second, 1);
+                chunk.outer_points = offsets_from_lengths(all_points, 0);
+            }
+            else {
+                chunk.offsets = concat_offsets(all_second);
+                chunk.outer_offsets = offsets_from_lengths(all_second, 1);
+            }
+        }
+        return chunks;
+    }
+
+    auto chunk_count = all_points.size();
+    chunks.resize(chunk_count);
+    for (decltype(chunk_count) i = 0; i < chunk_count; ++i) {
+        if (all_points[i].is_none())
+            continue;
+
+        auto& chunk = chunks[i];
+        chunk.points = all_points[i].cast<ContiguousPointArray>();
+        switch (fill_type) {
+            case FillType::ChunkCombinedCode:
+                chunk.codes = all_second[i].cast<ContiguousCodeArray>();
+                break;
+            case FillType::ChunkCombinedOffset:
+                chunk.offsets = all_second[i].cast<ContiguousOffsetArray>();
+                break;
+            case FillType::ChunkCombinedCodeOffset:
+                chunk.codes = all_second[i].cast<ContiguousCodeArray>();
+                chunk.outer_points = filled[2].cast<py::list>()[i].cast<ContiguousOffsetArray>();
+                break;
+            case FillType::ChunkCombinedOffsetOffset:
+                chunk.offsets = all_second[i].cast<ContiguousOffsetArray>();
+                chunk.outer_offsets = filled[2].cast<py::list>()[i].cast<ContiguousOffsetArray>();
+                break;
+            default:
+                throw std::invalid_argument("Invalid FillType");
+        }
+    }
+    return chunks;
+}
+
+std::vector<Converter::Combined> Converter::combine_lines(
+    const py::object& lines, LineType line_type)
+{
+    std::vector<Combined> chunks;
+    if (line_type == LineType::Separate || line_type == LineType::SeparateCode) {
+        // All lines are combined into a single chunk.
+        auto all_points = line_type == LineType::Separate ?
+            lines.cast<py::list>() : lines.cast<py::tuple>()[0].cast<py::list>();
+        chunks.resize(1);
+        if (!all_points.empty()) {
+            auto& chunk = chunks.front();
+            chunk.points = concat<double>(all_points, 2);
+            chunk.offsets = offsets_from_lengths(all_points, 0);
+            if (line_type == LineType::SeparateCode)
+                chunk.codes = concat<uint8_t>(lines.cast<py::tuple>()[1].cast<py::list>(), 1);
+        }
+        return chunks;
+    }
+
+    auto lines_tuple = lines.cast<py::tuple>();
+    auto all_points = lines_tuple[0].cast<py::list>();
+    auto chunk_count = all_points.size();
+    chunks.resize(chunk_count);
+    for (decltype(chunk_count) i = 0; i < chunk_count; ++i) {
+        if (all_points[i].is_none())
+            continue;
+
+        auto& chunk = chunks[i];
+        chunk.points = all_points[i].cast<ContiguousPointArray>();
+        switch (line_type) {
+            case LineType::ChunkCombinedCode:
+                chunk.codes = lines_tuple[1].cast<py::list>()[i].cast<ContiguousCodeArray>();
+                break;
+            case LineType::ChunkCombinedOffset:
+                chunk.offsets = lines_tuple[1].cast<py::list>()[i].cast<ContiguousOffsetArray>();
+                break;
+            case LineType::ChunkCombinedNan:
+                remove_nan(chunk);
+                break;
+            default:
+                throw std::invalid_argument("Invalid LineType");
+        }
+    }
+    return chunks;
+}
+
+template <typename T>
+Converter::ContiguousArray<T> Converter::concat(const py::list& list_of_arrays, index_t ncols)
+{
+    std::vector<ContiguousArray<T>> arrays;
+    arrays.reserve(list_of_arrays.size());
+    count_t total = 0;
+    for (auto item : list_of_arrays) {
+        arrays.push_back(item.cast<ContiguousArray<T>>());
+        total += arrays.back().shape(0);
+    }
+    check_max_offset(total);
+
+    auto rows = static_cast<index_t>(total);
+    ContiguousArray<T> ret(
+        ncols == 1 ? std::vector<index_t>{rows} : std::vector<index_t>{rows, ncols});
+    auto ptr = ret.mutable_data();
+
+    {
+        py::gil_scoped_release release;
+        for (const auto& array : arrays)
+            ptr = std::copy(array.data(), array.data() + array.size(), ptr);
+    }
+
+    return ret;
+}
+
+Converter::ContiguousOffsetArray Converter::concat_offsets(const py::list& list_of_offsets)
+{
+    std::vector<ContiguousOffsetArray> arrays;
+    arrays.reserve(list_of_offsets.size());
+    count_t total = 1;
+    count_t point_count = 0;
+    for (auto item : list_of_offsets) {
+        arrays.push_back(item.cast<ContiguousOffsetArray>());
+        auto& offsets = arrays.back();
+        total += offsets.shape(0) - 1;
+        point_count += offsets.data()[offsets.shape(0) - 1];
+    }
+    check_max_offset(point_count);
+
+    ContiguousOffsetArray ret(static_cast<index_t>(total));
+    auto ptr = ret.mutable_data();
+
+    {
+        py::gil_scoped_release release;
+        offset_t start = 0;
+        *ptr++ = 0;
+        for (const auto& offsets : arrays) {
+            auto offsets_ptr = offsets.data();
+            auto offset_count = offsets.shape(0);
+            for (py::ssize_t j = 1; j < offset_count; ++j)
+                *ptr++ = offsets_ptr[j] + start;
+            start += offsets_ptr[offset_count-1];
+        }
+    }
+
+    return ret;
+}
+
 CodeArray Converter::convert_codes(
     count_t point_count, count_t cut_count, const offset_t* cut_start, offset_t subtract)
 {
@@ -102,6 +289,144 @@ void Converter::convert_codes_check_closed_single(
         std::fill(codes + 1, codes + point_count, LINETO);
 }
 
+Converter::ContiguousPointArray Converter::concat_points_with_nan(
+    const py::list& list_of_points)
+{
+    std::vector<ContiguousPointArray> arrays;
+    arrays.reserve(list_of_points.size());
+    count_t total = 0;
+    for (auto item : list_of_points) {
+        arrays.push_back(item.cast<ContiguousPointArray>());
+        total += arrays.back().shape(0);
+    }
+    if (arrays.size() == 1)
+        return arrays.front();
+
+    total += arrays.size() - 1;
+    check_max_offset(total);
+
+    index_t shape[2] = {static_cast<index_t>(total), 2};
+    ContiguousPointArray ret(shape);
+    auto ptr = ret.mutable_data();
+
+    {
+        py::gil_scoped_release release;
+        for (std::size_t i = 0; i < arrays.size(); ++i) {
+            if (i > 0) {
+                *ptr++ = std::numeric_limits<double>::quiet_NaN();
+                *ptr++ = std::numeric_limits<double>::quiet_NaN();
+            }
+            ptr = std::copy(arrays[i].data(), arrays[i].data() + arrays[i].size(), ptr);
+        }
+    }
+
+    return ret;
+}
+
+py::tuple Converter::convert_filled(
+    const py::tuple& filled, FillType fill_type_from, FillType fill_type_to)
+{
+    // Conversions between the two types that are not chunked do not combine polygons.
+    if (fill_type_from == FillType::OuterCode && fill_type_to == FillType::OuterOffset) {
+        py::list all_offsets;
+        for (auto codes : filled[1].cast<py::list>())
+            all_offsets.append(offsets_from_codes(codes.cast<ContiguousCodeArray>()));
+        return py::make_tuple(filled[0], all_offsets);
+    }
+    else if (fill_type_from == FillType::OuterOffset && fill_type_to == FillType::OuterCode) {
+        py::list all_codes;
+        for (auto offsets : filled[1].cast<py::list>())
+            all_codes.append(codes_from_offsets(offsets.cast<ContiguousOffsetArray>(), nullptr));
+        return py::make_tuple(filled[0], all_codes);
+    }
+
+    if ((fill_type_from == FillType::ChunkCombinedCode ||
+         fill_type_from == FillType::ChunkCombinedOffset) &&
+        (fill_type_to != FillType::ChunkCombinedCode &&
+         fill_type_to != FillType::ChunkCombinedOffset))
+        throw std::invalid_argument(
+            "Cannot convert FillType without outer boundaries to one that requires them");
+
+    auto chunks = combine_filled(filled, fill_type_from);
+    return export_filled(chunks, fill_type_to);
+}
+
+py::object Converter::convert_lines(
+    const py::object& lines, LineType line_type_from, LineType line_type_to)
+{
+    // Conversions between the two types that are not chunked do not combine lines.
+    if (line_type_from == LineType::Separate && line_type_to == LineType::SeparateCode) {
+        py::list all_codes;
+        for (auto item : lines.cast<py::list>()) {
+            auto points = item.cast<ContiguousPointArray>();
+            auto point_count = static_cast<count_t>(points.shape(0));
+            all_codes.append(convert_codes_check_closed_single(point_count, points.data()));
+        }
+        return py::make_tuple(lines, all_codes);
+    }
+    else if (line_type_from == LineType::SeparateCode && line_type_to == LineType::Separate)
+        return lines.cast<py::tuple>()[0];
+
+    auto chunks = combine_lines(lines, line_type_from);
+    return export_lines(chunks, line_type_to);
+}
+
+py::tuple Converter::dechunk(const py::tuple& chunked, bool second_is_codes)
+{
+    auto item_count = chunked.size();
+    std::vector<py::list> non_empty(item_count);
+    auto all_points = chunked[0].cast<py::list>();
+    auto chunk_count = all_points.size();
+    for (decltype(chunk_count) chunk = 0; chunk < chunk_count; ++chunk) {
+        if (all_points[chunk].is_none())
+            continue;
+        for (decltype(item_count) i = 0; i < item_count; ++i)
+            non_empty[i].append(chunked[i].cast<py::list>()[chunk]);
+    }
+
+    py::tuple ret(item_count);
+    for (decltype(item_count) i = 0; i < item_count; ++i) {
+        py::list list(1);
+        list[0] = py::none();
+        if (non_empty[i].size() == 1)
+            list[0] = non_empty[i][0];  // Single non-empty chunk is not copied.
+        else if (non_empty[i].size() > 1) {
+            if (i == 0)
+                list[0] = concat<double>(non_empty[i], 2);
+            else if (i == 1 && second_is_codes)
+                list[0] = concat<uint8_t>(non_empty[i], 1);
+            else
+                list[0] = concat_offsets(non_empty[i]);
+        }
+        ret[i] = list;
+    }
+    return ret;
+}
+
+py::tuple Converter::dechunk_filled(const py::tuple& filled, FillType fill_type)
+{
+    return dechunk(filled, fill_type == FillType::ChunkCombinedCode ||
+                           fill_type == FillType::ChunkCombinedCodeOffset);
+}
+
+py::tuple Converter::dechunk_lines(const py::tuple& lines, LineType line_type)
+{
+    if (line_type != LineType::ChunkCombinedNan)
+        return dechunk(lines, line_type == LineType::ChunkCombinedCode);
+
+    py::list non_empty;
+    for (auto points : lines[0].cast<py::list>()) {
+        if (!points.is_none())
+            non_empty.append(points);
+    }
+
+    py::list list(1);
+    list[0] = py::none();
+    if (!non_empty.empty())
+        list[0] = concat_points_with_nan(non_empty);
+    return py::make_tuple(list);
+}
+
 OffsetArray Converter::convert_offsets(
     count_t offset_count, const offset_t* start, offset_t subtract)
 {
@@ -152,4 +477,345 @@ void Converter::convert_points(count_t point_count, const double* start, double*
     std::copy(start, start + 2*point_count, points);
 }
 
+void Converter::convert_points(count_t point_count, const double* start, float* points)
+{
+    assert(point_count > 0);
+    assert(start != nullptr);
+    assert(points != nullptr);
+
+    std::transform(start, start + 2*point_count, points,
+                   [](double value) { return static_cast<float>(value); });
+}
+
+py::array_t<float> Converter::convert_points_float32(count_t point_count, const double* start)
+{
+    assert(point_count > 0);
+    assert(start != nullptr);
+
+    index_t points_shape[2] = {static_cast<index_t>(point_count), 2};
+    py::array_t<float> py_points(points_shape);
+    convert_points(point_count, start, py_points.mutable_data());
+    return py_points;
+}
+
+void Converter::ensure_codes(Combined& combined, bool check_closed)
+{
+    if (combined.codes.size() == 0)
+        combined.codes = codes_from_offsets(
+            combined.offsets, check_closed ? combined.points.data() : nullptr);
+}
+
+void Converter::ensure_offsets(Combined& combined)
+{
+    if (combined.offsets.size() == 0)
+        combined.offsets = offsets_from_codes(combined.codes);
+}
+
+void Converter::ensure_outer_offsets(Combined& combined)
+{
+    if (combined.outer_offsets.size() > 0)
+        return;
+
+    ensure_offsets(combined);
+    auto outer_count = combined.outer_points.shape(0);
+    combined.outer_offsets = ContiguousOffsetArray(outer_count);
+    auto outer_offsets_ptr = combined.outer_offsets.mutable_data();
+
+    py::gil_scoped_release release;
+    auto offsets_ptr = combined.offsets.data();
+    auto offset_count = combined.offsets.shape(0);
+    auto outer_points_ptr = combined.outer_points.data();
+    // Both outer_points and offsets are increasing so a single pass through each is sufficient.
+    py::ssize_t j = 0;
+    for (py::ssize_t i = 0; i < outer_count; ++i) {
+        while (j < offset_count-1 && offsets_ptr[j] < outer_points_ptr[i])
+            ++j;
+        outer_offsets_ptr[i] = static_cast<offset_t>(j);
+    }
+}
+
+void Converter::ensure_outer_points(Combined& combined)
+{
+    if (combined.outer_points.size() > 0)
+        return;
+
+    ensure_offsets(combined);
+    auto outer_count = combined.outer_offsets.shape(0);
+    combined.outer_points = ContiguousOffsetArray(outer_count);
+    auto outer_points_ptr = combined.outer_points.mutable_data();
+
+    py::gil_scoped_release release;
+    auto offsets_ptr = combined.offsets.data();
+    auto outer_offsets_ptr = combined.outer_offsets.data();
+    for (py::ssize_t i = 0; i < outer_count; ++i)
+        outer_points_ptr[i] = offsets_ptr[outer_offsets_ptr[i]];
+}
+
+py::tuple Converter::export_filled(std::vector<Combined>& chunks, FillType fill_type)
+{
+    if (fill_type == FillType::OuterCode || fill_type == FillType::OuterOffset) {
+        py::list all_points, all_second;
+        for (auto& chunk : chunks) {
+            if (chunk.points.size() == 0)
+                continue;
+
+            ensure_outer_points(chunk);
+            split(chunk.points, chunk.outer_points, all_points);
+            if (fill_type == FillType::OuterCode) {
+                ensure_codes(chunk, false);
+                split(chunk.codes, chunk.outer_points, all_second);
+            }
+            else {
+                // Offsets of each polygon are relative to the start of that polygon.
+                ensure_outer_offsets(chunk);
+                auto offsets_ptr = chunk.offsets.data();
+                auto outer_offsets_ptr = chunk.outer_offsets.data();
+                auto outer_count = chunk.outer_offsets.shape(0);
+                for (py::ssize_t i = 0; i < outer_count-1; ++i) {
+                    auto start = offsets_ptr + outer_offsets_ptr[i];
+                    auto offset_count = outer_offsets_ptr[i+1] - outer_offsets_ptr[i] + 1;
+                    OffsetArray offsets(static_cast<index_t>(offset_count));
+                    auto ptr = offsets.mutable_data();
+                    for (offset_t j = 0; j < offset_count; ++j)
+                        ptr[j] = start[j] - start[0];
+                    all_second.append(offsets);
+                }
+            }
+        }
+        return py::make_tuple(all_points, all_second);
+    }
+
+    bool codes = (fill_type == FillType::ChunkCombinedCode ||
+                  fill_type == FillType::ChunkCombinedCodeOffset);
+    bool outer = (fill_type == FillType::ChunkCombinedCodeOffset ||
+                  fill_type == FillType::ChunkCombinedOffsetOffset);
+
+    py::list all_points, all_second, all_outer;
+    for (auto& chunk : chunks) {
+        if (chunk.points.size() == 0) {
+            all_points.append(py::none());
+            all_second.append(py::none());
+            all_outer.append(py::none());
+            continue;
+        }
+
+        all_points.append(chunk.points);
+        if (codes) {
+            ensure_codes(chunk, false);
+            all_second.append(chunk.codes);
+        }
+        else {
+            ensure_offsets(chunk);
+            all_second.append(chunk.offsets);
+        }
+
+        if (outer) {
+            if (codes) {
+                ensure_outer_points(chunk);
+                all_outer.append(chunk.outer_points);
+            }
+            else {
+                ensure_outer_offsets(chunk);
+                all_outer.append(chunk.outer_offsets);
+            }
+        }
+    }
+
+    if (outer)
+        return py::make_tuple(all_points, all_second, all_outer);
+    else
+        return py::make_tuple(all_points, all_second);
+}
+
+py::object Converter::export_lines(std::vector<Combined>& chunks, LineType line_type)
+{
+    if (line_type == LineType::Separate || line_type == LineType::SeparateCode) {
+        py::list all_points, all_codes;
+        for (auto& chunk : chunks) {
+            if (chunk.points.size() == 0)
+                continue;
+
+            ensure_offsets(chunk);
+            split(chunk.points, chunk.offsets, all_points);
+            if (line_type == LineType::SeparateCode) {
+                ensure_codes(chunk, true);
+                split(chunk.codes, chunk.offsets, all_codes);
+            }
+        }
+
+        if (line_type == LineType::Separate)
+            return all_points;
+        else
+            return py::make_tuple(all_points, all_codes);
+    }
+
+    py::list all_points, all_second;
+    for (auto& chunk : chunks) {
+        if (chunk.points.size() == 0) {
+            all_points.append(py::none());
+            all_second.append(py::none());
+            continue;
+        }
+
+        switch (line_type) {
+            case LineType::ChunkCombinedCode:
+                ensure_codes(chunk, true);
+                all_points.append(chunk.points);
+                all_second.append(chunk.codes);
+                break;
+            case LineType::ChunkCombinedOffset:
+                ensure_offsets(chunk);
+                all_points.append(chunk.points);
+                all_second.append(chunk.offsets);
+                break;
+            case LineType::ChunkCombinedNan:
+                ensure_offsets(chunk);
+                all_points.append(insert_nan(chunk.points, chunk.offsets));
+                break;
+            default:
+                throw std::invalid_argument("Invalid LineType");
+        }
+    }
+
+    if (line_type == LineType::ChunkCombinedNan)
+        return py::make_tuple(all_points);
+    else
+        return py::make_tuple(all_points, all_second);
+}
+
+Converter::ContiguousPointArray Converter::insert_nan(
+    const ContiguousPointArray& points, const ContiguousOffsetArray& offsets)
+{
+    auto offset_count = offsets.shape(0);
+    if (offset_count <= 2)
+        return points;
+
+    index_t shape[2] = {points.shape(0) + offset_count - 2, 2};
+    ContiguousPointArray ret(shape);
+    auto ptr = ret.mutable_data();
+
+    {
+        py::gil_scoped_release release;
+        auto points_ptr = points.data();
+        auto offsets_ptr = offsets.data();
+        for (py::ssize_t i = 0; i < offset_count-1; ++i) {
+            if (i > 0) {
+                *ptr++ = std::numeric_limits<double>::quiet_NaN();
+                *ptr++ = std::numeric_limits<double>::quiet_NaN();
+            }
+            ptr = std::copy(points_ptr + 2*offsets_ptr[i], points_ptr + 2*offsets_ptr[i+1], ptr);
+        }
+    }
+
+    return ret;
+}
+
+Converter::ContiguousOffsetArray Converter::offsets_from_codes(const ContiguousCodeArray& codes)
+{
+    auto point_count = static_cast<count_t>(codes.shape(0));
+    check_max_offset(point_count);
+    auto codes_ptr = codes.data();
+
+    std::optional<py::gil_scoped_release> release;
+    if (point_count >= release_gil_threshold)
+        release.emplace();
+    auto offset_count = std::count(codes_ptr, codes_ptr + point_count, MOVETO) + 1;
+    release.reset();
+
+    ContiguousOffsetArray offsets(static_cast<index_t>(offset_count));
+    auto ptr = offsets.mutable_data();
+
+    if (point_count >= release_gil_threshold)
+        release.emplace();
+    for (count_t i = 0; i < point_count; ++i) {
+        if (codes_ptr[i] == MOVETO)
+            *ptr++ = static_cast<offset_t>(i);
+    }
+    *ptr = static_cast<offset_t>(point_count);
+    release.reset();
+
+    return offsets;
+}
+
+Converter::ContiguousOffsetArray Converter::offsets_from_lengths(
+    const py::list& list_of_arrays, offset_t subtract)
+{
+    ContiguousOffsetArray offsets(static_cast<index_t>(list_of_arrays.size() + 1));
+    auto ptr = offsets.mutable_data();
+
+    count_t total = 0;
+    *ptr++ = 0;
+    for (auto item : list_of_arrays) {
+        total += py::len(item) - subtract;
+        *ptr++ = static_cast<offset_t>(total);
+    }
+    check_max_offset(total);
+
+    return offsets;
+}
+
+void Converter::remove_nan(Combined& combined)
+{
+    const auto& points = combined.points;
+    auto point_count = points.shape(0);
+    auto points_ptr = points.data();
+
+    py::ssize_t nan_count = 0;
+    {
+        py::gil_scoped_release release;
+        for (py::ssize_t i = 0; i < point_count; ++i) {
+            if (std::isnan(points_ptr[2*i]))
+                ++nan_count;
+        }
+    }
+
+    combined.offsets = ContiguousOffsetArray(nan_count + 2);
+    auto offsets_ptr = combined.offsets.mutable_data();
+    if (nan_count == 0) {
+        offsets_ptr[0] = 0;
+        offsets_ptr[1] = static_cast<offset_t>(point_count);
+        return;
+    }
+
+    index_t shape[2] = {point_count - nan_count, 2};
+    ContiguousPointArray without_nan(shape);
+    auto ptr = without_nan.mutable_data();
+
+    {
+        py::gil_scoped_release release;
+        offset_t count = 0;
+        *offsets_ptr++ = 0;
+        for (py::ssize_t i = 0; i < point_count; ++i) {
+            if (std::isnan(points_ptr[2*i]))
+                *offsets_ptr++ = count;
+            else {
+                *ptr++ = points_ptr[2*i];
+                *ptr++ = points_ptr[2*i+1];
+                ++count;
+            }
+        }
+        *offsets_ptr = count;
+    }
+
+    combined.points = without_nan;
+}
+
+template <typename T>
+void Converter::split(
+    const ContiguousArray<T>& array, const ContiguousOffsetArray& offsets, py::list& list)
+{
+    auto ncols = array.ndim() == 2 ? array.shape(1) : 1;
+    auto array_ptr = array.data();
+    auto offsets_ptr = offsets.data();
+    auto offset_count = offsets.shape(0);
+    for (py::ssize_t i = 0; i < offset_count-1; ++i) {
+        index_t rows = offsets_ptr[i+1] - offsets_ptr[i];
+        auto start = array_ptr + ncols*offsets_ptr[i];
+        if (ncols == 1)
+            list.append(py::array_t<T>(rows, start, array));
+        else
+            list.append(py::array_t<T>({rows, ncols}, start, array));
+    }
+}
+
 } // namespace contourpy
@@ -2,6 +2,9 @@
 #define CONTOURPY_CONVERTER_H
 
 #include "common.h"
+#include "fill_type.h"
+#include "line_type.h"
+#include <vector>
 
 namespace contourpy {
 
@@ -10,6 +13,10 @@ namespace contourpy {
 // whereas the second populates one that has already been created. The former are used in serial
 // code and the latter in threaded code where the creation and manipulation of NumPy arrays needs to
 // be threadlocked whereas the population of those arrays does not.
+//
+// Also converts whole sets of filled contours or contour lines between the different FillType and
+// LineType formats.  The GIL is released whilst populating combined arrays, it is only held to
+// create NumPy arrays and the lists containing them.
 class Converter
 {
 public:
@@ -39,6 +46,27 @@ public:
     static void convert_codes_check_closed_single(
         count_t point_count, const double* points, CodeArray::value_type* codes);
 
+    // Convert filled contours from one FillType to another.  This is the implementation of
+    // contourpy.convert_filled which has already checked filled and rejected unsupported
+    // conversions.
+    static py::tuple convert_filled(
+        const py::tuple& filled, FillType fill_type_from, FillType fill_type_to);
+
+    // Convert contour lines from one LineType to another.  This is the implementation of
+    // contourpy.convert_lines which has already checked lines.
+    static py::object convert_lines(
+        const py::object& lines, LineType line_type_from, LineType line_type_to);
+
+    // Return chunked filled contours with all chunks combined into the first chunk.  This is the
+    // implementation of contourpy.dechunk_filled for filled containing more than one chunk, which
+    // has already been checked.
+    static py::tuple dechunk_filled(const py::tuple& filled, FillType fill_type);
+
+    // Return chunked contour lines with all chunks combined into the first chunk.  This is the
+    // implementation of contourpy.dechunk_lines for lines containing more than one chunk, which
+    // have already been checked.
+    static py::tuple dechunk_lines(const py::tuple& lines, LineType line_type);
+
     // Create and populate offsets array,
     static OffsetArray convert_offsets(
         count_t offset_count, const offset_t* start, offset_t subtract);
@@ -53,9 +81,86 @@ public:
 
     // Populate points array that has already been created.
     static void convert_points(count_t point_count, const double* start, double* points);
+    static void convert_points(count_t point_count, const double* start, float* points);
+
+    // Create and populate float32 points array.
+    static py::array_t<float> convert_points_float32(count_t point_count, const double* start);
 
 private:
+    // Arrays that are C-contiguous, input arrays are copied only if they are not already.
+    template <typename T>
+    using ContiguousArray = py::array_t<T, py::array::c_style | py::array::forcecast>;
+    typedef ContiguousArray<double>   ContiguousPointArray;
+    typedef ContiguousArray<uint8_t>  ContiguousCodeArray;
+    typedef ContiguousArray<offset_t> ContiguousOffsetArray;
+
+    // Releasing the GIL is not worthwhile for small arrays such as those of individual polygons.
+    static constexpr count_t release_gil_threshold = 1024;
+
+    // Contours of a single chunk in combined arrays, used as the intermediate format of
+    // conversions.  Arrays are calculated from each other on demand, those that have not been
+    // needed yet have zero size.  A chunk that is empty has a points array of zero size.
+    struct Combined
+    {
+        ContiguousPointArray points;
+        ContiguousCodeArray codes;
+        ContiguousOffsetArray offsets;
+        ContiguousOffsetArray outer_offsets;  // Indices into offsets of the start of each polygon.
+        ContiguousOffsetArray outer_points;   // Indices into points of the start of each polygon.
+    };
+
     static void check_max_offset(count_t max_offset);
+
+    static ContiguousCodeArray codes_from_offsets(
+        const ContiguousOffsetArray& offsets, const double* points);
+
+    // Combine filled contours of fill_type into one Combined object per chunk.
+    static std::vector<Combined> combine_filled(const py::tuple& filled, FillType fill_type);
+
+    // Combine contour lines of line_type into one Combined object per chunk.
+    static std::vector<Combined> combine_lines(const py::object& lines, LineType line_type);
+
+    template <typename T>
+    static ContiguousArray<T> concat(const py::list& list_of_arrays, index_t ncols);
+
+    static ContiguousOffsetArray concat_offsets(const py::list& list_of_offsets);
+
+    // Concatenate point arrays with a NaN row between each.
+    static ContiguousPointArray concat_points_with_nan(const py::list& list_of_points);
+
+    // Combine all chunks into the first chunk, returning a tuple of lists each of length 1.  Each
+    // array is sized from the per-chunk arrays before they are copied into it.  The second item of
+    // chunked is either codes or offsets, any third item is outer offsets.
+    static py::tuple dechunk(const py::tuple& chunked, bool second_is_codes);
+
+    // Ensure that a Combined object has the requested arrays, calculating them from the other
+    // arrays if necessary.  Codes of lines depend on whether each line is closed or not, whereas
+    // polygons of filled contours are always closed.
+    static void ensure_codes(Combined& combined, bool check_closed);
+    static void ensure_offsets(Combined& combined);
+    static void ensure_outer_offsets(Combined& combined);
+    static void ensure_outer_points(Combined& combined);
+
+    static py::tuple export_filled(std::vector<Combined>& chunks, FillType fill_type);
+    static py::object export_lines(std::vector<Combined>& chunks, LineType line_type);
+
+    // Insert a NaN row between each line.
+    static ContiguousPointArray insert_nan(
+        const ContiguousPointArray& points, const ContiguousOffsetArray& offsets);
+
+    static ContiguousOffsetArray offsets_from_codes(const ContiguousCodeArray& codes);
+
+    // Cumulative sum of the lengths of arrays in a list, each reduced by subtract.
+    static ContiguousOffsetArray offsets_from_lengths(
+        const py::list& list_of_arrays, offset_t subtract);
+
+    // Remove NaN rows from points, setting offsets to the start of each line.
+    static void remove_nan(Combined& combined);
+
+    // Append views into array between consecutive offsets to list.
+    template <typename T>
+    static void split(
+        const ContiguousArray<T>& array, const ContiguousOffsetArray& offsets, py::list& list);
 };
 
 } // namespace contourpy
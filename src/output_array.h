@@ -2,10 +2,24 @@
 #define CONTOURPY_OUTPUT_ARRAY_H
 
 #include "common.h"
+#include <algorithm>
+#include <memory>
 #include <vector>
 
 namespace contourpy {
 
+// Move buffer into a capsule that owns it, returning the capsule and setting data to the start of
+// the buffer.  The capsule is used as the base of NumPy arrays that are views into the buffer.
+template <typename T>
+py::capsule take_buffer(std::vector<T>& buffer, T*& data)
+{
+    auto owned = std::make_unique<std::vector<T>>(std::move(buffer));
+    data = owned->data();
+    py::capsule capsule(owned.get(), [](void* ptr) { delete static_cast<std::vector<T>*>(ptr); });
+    owned.release();
+    return capsule;
+}
+
 // A reusable array that is output from C++ to Python.  Depending on the chosen line or fill type,
 // it can either be created as a NumPy array that will be directly returned to the Python caller,
 // or as a C++ vector that will be further manipulated (such as split up) before being converted to
@@ -34,20 +48,48 @@ public:
         start = current = vector.data();
     }
 
-    py::array_t<T> create_python(count_t new_size)
+    // Ensure that there is space to write at least n more values to a C++ vector, growing it if
+    // necessary.  Used when marching in a single pass as the sizes are not known in advance.  The
+    // vector keeps its capacity when cleared so it is only reallocated if larger than before.
+    void ensure_space(count_t n)
     {
-        assert(new_size > 0);
-        size = new_size;
-        py::array_t<T> py_array(size);
-        start = current = py_array.mutable_data();
-        return py_array;
+        auto used = static_cast<count_t>(current - start);
+        if (used + n > size) {
+            size = std::max({used + n, 2*size, min_growable_size});
+            vector.resize(size);
+            start = vector.data();
+            current = start + used;
+        }
     }
 
-    py::array_t<T> create_python(count_t shape0, count_t shape1)
+    // Reduce size to the values written so far.
+    void trim()
     {
-        assert(shape0 > 0 && shape1 > 0);
-        size = shape0*shape1;
-        py::array_t<T> py_array({shape0, shape1});
+        auto used = static_cast<count_t>(current - start);
+        if (used == 0)
+            clear();
+        else {
+            size = used;
+            vector.resize(size);
+        }
+    }
+
+    // Return NumPy array of the C++ vector with the specified shape that takes ownership of it
+    // without copying it.  start and current remain valid whilst the NumPy array exists.
+    py::array_t<T> take_python(const std::vector<index_t>& shape)
+    {
+        T* data = nullptr;
+        auto capsule = take_buffer(vector, data);
+        assert(data == start);
+        return py::array_t<T>(shape, data, capsule);
+    }
+
+    // Use a NumPy array that has already been created, either a new array or a view into a reused
+    // buffer.
+    py::array_t<T> use_python(py::array_t<T> py_array)
+    {
+        assert(py_array.size() > 0);
+        size = py_array.size();
         start = current = py_array.mutable_data();
         return py_array;
     }
@@ -59,6 +101,8 @@ public:
     OutputArray& operator=(const OutputArray&& other) = delete;
 
 
+    static constexpr count_t min_growable_size = 256;
+
     std::vector<T> vector;
     count_t size;
     T* start;               // Start of array, whether C++ or Python.
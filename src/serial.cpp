@@ -5,18 +5,34 @@
 namespace contourpy {
 
 SerialContourGenerator::SerialContourGenerator(
-    const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+    const XYArray& x, const XYArray& y, const ZArray& z,
     const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size)
+    bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+    const py::object& output_dtype)
     : BaseContourGenerator(x, y, z, mask, corner_mask, line_type, fill_type, quad_as_tri, z_interp,
-                           x_chunk_size, y_chunk_size)
+                           x_chunk_size, y_chunk_size, output_dtype)
 {}
 
+void SerialContourGenerator::export_combined_points(
+    const ChunkLocal& local, std::vector<py::list>& return_lists)
+{
+    if (has_direct_points())
+        return;  // return_lists[0][local.chunk] already contains combined points.
+
+    assert(has_float32_output());
+    auto points = create_output_array<float>(local.chunk, 0, local.total_point_count, 2);
+    Converter::convert_points(local.total_point_count, local.points.start, points.mutable_data());
+    return_lists[0][local.chunk] = points;
+}
+
 void SerialContourGenerator::export_filled(
     const ChunkLocal& local, std::vector<py::list>& return_lists)
 {
     assert(local.total_point_count > 0);
 
+    // All of the work here involves creating or modifying Python objects so hold the GIL throughout.
+    Lock lock(*this);  // cppcheck-suppress unreadVariable
+
     switch (get_fill_type())
     {
         case FillType::OuterCode:
@@ -32,8 +48,12 @@ void SerialContourGenerator::export_filled(
                 auto point_count = point_end - point_start;
                 assert(point_count > 2);
 
-                return_lists[0].append(Converter::convert_points(
-                    point_count, local.points.start + 2*point_start));
+                if (has_float32_output())
+                    return_lists[0].append(Converter::convert_points_float32(
+                        point_count, local.points.start + 2*point_start));
+                else
+                    return_lists[0].append(Converter::convert_points(
+                        point_count, local.points.start + 2*point_start));
 
                 if (get_fill_type() == FillType::OuterCode)
                     return_lists[1].append(Converter::convert_codes(
@@ -48,22 +68,27 @@ void SerialContourGenerator::export_filled(
         }
         case FillType::ChunkCombinedCode:
         case FillType::ChunkCombinedCodeOffset: {
-            assert(has_direct_points() && !has_direct_line_offsets());
+            assert(!has_direct_line_offsets());
+            export_combined_points(local, return_lists);
 
-            // return_lists[0][local_chunk] already contains combined points.
             // If ChunkCombinedCodeOffset. return_lists[2][local.chunk] already contains outer
             //    offsets.
-            return_lists[1][local.chunk] = Converter::convert_codes(
-                local.total_point_count, local.line_count + 1, local.line_offsets.start, 0);
+            auto codes = create_output_array<CodeArray::value_type>(
+                local.chunk, 1, local.total_point_count);
+            Converter::convert_codes(
+                local.total_point_count, local.line_count + 1, local.line_offsets.start, 0,
+                codes.mutable_data());
+            return_lists[1][local.chunk] = codes;
             break;
         }
         case FillType::ChunkCombinedOffset:
         case FillType::ChunkCombinedOffsetOffset:
-            assert(has_direct_points() && has_direct_line_offsets());
+            assert(has_direct_line_offsets());
             if (get_fill_type() == FillType::ChunkCombinedOffsetOffset) {
                 assert(has_direct_outer_offsets());
             }
-            // return_lists[0][local_chunk] already contains combined points.
+            export_combined_points(local, return_lists);
+
             // return_lists[1][local.chunk] already contains line offsets.
             // If ChunkCombinedOffsetOffset, return_lists[2][local.chunk] already contains
             //      outer offsets.
@@ -76,6 +101,9 @@ void SerialContourGenerator::export_lines(
 {
     assert(local.total_point_count > 0);
 
+    // All of the work here involves creating or modifying Python objects so hold the GIL throughout.
+    Lock lock(*this);  // cppcheck-suppress unreadVariable
+
     switch (get_line_type())
     {
         case LineType::Separate:
@@ -90,8 +118,12 @@ void SerialContourGenerator::export_lines(
                 auto point_count = point_end - point_start;
                 assert(point_count > 1);
 
-                return_lists[0].append(Converter::convert_points(
-                    point_count, local.points.start + 2*point_start));
+                if (has_float32_output())
+                    return_lists[0].append(Converter::convert_points_float32(
+                        point_count, local.points.start + 2*point_start));
+                else
+                    return_lists[0].append(Converter::convert_points(
+                        point_count, local.points.start + 2*point_start));
 
                 if (separate_code) {
                     return_lists[1].append(
@@ -102,44 +134,64 @@ void SerialContourGenerator::export_lines(
             break;
         }
         case LineType::ChunkCombinedCode: {
-            assert(has_direct_points() && !has_direct_line_offsets());
+            assert(!has_direct_line_offsets());
+            export_combined_points(local, return_lists);
 
-            // return_lists[0][local.chunk] already contains points.
-            return_lists[1][local.chunk] = Converter::convert_codes_check_closed(
+            auto codes = create_output_array<CodeArray::value_type>(
+                local.chunk, 1, local.total_point_count);
+            Converter::convert_codes_check_closed(
                 local.total_point_count, local.line_count + 1, local.line_offsets.start,
-                local.points.start);
+                local.points.start, codes.mutable_data());
+            return_lists[1][local.chunk] = codes;
             break;
         }
         case LineType::ChunkCombinedOffset:
-            assert(has_direct_points() && has_direct_line_offsets());
-            // return_lists[0][local.chunk] already contains points.
+            assert(has_direct_line_offsets());
+            export_combined_points(local, return_lists);
             // return_lists[1][local.chunk] already contains line offsets.
             break;
         case LineType::ChunkCombinedNan:
-            assert(has_direct_points());
-            // return_lists[0][local.chunk] already contains points.
+            export_combined_points(local, return_lists);
             break;
     }
 }
 
 void SerialContourGenerator::march(std::vector<py::list>& return_lists)
 {
-    auto n_chunks = get_n_chunks();
-    bool single_chunk = (n_chunks == 1);
+    bool single_chunk = (get_n_chunks() == 1);
+    const auto& trace_chunks = get_trace_chunks();
+
+    // Release GIL for remainder of this function so that other Python threads can run, such as
+    // those using other ContourGenerator objects. It is temporarily reacquired as necessary within
+    // the scope of Lock objects.
+    py::gil_scoped_release release;
 
-    if (single_chunk) {
-        // Stage 1: If single chunk, initialise cache z-levels and starting locations for whole
+    // Stage 1: Initialise grid part of cache of chunks that have not been needed before.
+    ChunkLocal local;
+    for (auto chunk : get_grid_chunks()) {
+        get_chunk_limits(chunk, local);
+        init_cache_grid(local);
+        local.clear();
+    }
+
+    if (single_chunk && !trace_chunks.empty()) {
+        // Stage 2: If single chunk, initialise cache z-levels and starting locations for whole
         // domain.
         init_cache_levels_and_starts();
     }
 
-    // Stage 2: Trace contours.
-    ChunkLocal local;
-    for (index_t chunk = 0; chunk < n_chunks; ++chunk) {
+    // Stage 3: Trace contours.  Each chunk's cache is initialised just before it is traced, and
+    // after those of its W and S neighbours.  Chunks that are only initialised are neighbours of
+    // traced chunks.
+    auto next_trace = trace_chunks.begin();
+    for (auto chunk : get_init_chunks()) {
         get_chunk_limits(chunk, local);
         if (!single_chunk)
             init_cache_levels_and_starts(&local);
-        march_chunk(local, return_lists);
+        if (next_trace != trace_chunks.end() && *next_trace == chunk) {
+            march_chunk(local, return_lists);
+            ++next_trace;
+        }
         local.clear();
     }
 }
@@ -9,23 +9,42 @@ class SerialContourGenerator : public BaseContourGenerator<SerialContourGenerato
 {
 public:
     SerialContourGenerator(
-        const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+        const XYArray& x, const XYArray& y, const ZArray& z,
         const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
-        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size);
+        bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
+        const py::object& output_dtype);
 
 private:
     friend class BaseContourGenerator<SerialContourGenerator>;
 
-    // Dummy Lock class which is the single-threaded version of ThreadedContourGenerator::Lock and
-    // does not do anything, allowing base class code to use Lock objects for both serial and
-    // multithreaded code.
+    // NumPy arrays are created as each chunk is marched, and points and offsets are written
+    // direct to them where possible.
+    static constexpr bool defer_python_arrays = false;
+
+    // Lock class used whilst Python objects are being created or modified. The GIL is released for
+    // the duration of march() so that other Python threads can run, so this only reacquires the GIL
+    // whilst it is needed. There is no need for a mutex as only a single thread ever marches a
+    // SerialContourGenerator.
     class Lock
     {
     public:
         explicit Lock(const SerialContourGenerator& contour_generator)
         {}
+
+        // Non-copyable and non-moveable.
+        Lock(const Lock& other) = delete;
+        Lock(const Lock&& other) = delete;
+        Lock& operator=(const Lock& other) = delete;
+        Lock& operator=(const Lock&& other) = delete;
+
+    private:
+        py::gil_scoped_acquire _gil;
     };
 
+    // Write combined points of a chunk to a float32 output numpy array.  Only needed if
+    // has_float32_output() as otherwise the points are written direct to a float64 array.
+    void export_combined_points(const ChunkLocal& local, std::vector<py::list>& return_lists);
+
     // Write points and offsets/codes to output numpy arrays.
     void export_filled(const ChunkLocal& local, std::vector<py::list>& return_lists);
 
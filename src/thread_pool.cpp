@@ -0,0 +1,168 @@
+#include "thread_pool.h"
+#include "util.h"
+#include <algorithm>
+#include <stdexcept>
+
+#ifndef _WIN32
+#include <pthread.h>
+#endif
+
+namespace contourpy {
+
+ThreadPool::ThreadPool()
+    : _state(new State(std::max<index_t>(Util::get_max_threads() - 1, 0)))
+{
+#ifndef _WIN32
+    // Pool threads do not exist in a forked child process.
+    pthread_atfork(nullptr, nullptr, &ThreadPool::reset_after_fork);
+#endif
+}
+
+index_t ThreadPool::get_size()
+{
+    std::lock_guard<std::mutex> lock(_state->mutex);
+    return _state->size;
+}
+
+ThreadPool& ThreadPool::instance()
+{
+    // Deliberately never destroyed as joining threads during static destruction is not safe on
+    // all platforms.
+    static ThreadPool* thread_pool = new ThreadPool();
+    return *thread_pool;
+}
+
+void ThreadPool::join_exited(State& state)
+{
+    for (auto id : state.exited) {
+        auto it = std::find_if(state.threads.begin(), state.threads.end(),
+                               [id](const std::thread& thread) { return thread.get_id() == id; });
+        assert(it != state.threads.end());
+        it->join();
+        state.threads.erase(it);
+    }
+    state.exited.clear();
+}
+
+void ThreadPool::reset_after_fork()
+{
+    // Called in the child process only, which has a single thread.  The old state refers to
+    // threads that only exist in the parent and its mutex may be locked so it is leaked.
+    auto& thread_pool = instance();
+    auto size = thread_pool._state->size;
+    thread_pool._state.release();  // cppcheck-suppress ignoredReturnValue
+    thread_pool._state.reset(new State(size));
+}
+
+void ThreadPool::run(index_t n_threads, const std::function<void()>& function)
+{
+    if (n_threads <= 1) {
+        function();
+        return;
+    }
+
+    auto& state = *_state;
+    Job job(function, n_threads-1);
+
+    {
+        std::lock_guard<std::mutex> lock(state.mutex);
+        join_exited(state);
+
+        // Use idle threads that have not already been claimed by other jobs, and create new threads
+        // for the remainder.
+        auto n_available = state.n_idle - static_cast<index_t>(state.queue.size());
+        auto n_queued = std::min(n_threads-1, n_available);
+        for (index_t i = 0; i < n_queued; ++i)
+            state.queue.push_back(&job);
+        for (index_t i = n_queued; i < n_threads-1; ++i)
+            state.threads.emplace_back(&ThreadPool::thread_function, &state, &job);
+
+        if (n_queued > 0)
+            state.work_condition.notify_all();
+    }
+
+    std::exception_ptr exception;
+    try {
+        function();  // Calling thread work.
+    }
+    catch (...) {
+        exception = std::current_exception();
+    }
+
+    {
+        std::unique_lock<std::mutex> lock(state.mutex);
+        state.done_condition.wait(lock, [&job] { return job.remaining == 0; });
+        if (!exception)
+            exception = job.exception;
+    }
+
+    if (exception)
+        std::rethrow_exception(exception);
+}
+
+void ThreadPool::set_size(index_t size)
+{
+    if (size < 0)
+        throw std::invalid_argument("Thread pool size must be non-negative");
+
+    auto& state = *_state;
+    std::lock_guard<std::mutex> lock(state.mutex);
+    state.size = size;
+    state.work_condition.notify_all();  // Excess idle threads exit.
+}
+
+void ThreadPool::shutdown()
+{
+    auto& state = *_state;
+    std::unique_lock<std::mutex> lock(state.mutex);
+    auto size = state.size;
+    state.size = 0;
+    state.work_condition.notify_all();
+    state.done_condition.wait(lock, [&state] { return state.n_idle == 0; });
+    join_exited(state);
+    state.size = size;
+}
+
+void ThreadPool::thread_function(State* state, Job* job)
+{
+    std::unique_lock<std::mutex> lock(state->mutex);
+
+    while (true) {
+        if (job != nullptr) {
+            lock.unlock();
+            std::exception_ptr exception;
+            try {
+                job->function();
+            }
+            catch (...) {
+                exception = std::current_exception();
+            }
+            lock.lock();
+
+            if (exception && !job->exception)
+                job->exception = exception;
+            if (--job->remaining == 0)
+                state->done_condition.notify_all();
+            job = nullptr;
+
+            if (state->n_idle >= state->size)
+                break;  // Enough idle threads already.
+            state->n_idle++;
+        }
+
+        state->work_condition.wait(lock, [state] {
+            return !state->queue.empty() || state->n_idle > state->size; });
+
+        state->n_idle--;
+        if (state->queue.empty())
+            break;  // Too many idle threads.
+
+        job = state->queue.front();
+        state->queue.pop_front();
+    }
+
+    state->exited.push_back(std::this_thread::get_id());
+    state->done_condition.notify_all();
+}
+
+} // namespace contourpy
@@ -0,0 +1,88 @@
+#ifndef CONTOURPY_THREAD_POOL_H
+#define CONTOURPY_THREAD_POOL_H
+
+#include "common.h"
+#include <condition_variable>
+#include <deque>
+#include <exception>
+#include <functional>
+#include <memory>
+#include <mutex>
+#include <thread>
+#include <vector>
+
+namespace contourpy {
+
+// Process-wide pool of worker threads that persist between contouring calls so that the cost of
+// creating threads is not incurred by every call.  Up to size idle threads are kept alive.  If
+// there are not enough idle threads for a call then more are created so that all of the requested
+// threads run concurrently, as is required by functions containing barriers.  Threads in excess of
+// size exit as soon as they have finished their work.
+class ThreadPool
+{
+public:
+    static ThreadPool& instance();
+
+    // Non-copyable and non-moveable.
+    ThreadPool(const ThreadPool& other) = delete;
+    ThreadPool(const ThreadPool&& other) = delete;
+    ThreadPool& operator=(const ThreadPool& other) = delete;
+    ThreadPool& operator=(const ThreadPool&& other) = delete;
+
+    // Maximum number of idle threads kept alive between calls.
+    index_t get_size();
+    void set_size(index_t size);
+
+    // Call function concurrently in n_threads threads, i.e. the calling thread and (n_threads-1)
+    // pool threads, and return when they have all finished.  If any of the calls throws an
+    // exception, the first one is rethrown here.
+    void run(index_t n_threads, const std::function<void()>& function);
+
+    // Stop and join all idle threads.  Busy threads exit when they have finished their work.  New
+    // threads are created as required by subsequent calls to run().
+    void shutdown();
+
+private:
+    ThreadPool();
+
+    struct Job
+    {
+        Job(const std::function<void()>& function_, index_t remaining_)
+            : function(function_), remaining(remaining_)
+        {}
+
+        const std::function<void()>& function;
+        index_t remaining;             // Number of pool threads that have not yet finished.
+        std::exception_ptr exception;  // First exception raised by a pool thread.
+    };
+
+    struct State
+    {
+        explicit State(index_t size_)
+            : size(size_), n_idle(0)
+        {}
+
+        std::mutex mutex;                          // Locks access to everything below.
+        std::condition_variable work_condition;    // Wakes idle threads.
+        std::condition_variable done_condition;    // Wakes threads waiting for others to finish.
+        std::deque<Job*> queue;                    // One entry per idle thread needed by a job.
+        std::vector<std::thread> threads;          // Threads that have not been joined.
+        std::vector<std::thread::id> exited;       // Threads that have exited but not been joined.
+        index_t size;
+        index_t n_idle;                            // Always >= queue.size().
+    };
+
+    // Join threads that have exited.  Must be called with state.mutex locked.
+    static void join_exited(State& state);
+
+    static void reset_after_fork();
+
+    // Function executed by each pool thread, starting with job.
+    static void thread_function(State* state, Job* job);
+
+    std::unique_ptr<State> _state;
+};
+
+} // namespace contourpy
+
+#endif // CONTOURPY_THREAD_POOL_H
@@ -1,218 +1,328 @@
 #include "base_impl.h"
 #include "converter.h"
+#include "thread_pool.h"
 #include "threaded.h"
 #include "util.h"
+#include <limits>
 #include <thread>
 
 namespace contourpy {
 
+// Number of times a thread checks if a barrier is complete before blocking.
+#define BARRIER_SPIN_COUNT 256
+
 ThreadedContourGenerator::ThreadedContourGenerator(
-    const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+    const XYArray& x, const XYArray& y, const ZArray& z,
     const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
     bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
-    index_t n_threads)
+    index_t n_threads, const py::object& output_dtype)
     : BaseContourGenerator(x, y, z, mask, corner_mask, line_type, fill_type, quad_as_tri, z_interp,
-                           x_chunk_size, y_chunk_size),
+                           x_chunk_size, y_chunk_size, output_dtype),
       _n_threads(limit_n_threads(n_threads, get_n_chunks())),
-      _next_chunk(0)
+      _n_level_threads(limit_n_threads(n_threads, std::numeric_limits<index_t>::max())),
+      _next_grid_chunk(0),
+      _next_init_chunk(0),
+      _next_trace_chunk(0),
+      _finished_count(0),
+      _next_level(0),
+      _next_frame(0)
+{}
+
+ThreadedContourGenerator::ThreadedContourGenerator(
+    const ThreadedContourGenerator& other, WorkerTag tag)
+    : BaseContourGenerator(other, tag),
+      _n_threads(1),
+      _n_level_threads(1),
+      _next_grid_chunk(0),
+      _next_init_chunk(0),
+      _next_trace_chunk(0),
+      _finished_count(0),
+      _next_level(0),
+      _next_frame(0)
 {}
 
+template <typename T>
+py::array_t<T> ThreadedContourGenerator::buffer_to_array(
+    std::vector<T>& buffer, index_t chunk, index_t list_index)
+{
+    auto size = static_cast<index_t>(buffer.size());
+    T* data = nullptr;
+    auto base = export_buffer(buffer, chunk, list_index, data);
+    return py::array_t<T>(size, data, base);
+}
+
+template <typename T>
+py::object ThreadedContourGenerator::export_buffer(
+    std::vector<T>& buffer, index_t chunk, index_t list_index, T*& data)
+{
+    if (!is_reusing_output_buffers())
+        return take_buffer(buffer, data);
+
+    // Buffer keeps its capacity for use by the next call.
+    auto array = create_output_array<T>(chunk, list_index, buffer.size());
+    data = array.mutable_data();
+    std::copy(buffer.begin(), buffer.end(), data);
+    return std::move(array);
+}
+
+void ThreadedContourGenerator::export_chunk_outputs(std::vector<py::list>& return_lists)
+{
+    // Unless reusing output buffers, buffers are not copied.  Each is moved into a capsule that
+    // owns it and is the base of all of the NumPy arrays that are views into it.
+    auto n_chunks = get_n_chunks();
+    assert(static_cast<index_t>(_chunk_outputs.size()) == n_chunks);
+
+    bool filled = is_filled();
+    auto fill_type = get_fill_type();
+    auto line_type = get_line_type();
+    bool output_chunked = filled ?
+        !(fill_type == FillType::OuterCode || fill_type == FillType::OuterOffset) :
+        !(line_type == LineType::Separate || line_type == LineType::SeparateCode);
+    bool float32 = has_float32_output();
+    auto point_dtype = get_output_dtype();
+    auto point_itemsize = static_cast<index_t>(point_dtype.itemsize());
+
+    for (index_t chunk = 0; chunk < n_chunks; ++chunk) {
+        auto& output = _chunk_outputs[chunk];
+
+        if (output.points.empty() && output.points_float32.empty()) {
+            if (output_chunked) {
+                for (auto& list : return_lists)
+                    list[chunk] = py::none();
+            }
+            continue;
+        }
+
+        // Points are float64 or float32 so are accessed as bytes.
+        py::object points_capsule;
+        const char* points = nullptr;
+        index_t point_count;
+        if (float32) {
+            float* data = nullptr;
+            point_count = static_cast<index_t>(output.points_float32.size() / 2);
+            points_capsule = export_buffer(output.points_float32, chunk, 0, data);
+            points = reinterpret_cast<const char*>(data);
+        }
+        else {
+            double* data = nullptr;
+            point_count = static_cast<index_t>(output.points.size() / 2);
+            points_capsule = export_buffer(output.points, chunk, 0, data);
+            points = reinterpret_cast<const char*>(data);
+        }
+
+        // NumPy array of count points starting at point start that is a view into the points.
+        auto point_array = [&](index_t count, index_t start) {
+            return py::array(
+                point_dtype, {count, index_t(2)}, points + 2*start*point_itemsize, points_capsule);
+        };
+
+        if (output_chunked) {
+            return_lists[0][chunk] = point_array(point_count, 0);
+
+            // Remaining arrays in return order.
+            std::vector<py::object> arrays;
+            if (filled) {
+                if (fill_type == FillType::ChunkCombinedCode ||
+                    fill_type == FillType::ChunkCombinedCodeOffset)
+                    arrays.push_back(buffer_to_array(output.codes, chunk, 1));
+                else
+                    arrays.push_back(buffer_to_array(output.line_offsets, chunk, 1));
+
+                if (fill_type == FillType::ChunkCombinedCodeOffset ||
+                    fill_type == FillType::ChunkCombinedOffsetOffset)
+                    arrays.push_back(buffer_to_array(output.outer_offsets, chunk, 2));
+            }
+            else if (line_type == LineType::ChunkCombinedCode)
+                arrays.push_back(buffer_to_array(output.codes, chunk, 1));
+            else if (line_type == LineType::ChunkCombinedOffset)
+                arrays.push_back(buffer_to_array(output.line_offsets, chunk, 1));
+
+            for (std::size_t i = 0; i < arrays.size(); ++i)
+                return_lists[i+1][chunk] = arrays[i];
+        }
+        else if (filled) {
+            // FillType.OuterCode or FillType.OuterOffset.
+            bool outer_code = (fill_type == FillType::OuterCode);
+            CodeArray::value_type* codes = nullptr;
+            OffsetArray::value_type* offsets = nullptr;
+            auto other_capsule = outer_code ?
+                export_buffer(output.codes, chunk, 1, codes) :
+                export_buffer(output.offsets, chunk, 1, offsets);
+
+            const auto& line_offsets = output.line_offsets;
+            const auto& outer_offsets = output.outer_offsets;
+            auto outer_count = static_cast<index_t>(outer_offsets.size() - 1);
+            for (index_t i = 0; i < outer_count; ++i) {
+                auto outer_start = outer_offsets[i];
+                auto outer_end = outer_offsets[i+1];
+                auto point_start = line_offsets[outer_start];
+                auto outer_point_count = static_cast<index_t>(line_offsets[outer_end] - point_start);
+
+                return_lists[0].append(point_array(outer_point_count, point_start));
+
+                if (outer_code)
+                    return_lists[1].append(CodeArray(
+                        outer_point_count, codes + point_start, other_capsule));
+                else
+                    return_lists[1].append(OffsetArray(
+                        static_cast<index_t>(outer_end - outer_start + 1), offsets + outer_start + i,
+                        other_capsule));
+            }
+        }
+        else {
+            // LineType.Separate or LineType.SeparateCode.
+            bool separate_code = (line_type == LineType::SeparateCode);
+            CodeArray::value_type* codes = nullptr;
+            py::object codes_capsule;
+            if (separate_code)
+                codes_capsule = export_buffer(output.codes, chunk, 1, codes);
+
+            const auto& line_offsets = output.line_offsets;
+            auto line_count = static_cast<index_t>(line_offsets.size() - 1);
+            for (index_t i = 0; i < line_count; ++i) {
+                auto point_start = line_offsets[i];
+                auto line_point_count = static_cast<index_t>(line_offsets[i+1] - point_start);
+
+                return_lists[0].append(point_array(line_point_count, point_start));
+
+                if (separate_code)
+                    return_lists[1].append(CodeArray(
+                        line_point_count, codes + point_start, codes_capsule));
+            }
+        }
+    }
+
+    if (!is_reusing_output_buffers())
+        _chunk_outputs.clear();
+}
+
 void ThreadedContourGenerator::export_filled(
-    const ChunkLocal& local, std::vector<py::list>& return_lists)
+    ChunkLocal& local, std::vector<py::list>& /* return_lists */)
 {
-    // Reimplementation of SerialContourGenerator::export_filled() to separate out the creation of
-    // numpy arrays (which requires a thread lock) from the population of those arrays (which does
-    // not). This minimises the time that the lock is used for.
+    // Reimplementation of SerialContourGenerator::export_filled() that writes to C++ buffers rather
+    // than NumPy arrays so that no lock is needed.  Points and offsets are moved rather than copied.
 
     assert(local.total_point_count > 0);
+    assert(!has_direct_points() && !has_direct_line_offsets() && !has_direct_outer_offsets());
+
+    auto& output = _chunk_outputs[local.chunk];
 
     switch (get_fill_type())
     {
         case FillType::OuterCode:
         case FillType::OuterOffset: {
-            assert(!has_direct_points() && !has_direct_line_offsets());
-
             auto outer_count = local.line_count - local.hole_count;
-            bool outer_code = (get_fill_type() == FillType::OuterCode);
-            std::vector<PointArray::value_type*> points_ptrs(outer_count);
-            std::vector<CodeArray::value_type*> codes_ptrs(outer_code ? outer_count: 0);
-            std::vector<OffsetArray::value_type*> offsets_ptrs(outer_code ? 0 : outer_count);
 
-            {
-                Lock lock(*this);  // cppcheck-suppress unreadVariable
+            if (get_fill_type() == FillType::OuterCode) {
+                // Codes of all outers are contiguous, in the same order as the points.
+                output.codes.resize(local.total_point_count);
                 for (decltype(outer_count) i = 0; i < outer_count; ++i) {
                     auto outer_start = local.outer_offsets.start[i];
                     auto outer_end = local.outer_offsets.start[i+1];
                     auto point_start = local.line_offsets.start[outer_start];
                     auto point_end = local.line_offsets.start[outer_end];
-                    auto point_count = point_end - point_start;
-                    assert(point_count > 2);
-
-                    index_t points_shape[2] = {static_cast<index_t>(point_count), 2};
-                    PointArray point_array(points_shape);
-                    return_lists[0].append(point_array);
-                    points_ptrs[i] = point_array.mutable_data();
-
-                    if (outer_code) {
-                        index_t codes_shape = static_cast<index_t>(point_count);
-                        CodeArray code_array(codes_shape);
-                        return_lists[1].append(code_array);
-                        codes_ptrs[i] = code_array.mutable_data();
-                    }
-                    else {
-                        index_t offsets_shape = static_cast<index_t>(outer_end - outer_start + 1);
-                        OffsetArray offset_array(offsets_shape);
-                        return_lists[1].append(offset_array);
-                        offsets_ptrs[i] = offset_array.mutable_data();
-                    }
+                    assert(point_end - point_start > 2);
+
+                    Converter::convert_codes(
+                        point_end - point_start, outer_end - outer_start + 1,
+                        local.line_offsets.start + outer_start, point_start,
+                        output.codes.data() + point_start);
                 }
             }
+            else {
+                // Offsets of outer i start at index outer_start + i as each outer has one more
+                // offset than it has lines.
+                output.offsets.resize(local.line_count + outer_count);
+                for (decltype(outer_count) i = 0; i < outer_count; ++i) {
+                    auto outer_start = local.outer_offsets.start[i];
+                    auto outer_end = local.outer_offsets.start[i+1];
+                    auto point_start = local.line_offsets.start[outer_start];
 
-            for (decltype(outer_count) i = 0; i < outer_count; ++i) {
-                auto outer_start = local.outer_offsets.start[i];
-                auto outer_end = local.outer_offsets.start[i+1];
-                auto point_start = local.line_offsets.start[outer_start];
-                auto point_end = local.line_offsets.start[outer_end];
-                auto point_count = point_end - point_start;
-                assert(point_count > 2);
-
-                Converter::convert_points(
-                    point_count, local.points.start + 2*point_start, points_ptrs[i]);
-
-                if (outer_code)
-                    Converter::convert_codes(
-                        point_count, outer_end - outer_start + 1,
-                        local.line_offsets.start + outer_start, point_start, codes_ptrs[i]);
-                else
                     Converter::convert_offsets(
                         outer_end - outer_start + 1, local.line_offsets.start + outer_start,
-                        point_start, offsets_ptrs[i]);
+                        point_start, output.offsets.data() + outer_start + i);
+                }
             }
+
+            // Line and outer offsets are needed to split up the points into outers.
+            output.line_offsets.swap(local.line_offsets.vector);
+            output.outer_offsets.swap(local.outer_offsets.vector);
             break;
         }
         case FillType::ChunkCombinedCode:
-        case FillType::ChunkCombinedCodeOffset: {
-            assert(has_direct_points() && !has_direct_line_offsets());
-            // return_lists[0][local_chunk] already contains combined points.
-            // If ChunkCombinedCodeOffset. return_lists[2][local.chunk] already contains outer
-            //    offsets.
-
-            index_t codes_shape = static_cast<index_t>(local.total_point_count);
-            CodeArray::value_type* codes_ptr = nullptr;
-
-            {
-                Lock lock(*this);  // cppcheck-suppress unreadVariable
-                CodeArray code_array(codes_shape);
-                return_lists[1][local.chunk] = code_array;
-                codes_ptr = code_array.mutable_data();
-            }
-
+        case FillType::ChunkCombinedCodeOffset:
+            output.codes.resize(local.total_point_count);
             Converter::convert_codes(
                 local.total_point_count, local.line_count + 1, local.line_offsets.start, 0,
-                codes_ptr);
+                output.codes.data());
+            if (get_fill_type() == FillType::ChunkCombinedCodeOffset)
+                output.outer_offsets.swap(local.outer_offsets.vector);
             break;
-        }
         case FillType::ChunkCombinedOffset:
         case FillType::ChunkCombinedOffsetOffset:
-            assert(has_direct_points() && has_direct_line_offsets());
-            if (get_fill_type() == FillType::ChunkCombinedOffsetOffset) {
-                assert(has_direct_outer_offsets());
-            }
-            // return_lists[0][local_chunk] already contains combined points.
-            // return_lists[1][local.chunk] already contains line offsets.
-            // If ChunkCombinedOffsetOffset, return_lists[2][local.chunk] already contains
-            //      outer offsets.
+            output.line_offsets.swap(local.line_offsets.vector);
+            if (get_fill_type() == FillType::ChunkCombinedOffsetOffset)
+                output.outer_offsets.swap(local.outer_offsets.vector);
             break;
     }
+
+    export_points(local, output);
+}
+
+void ThreadedContourGenerator::export_points(ChunkLocal& local, ChunkOutput& output)
+{
+    if (has_float32_output()) {
+        output.points_float32.resize(2*local.total_point_count);
+        Converter::convert_points(
+            local.total_point_count, local.points.start, output.points_float32.data());
+    }
+    else
+        output.points.swap(local.points.vector);
 }
 
 void ThreadedContourGenerator::export_lines(
-    const ChunkLocal& local, std::vector<py::list>& return_lists)
+    ChunkLocal& local, std::vector<py::list>& /* return_lists */)
 {
-    // Reimplementation of SerialContourGenerator::export_lines() to separate out the creation of
-    // numpy arrays (which requires a thread lock) from the population of those arrays (which does
-    // not). This minimises the time that the lock is used for.
+    // Reimplementation of SerialContourGenerator::export_lines() that writes to C++ buffers rather
+    // than NumPy arrays so that no lock is needed.  Points and offsets are moved rather than copied.
 
     assert(local.total_point_count > 0);
+    assert(!has_direct_points() && !has_direct_line_offsets());
+
+    auto& output = _chunk_outputs[local.chunk];
 
     switch (get_line_type())
     {
         case LineType::Separate:
-        case LineType::SeparateCode: {
-            assert(!has_direct_points() && !has_direct_line_offsets());
-
-            bool separate_code = (get_line_type() == LineType::SeparateCode);
-            std::vector<PointArray::value_type*> points_ptrs(local.line_count);
-            std::vector<CodeArray::value_type*> codes_ptrs(separate_code ? local.line_count: 0);
-
-            {
-                Lock lock(*this);  // cppcheck-suppress unreadVariable
-                for (decltype(local.line_count) i = 0; i < local.line_count; ++i) {
-                    auto point_start = local.line_offsets.start[i];
-                    auto point_end = local.line_offsets.start[i+1];
-                    auto point_count = point_end - point_start;
-                    assert(point_count > 1);
-
-                    index_t points_shape[2] = {static_cast<index_t>(point_count), 2};
-                    PointArray point_array(points_shape);
-
-                    return_lists[0].append(point_array);
-                    points_ptrs[i] = point_array.mutable_data();
-
-                    if (separate_code) {
-                        index_t codes_shape = static_cast<index_t>(point_count);
-                        CodeArray code_array(codes_shape);
-                        return_lists[1].append(code_array);
-                        codes_ptrs[i] = code_array.mutable_data();
-                    }
-                }
-            }
-
+            output.line_offsets.swap(local.line_offsets.vector);
+            break;
+        case LineType::SeparateCode:
+            output.codes.resize(local.total_point_count);
             for (decltype(local.line_count) i = 0; i < local.line_count; ++i) {
                 auto point_start = local.line_offsets.start[i];
                 auto point_end = local.line_offsets.start[i+1];
-                auto point_count = point_end - point_start;
-                assert(point_count > 1);
-
-                Converter::convert_points(
-                    point_count, local.points.start + 2*point_start, points_ptrs[i]);
+                assert(point_end - point_start > 1);
 
-                if (separate_code) {
-                    Converter::convert_codes_check_closed_single(
-                        point_count, local.points.start + 2*point_start, codes_ptrs[i]);
-                }
+                Converter::convert_codes_check_closed_single(
+                    point_end - point_start, local.points.start + 2*point_start,
+                    output.codes.data() + point_start);
             }
+            output.line_offsets.swap(local.line_offsets.vector);
             break;
-        }
-        case LineType::ChunkCombinedCode: {
-            assert(has_direct_points() && !has_direct_line_offsets());
-            // return_lists[0][local.chunk] already contains points.
-
-            index_t codes_shape = static_cast<index_t>(local.total_point_count);
-            CodeArray::value_type* codes_ptr = nullptr;
-
-            {
-                Lock lock(*this);  // cppcheck-suppress unreadVariable
-                CodeArray code_array(codes_shape);
-                return_lists[1][local.chunk] = code_array;
-                codes_ptr = code_array.mutable_data();
-            }
-
+        case LineType::ChunkCombinedCode:
+            output.codes.resize(local.total_point_count);
             Converter::convert_codes_check_closed(
                 local.total_point_count, local.line_count + 1, local.line_offsets.start,
-                local.points.start, codes_ptr);
+                local.points.start, output.codes.data());
             break;
-        }
         case LineType::ChunkCombinedOffset:
-            assert(has_direct_points() && has_direct_line_offsets());
-            // return_lists[0][local.chunk] already contains points.
-            // return_lists[1][local.chunk] already contains line offsets.
+            output.line_offsets.swap(local.line_offsets.vector);
             break;
         case LineType::ChunkCombinedNan:
-            assert(has_direct_points());
-            // return_lists[0][local.chunk] already contains points.
             break;
     }
+
+    export_points(local, output);
 }
 
 index_t ThreadedContourGenerator::get_thread_count() const
@@ -229,88 +339,294 @@ index_t ThreadedContourGenerator::limit_n_threads(index_t n_threads, index_t n_c
         return std::min({max_threads, n_chunks, n_threads});
 }
 
-void ThreadedContourGenerator::march(std::vector<py::list>& return_lists)
+void ThreadedContourGenerator::frame_thread_function(
+    ThreadedContourGenerator& worker, const py::array& z_stack, const LevelArray& levels,
+    bool filled, py::list& ret)
 {
-    // Each thread executes thread_function() which has two stages:
-    //   1) Initialise cache z-levels and starting locations
-    //   2) Trace contours
-    // Each stage is performed on a chunk by chunk basis.  There is a barrier between the two stages
-    // to synchronise the threads so the cache setup is complete before being used by the trace.
-    _next_chunk = 0;      // Next available chunk index.
-    _finished_count = 0;  // Count of threads that have finished the cache init.
-
-    // Main thread releases GIL for remainder of this function.
-    // It is temporarily reacquired as necessary within the scope of threaded Lock objects.
-    py::gil_scoped_release release;
-
-    // Create (_n_threads-1) new worker threads.
-    std::vector<std::thread> threads;
-    threads.reserve(_n_threads-1);
-    for (index_t i = 0; i < _n_threads-1; ++i)
-        threads.emplace_back(
-            &ThreadedContourGenerator::thread_function, this, std::ref(return_lists));
-
-    thread_function(std::ref(return_lists));  // Main thread work.
-
-    for (auto& thread : threads)
-        thread.join();
-    assert(_next_chunk == 2*get_n_chunks());
-    threads.clear();
+    // Function that is executed by each of the threads when contouring frames of a z stack in
+    // parallel, in the same way as level_thread_function() but taking a frame at a time.
+    auto n_frames = static_cast<index_t>(ret.size());
+    index_t frame;
+
+    while (true) {
+        {
+            std::lock_guard<std::mutex> guard(_chunk_mutex);
+            if (_next_frame < n_frames && !_level_exception)
+                frame = _next_frame++;
+            else
+                break;  // No more work to do.
+        }
+
+        try {
+            worker.set_z_frame(z_stack, frame);
+
+            // GIL is only needed to create the return lists and store them in ret, it is released
+            // whilst contouring.
+            py::gil_scoped_acquire gil;
+            ret[frame] = filled ? worker.multi_filled(levels) : worker.multi_lines(levels);
+        }
+        catch (...) {
+            std::lock_guard<std::mutex> guard(_chunk_mutex);
+            if (!_level_exception)
+                _level_exception = std::current_exception();
+        }
+    }
 }
 
-void ThreadedContourGenerator::thread_function(std::vector<py::list>& return_lists)
+void ThreadedContourGenerator::level_thread_function(
+    ThreadedContourGenerator& worker, const std::vector<double>& levels, py::list& ret)
 {
-    // Function that is executed by each of the threads.
-    // _next_chunk starts at zero and increases up to 2*_n_chunks.  A thread in need of work reads
-    // _next_chunk and increments it, then processes that chunk.  For _next_chunk < _n_chunks this
-    // is stage 1 (init cache levels and starting locations) and for _next_chunk >= _n_chunks this
-    // is stage 2 (trace contours).  There is a synchronisation barrier between the two stages so
-    // that the cache initialisation is complete before being used by the contour trace.
+    // Function that is executed by each of the threads when contouring levels in parallel.
+    // A thread in need of work reads _next_level and increments it, then uses its own worker to
+    // contour that level.  The first exception raised by any thread is stored for the main thread
+    // to rethrow, and stops all threads from starting new levels.
+    auto n_levels = static_cast<index_t>(ret.size());
+    index_t level;
 
-    auto n_chunks = get_n_chunks();
-    index_t chunk;
-    ChunkLocal local;
-
-    // Stage 1: Initialise cache z-levels and starting locations.
     while (true) {
         {
             std::lock_guard<std::mutex> guard(_chunk_mutex);
-            if (_next_chunk < n_chunks)
-                chunk = _next_chunk++;
+            if (_next_level < n_levels && !_level_exception)
+                level = _next_level++;
             else
                 break;  // No more work to do.
         }
 
-        get_chunk_limits(chunk, local);
-        init_cache_levels_and_starts(&local);
-        local.clear();
+        try {
+            worker.set_multi_level(levels, level);
+
+            // GIL is only needed to create the return lists and store them in ret, it is released
+            // by march() for the contouring itself.
+            py::gil_scoped_acquire gil;
+            ret[level] = worker.march_wrapper();
+        }
+        catch (...) {
+            std::lock_guard<std::mutex> guard(_chunk_mutex);
+            if (!_level_exception)
+                _level_exception = std::current_exception();
+        }
     }
+}
+
+void ThreadedContourGenerator::march(std::vector<py::list>& return_lists)
+{
+    // Each thread executes thread_function() which has three stages:
+    //   1) Initialise grid part of cache of chunks that have not been needed before
+    //   2) Initialise cache z-levels and starting locations
+    //   3) Trace contours
+    // Each stage is performed on a chunk by chunk basis.  There is a barrier between each pair of
+    // stages to synchronise the threads so the cache setup is complete before being used.
+    _next_grid_chunk = 0;
+    _next_init_chunk = 0;
+    _next_trace_chunk = 0;
+    _finished_count = 0;
+
+    // If reusing output buffers, the C++ buffers of the previous call keep their capacity.
+    _chunk_outputs.resize(get_n_chunks());
+    for (auto& output : _chunk_outputs)
+        output.clear();
 
     {
-        // Implementation of multithreaded barrier.  Each thread increments the shared counter.
-        // Last thread to finish notifies the other threads that they can all continue.
-        std::unique_lock<std::mutex> lock(_chunk_mutex);
-        _finished_count++;
-        if (_finished_count == _n_threads)
-            _condition_variable.notify_all();
-        else
-            _condition_variable.wait(lock);
+        // Main thread releases GIL whilst the contours are calculated.  Worker threads do not
+        // access Python objects.
+        py::gil_scoped_release release;
+
+        // Main thread and (_n_threads-1) pool threads.
+        ThreadPool::instance().run(_n_threads, [this, &return_lists] {
+            thread_function(return_lists);
+        });
+        assert(_next_grid_chunk >= static_cast<index_t>(get_grid_chunks().size()) &&
+               _next_init_chunk >= static_cast<index_t>(get_init_chunks().size()) &&
+               _next_trace_chunk >= static_cast<index_t>(get_trace_chunks().size()));
     }
 
-    // Stage 2: Trace contours.
-    while (true) {
-        {
-            std::lock_guard<std::mutex> guard(_chunk_mutex);
-            if (_next_chunk < 2*n_chunks)
-                chunk = _next_chunk++ - n_chunks;
-            else
+    export_chunk_outputs(return_lists);
+}
+
+void ThreadedContourGenerator::march_frames(
+    const py::array& z_stack, const LevelArray& levels, bool filled, py::list& ret)
+{
+    // Frames are contoured in parallel by separate workers, each with its own cache, that contour
+    // all of the levels of a frame in a single thread.  This is used if it gives at least as many
+    // threads as parallelising over the chunks of each level of each frame in turn.  The grid part
+    // of the cache is initialised once per worker and shared by all of the frames it contours.
+    auto n_frames = static_cast<index_t>(ret.size());
+    auto n_workers = std::min(_n_level_threads, n_frames);
+    if (n_workers <= 1 || n_workers < _n_threads) {
+        BaseContourGenerator::march_frames(z_stack, levels, filled, ret);
+        return;
+    }
+
+    // Workers share Python arrays so must be created and destroyed whilst holding the GIL.
+    std::vector<std::unique_ptr<ThreadedContourGenerator>> workers;
+    workers.reserve(n_workers);
+    for (index_t i = 0; i < n_workers; ++i)
+        workers.emplace_back(new ThreadedContourGenerator(*this, WorkerTag()));
+
+    _next_frame = 0;
+    _level_exception = nullptr;
+    index_t next_worker = 0;
+
+    {
+        // Main thread releases GIL whilst the frames are contoured.
+        py::gil_scoped_release release;
+
+        // Main thread and (n_workers-1) pool threads, each with its own worker.
+        ThreadPool::instance().run(n_workers, [&] {
+            ThreadedContourGenerator* worker = nullptr;
+            {
+                std::lock_guard<std::mutex> guard(_chunk_mutex);
+                worker = workers[next_worker++].get();
+            }
+            frame_thread_function(*worker, z_stack, levels, filled, ret);
+        });
+    }
+
+    if (_level_exception) {
+        auto exception = _level_exception;
+        _level_exception = nullptr;
+        std::rethrow_exception(exception);
+    }
+}
+
+void ThreadedContourGenerator::march_levels(const std::vector<double>& levels, py::list& ret)
+{
+    // Levels are contoured in parallel by separate workers, each with its own cache, that march
+    // all of the chunks of a level in a single thread.  This is used if it gives at least as many
+    // threads as parallelising over the chunks of each level in turn, e.g. for many levels and
+    // few chunks, as it avoids a barrier per level and gives deterministic chunk order.
+    auto n_levels = static_cast<index_t>(ret.size());
+    auto n_workers = std::min(_n_level_threads, n_levels);
+    // Not used if keeping chunk results, using the result cache or reusing output buffers as
+    // workers do not share them.
+    if (n_workers <= 1 || n_workers < _n_threads || has_chunk_results() || has_result_cache() ||
+        is_reusing_output_buffers()) {
+        BaseContourGenerator::march_levels(levels, ret);
+        return;
+    }
+
+    // Workers share Python arrays so must be created and destroyed whilst holding the GIL.
+    std::vector<std::unique_ptr<ThreadedContourGenerator>> workers;
+    workers.reserve(n_workers);
+    for (index_t i = 0; i < n_workers; ++i)
+        workers.emplace_back(new ThreadedContourGenerator(*this, WorkerTag()));
+
+    _next_level = 0;
+    _level_exception = nullptr;
+    index_t next_worker = 0;
+
+    {
+        // Main thread releases GIL whilst the levels are contoured.
+        py::gil_scoped_release release;
+
+        // Main thread and (n_workers-1) pool threads, each with its own worker.
+        ThreadPool::instance().run(n_workers, [&] {
+            ThreadedContourGenerator* worker = nullptr;
+            {
+                std::lock_guard<std::mutex> guard(_chunk_mutex);
+                worker = workers[next_worker++].get();
+            }
+            level_thread_function(*worker, levels, ret);
+        });
+    }
+
+    if (_level_exception) {
+        auto exception = _level_exception;
+        _level_exception = nullptr;
+        std::rethrow_exception(exception);
+    }
+}
+
+void ThreadedContourGenerator::thread_function(std::vector<py::list>& return_lists)
+{
+    // Function that is executed by each of the threads.
+    // Stage 1 initialises the grid part of the cache of chunks that have not been needed by a
+    // previous call, stage 2 initialises cache levels and starting locations, and stage 3 traces
+    // contours.  Each stage has an atomic counter of the next chunk that starts at zero.  A thread
+    // in need of work increments the counter and processes the chunk at that index of the grid,
+    // init or trace chunks, until the counter reaches the number of those chunks.
+    // There is a synchronisation barrier between stages so that each cache initialisation is
+    // complete before being used by the next stage.  Usually there are no grid chunks after the
+    // first call and so stage 1 and its barrier are skipped.
+
+    const auto& grid_chunks = get_grid_chunks();
+    const auto& init_chunks = get_init_chunks();
+    const auto& trace_chunks = get_trace_chunks();
+    auto n_grid_chunks = static_cast<index_t>(grid_chunks.size());
+    auto n_init_chunks = static_cast<index_t>(init_chunks.size());
+    auto n_trace_chunks = static_cast<index_t>(trace_chunks.size());
+    index_t n_barriers = 0;
+    ChunkLocal local;
+
+    // Stage 1: Initialise grid part of cache.
+    if (n_grid_chunks > 0) {
+        while (true) {
+            auto index = _next_grid_chunk.fetch_add(1, std::memory_order_relaxed);
+            if (index >= n_grid_chunks)
                 break;  // No more work to do.
+
+            get_chunk_limits(grid_chunks[index], local);
+            init_cache_grid(local);
+            local.clear();
         }
 
-        get_chunk_limits(chunk, local);
+        if (_n_threads > 1)
+            wait_for_cache_init(++n_barriers);
+    }
+
+    // Stage 2: Initialise cache z-levels and starting locations.
+    while (true) {
+        auto index = _next_init_chunk.fetch_add(1, std::memory_order_relaxed);
+        if (index >= n_init_chunks)
+            break;  // No more work to do.
+
+        get_chunk_limits(init_chunks[index], local);
+        init_cache_levels_and_starts(&local);
+        local.clear();
+    }
+
+    if (_n_threads > 1)
+        wait_for_cache_init(++n_barriers);
+
+    // Stage 3: Trace contours.
+    while (true) {
+        auto index = _next_trace_chunk.fetch_add(1, std::memory_order_relaxed);
+        if (index >= n_trace_chunks)
+            break;  // No more work to do.
+
+        get_chunk_limits(trace_chunks[index], local);
         march_chunk(local, return_lists);
         local.clear();
     }
 }
 
+void ThreadedContourGenerator::wait_for_cache_init(index_t n_barriers)
+{
+    // Implementation of multithreaded barrier.  Each thread increments the shared counter and the
+    // last thread to do so notifies the others.  The counter is not reset between barriers of the
+    // same call so barrier n_barriers is complete once it reaches n_barriers*_n_threads, after
+    // which threads that have passed it may increment the counter further.  As threads usually
+    // finish the cache init at similar times, waiting threads spin briefly before blocking on the
+    // condition variable.
+    // Acquire/release ordering makes all cache writes visible to all threads after the barrier.
+    auto target = n_barriers*_n_threads;
+    if (_finished_count.fetch_add(1, std::memory_order_acq_rel) + 1 == target) {
+        std::lock_guard<std::mutex> guard(_chunk_mutex);
+        _condition_variable.notify_all();
+        return;
+    }
+
+    auto finished = [this, target] {
+        return _finished_count.load(std::memory_order_acquire) >= target; };
+
+    for (int i = 0; i < BARRIER_SPIN_COUNT; ++i) {
+        if (finished())
+            return;
+        std::this_thread::yield();
+    }
+
+    std::unique_lock<std::mutex> lock(_chunk_mutex);
+    _condition_variable.wait(lock, finished);
+}
+
 } // namespace contourpy
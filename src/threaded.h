@@ -2,7 +2,9 @@
 #define CONTOURPY_THREADED_H
 
 #include "base.h"
+#include <atomic>
 #include <condition_variable>
+#include <exception>
 #include <mutex>
 
 namespace contourpy {
@@ -11,57 +13,114 @@ class ThreadedContourGenerator : public BaseContourGenerator<ThreadedContourGene
 {
 public:
     ThreadedContourGenerator(
-        const CoordinateArray& x, const CoordinateArray& y, const CoordinateArray& z,
+        const XYArray& x, const XYArray& y, const ZArray& z,
         const MaskArray& mask, bool corner_mask, LineType line_type, FillType fill_type,
         bool quad_as_tri, ZInterp z_interp, index_t x_chunk_size, index_t y_chunk_size,
-        index_t n_threads);
+        index_t n_threads, const py::object& output_dtype);
 
     index_t get_thread_count() const;
 
 private:
     friend class BaseContourGenerator<ThreadedContourGenerator>;
 
-    // Lock class is used to lock access to a single thread when creating/modifying Python objects.
-    // Also acquires the GIL for the duration of the lock.
-    class Lock
+    // Worker used to contour a single level at a time using a single thread.
+    ThreadedContourGenerator(const ThreadedContourGenerator& other, WorkerTag tag);
+
+    // NumPy arrays are not created by the worker threads, which would require locking access to
+    // Python objects for every chunk.  Instead the worker threads write to C++ buffers that are
+    // wrapped as NumPy arrays in bulk by the main thread once all chunks have been marched.
+    static constexpr bool defer_python_arrays = true;
+
+    // C++ buffers for the output of a single chunk, written by a worker thread.  Which buffers are
+    // used depends on the line or fill type.
+    struct ChunkOutput
     {
-    public:
-        explicit Lock(ThreadedContourGenerator& contour_generator)
-            : _lock(contour_generator._python_mutex)
-        {}
-
-        // Non-copyable and non-moveable.
-        Lock(const Lock& other) = delete;
-        Lock(const Lock&& other) = delete;
-        Lock& operator=(const Lock& other) = delete;
-        Lock& operator=(const Lock&& other) = delete;
-
-    private:
-        std::unique_lock<std::mutex> _lock;
-        py::gil_scoped_acquire _gil;
+        std::vector<PointArray::value_type> points;
+        std::vector<float> points_float32;  // Used instead of points if has_float32_output().
+        std::vector<OffsetArray::value_type> line_offsets;
+        std::vector<OffsetArray::value_type> outer_offsets;
+        std::vector<CodeArray::value_type> codes;
+        std::vector<OffsetArray::value_type> offsets;  // Per-outer offsets of FillType.OuterOffset.
+
+        // Clear contents but keep capacity.
+        void clear()
+        {
+            points.clear();
+            points_float32.clear();
+            line_offsets.clear();
+            outer_offsets.clear();
+            codes.clear();
+            offsets.clear();
+        }
     };
 
-    // Write points and offsets/codes to output numpy arrays.
-    void export_filled(const ChunkLocal& local, std::vector<py::list>& return_lists);
+    // Move the points of local into output, converting them to float32 if has_float32_output().
+    void export_points(ChunkLocal& local, ChunkOutput& output);
+
+    // Return 1D NumPy array for item list_index of chunk containing the contents of buffer.
+    template <typename T>
+    py::array_t<T> buffer_to_array(std::vector<T>& buffer, index_t chunk, index_t list_index);
+
+    // Return the object to use as the base of NumPy arrays that are views into the contents of
+    // buffer, which is item list_index of chunk, and set data to the start of those contents.  If
+    // reusing output buffers the contents are copied into the output buffer, otherwise buffer is
+    // moved into a capsule without being copied.
+    template <typename T>
+    py::object export_buffer(
+        std::vector<T>& buffer, index_t chunk, index_t list_index, T*& data);
+
+    // Create NumPy arrays wrapping the buffers of all chunk outputs and add them to return_lists.
+    // Must be called by the main thread whilst holding the GIL.
+    void export_chunk_outputs(std::vector<py::list>& return_lists);
+
+    // Write points and offsets/codes of a chunk to C++ buffers in _chunk_outputs.
+    void export_filled(ChunkLocal& local, std::vector<py::list>& return_lists);
 
-    // Write points and offsets/codes to output numpy arrays.
-    void export_lines(const ChunkLocal& local, std::vector<py::list>& return_lists);
+    // Write points and offsets/codes of a chunk to C++ buffers in _chunk_outputs.
+    void export_lines(ChunkLocal& local, std::vector<py::list>& return_lists);
 
     static index_t limit_n_threads(index_t n_threads, index_t n_chunks);
 
+    void frame_thread_function(
+        ThreadedContourGenerator& worker, const py::array& z_stack, const LevelArray& levels,
+        bool filled, py::list& ret);
+
+    void level_thread_function(
+        ThreadedContourGenerator& worker, const std::vector<double>& levels, py::list& ret);
+
     void march(std::vector<py::list>& return_lists);
 
+    // Reimplementation of BaseContourGenerator::march_frames() to contour frames in parallel.
+    void march_frames(
+        const py::array& z_stack, const LevelArray& levels, bool filled, py::list& ret);
+
+    // Reimplementation of BaseContourGenerator::march_levels() to contour levels in parallel.
+    void march_levels(const std::vector<double>& levels, py::list& ret);
+
     void thread_function(std::vector<py::list>& return_lists);
 
+    // Wait until all threads have finished a stage of the cache init, n_barriers is the number of
+    // barriers (including this one) that have been reached in the current call.
+    void wait_for_cache_init(index_t n_barriers);
+
 
 
     // Multithreading member variables.
     index_t _n_threads;        // Number of threads used.
-    index_t _next_chunk;       // Next available chunk for thread to process.
-    index_t _finished_count;   // Count of threads that have finished the cache init.
-    std::mutex _chunk_mutex;   // Locks access to _next_chunk/_finished_count.
-    std::mutex _python_mutex;  // Locks access to Python objects.
+    index_t _n_level_threads;  // Maximum number of threads used to contour levels, or frames of a
+                               // z stack, in parallel.
+    std::atomic<index_t> _next_grid_chunk;   // Next available chunk for thread to init grid.
+    std::atomic<index_t> _next_init_chunk;   // Next available chunk for thread to init cache.
+    std::atomic<index_t> _next_trace_chunk;  // Next available chunk for thread to trace.
+    std::atomic<index_t> _finished_count;    // Count of threads that have reached a barrier.
+    index_t _next_level;       // Next available level for thread to process.
+    index_t _next_frame;       // Next available frame of a z stack for thread to process.
+    std::exception_ptr _level_exception;  // First exception raised when contouring levels or
+                                          // frames in parallel.
+    std::mutex _chunk_mutex;   // Locks access to _next_level/_next_frame/_level_exception, and
+                               // barrier wait.
     std::condition_variable _condition_variable;  // Implements multithreaded barrier.
+    std::vector<ChunkOutput> _chunk_outputs;      // Indexed by chunk.
 };
 
 } // namespace contourpy
@@ -1,10 +1,12 @@
 #include "base_impl.h"
 #include "contour_generator.h"
+#include "converter.h"
 #include "fill_type.h"
 #include "line_type.h"
 #include "mpl2005.h"
 #include "mpl2014.h"
 #include "serial.h"
+#include "thread_pool.h"
 #include "threaded.h"
 #include "util.h"
 #include "z_interp.h"
@@ -70,15 +72,59 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         .value("Log", contourpy::ZInterp::Log)
         .export_values();
 
+    m.def("_convert_filled", &contourpy::Converter::convert_filled,
+        "filled"_a, "fill_type_from"_a, "fill_type_to"_a,
+        "Convert filled contours from one :class:`~.FillType` to another.\n\n"
+        "This is the native implementation of :func:`~contourpy.convert_filled`, which should be "
+        "called instead as it checks the filled contours first.");
+    m.def("_convert_lines", &contourpy::Converter::convert_lines,
+        "lines"_a, "line_type_from"_a, "line_type_to"_a,
+        "Convert contour lines from one :class:`~.LineType` to another.\n\n"
+        "This is the native implementation of :func:`~contourpy.convert_lines`, which should be "
+        "called instead as it checks the contour lines first.");
+    m.def("_dechunk_filled", &contourpy::Converter::dechunk_filled, "filled"_a, "fill_type"_a,
+        "Return chunked filled contours with all chunks combined into the first chunk.\n\n"
+        "This is the native implementation of :func:`~contourpy.dechunk_filled`, which should be "
+        "called instead as it checks the filled contours first.");
+    m.def("_dechunk_lines", &contourpy::Converter::dechunk_lines, "lines"_a, "line_type"_a,
+        "Return chunked contour lines with all chunks combined into the first chunk.\n\n"
+        "This is the native implementation of :func:`~contourpy.dechunk_lines`, which should be "
+        "called instead as it checks the contour lines first.");
+
     m.def("max_threads", &contourpy::Util::get_max_threads,
         "Return the maximum number of threads, obtained from "
         "``std::thread::hardware_concurrency()``.\n\n"
         "This is the number of threads used by a multithreaded ContourGenerator if the kwarg "
         "``threads=0`` is passed to :func:`~.contour_generator`.");
 
+    m.def("set_thread_pool_size",
+        [](contourpy::index_t size) {contourpy::ThreadPool::instance().set_size(size);}, "size"_a,
+        py::call_guard<py::gil_scoped_release>(),
+        "Set the maximum number of idle threads that are kept alive between calls by the thread "
+        "pool used by :class:`~.ThreadedContourGenerator`.\n\n"
+        "Args:\n"
+        "    size (int): Maximum number of idle threads, ``0`` to create new threads for every "
+        "call.\n\n"
+        "Excess idle threads are stopped. Raises a ``ValueError`` if ``size`` is negative.");
+    m.def("shutdown_thread_pool", []() {contourpy::ThreadPool::instance().shutdown();},
+        py::call_guard<py::gil_scoped_release>(),
+        "Stop all idle threads of the thread pool used by :class:`~.ThreadedContourGenerator`.\n\n"
+        "The thread pool size is unchanged so new threads are created as required by subsequent "
+        "calls.");
+    m.def("thread_pool_size", []() {return contourpy::ThreadPool::instance().get_size();},
+        "Return the maximum number of idle threads that are kept alive between calls by the "
+        "thread pool used by :class:`~.ThreadedContourGenerator`.\n\n"
+        "Defaults to one less than :func:`~.max_threads`, as the calling thread is also used.");
+
     const char* chunk_count_doc = "Return tuple of (y, x) chunk counts.";
     const char* chunk_size_doc = "Return tuple of (y, x) chunk sizes.";
     const char* corner_mask_doc = "Return whether ``corner_mask`` is set or not.";
+    const char* clear_output_buffers_doc =
+        "Release the output buffers kept for reuse by :meth:`set_reuse_output_buffers`.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* clear_result_cache_doc =
+        "Remove all results from the result cache and reset its hit and miss counts.\n\n"
+        ".. versionadded:: 1.4.0";
     const char* create_contour_doc =
         "Synonym for :meth:`~.ContourGenerator.lines` to provide backward compatibility "
         "with Matplotlib.";
@@ -103,6 +149,37 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         "``lower_level`` or ``upper_level`` are ``np.nan``.\n\n"
         "To return filled contours below a ``level`` use ``filled(-np.inf, level)``.\n"
         "To return filled contours above a ``level`` use ``filled(level, np.inf)``";
+    const char* filled_subset_doc =
+        "Calculate and return filled contours between two levels.\n\n"
+        "Args:\n"
+        "    lower_level (float): Lower z-level of the filled contours, cannot be ``np.nan``.\n"
+        "    upper_level (float): Upper z-level of the filled contours, cannot be ``np.nan``.\n"
+        "    bounds (tuple of 4 ints, optional): Region of points ``(j0, j1, i0, i1)`` to contour, "
+        "i.e. ``z[j0:j1, i0:i1]``. Only the chunks containing quads that use any of these "
+        "points are contoured.\n"
+        "    chunks (sequence of ints, optional): Indices of the chunks to contour, in the range "
+        "``0`` to ``chunk_count[0]*chunk_count[1] - 1`` in row-major order. Cannot be used with "
+        "``bounds``.\n\n"
+        "Return:\n"
+        "    Filled contour polygons as nested sequences of numpy arrays. The exact format is "
+        "determined by the :attr:`~.ContourGenerator.fill_type` used by the ``ContourGenerator`` "
+        "and the options are explained at :ref:`fill_type`.\n\n"
+        "Raises a ``ValueError`` if ``lower_level >= upper_level`` or if\n"
+        "``lower_level`` or ``upper_level`` are ``np.nan``.\n\n"
+        "To return filled contours below a ``level`` use ``filled(-np.inf, level)``.\n"
+        "To return filled contours above a ``level`` use ``filled(level, np.inf)``\n\n"
+        "If ``bounds`` or ``chunks`` is specified only those chunks are contoured, so the "
+        "returned contours may extend beyond ``bounds``, and the items of chunks that are not "
+        "contoured are ``None``. Otherwise all chunks are contoured.\n\n"
+        ".. versionchanged:: 1.4.0\n"
+        "   Added ``bounds`` and ``chunks`` keyword arguments.";
+    const char* cache_quad_middles_doc =
+        "Return whether the middles of quads are cached, as set by :meth:`set_cache_quad_middles`."
+        "\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* keep_log_z_doc =
+        "Return whether ``log(z)`` is kept between calls, as set by :meth:`set_keep_log_z`.\n\n"
+        ".. versionadded:: 1.4.0";
     const char* line_type_doc = "Return the :class:`~.LineType`.";
     const char* lines_doc =
         "Calculate and return contour lines at a particular level.\n\n"
@@ -114,6 +191,27 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         "used by the ``ContourGenerator`` and the options are explained at :ref:`line_type`.\n\n"
         "``level`` may be ``np.nan``, ``np.inf`` or ``-np.inf``; they all return the same result "
         "which is an empty line set.";
+    const char* lines_subset_doc =
+        "Calculate and return contour lines at a particular level.\n\n"
+        "Args:\n"
+        "    level (float): z-level to calculate contours at.\n"
+        "    bounds (tuple of 4 ints, optional): Region of points ``(j0, j1, i0, i1)`` to contour, "
+        "i.e. ``z[j0:j1, i0:i1]``. Only the chunks containing quads that use any of these "
+        "points are contoured.\n"
+        "    chunks (sequence of ints, optional): Indices of the chunks to contour, in the range "
+        "``0`` to ``chunk_count[0]*chunk_count[1] - 1`` in row-major order. Cannot be used with "
+        "``bounds``.\n\n"
+        "Return:\n"
+        "    Contour lines (open line strips and closed line loops) as nested sequences of "
+        "numpy arrays. The exact format is determined by the :attr:`~.ContourGenerator.line_type` "
+        "used by the ``ContourGenerator`` and the options are explained at :ref:`line_type`.\n\n"
+        "``level`` may be ``np.nan``, ``np.inf`` or ``-np.inf``; they all return the same result "
+        "which is an empty line set.\n\n"
+        "If ``bounds`` or ``chunks`` is specified only those chunks are contoured, so the "
+        "returned contours may extend beyond ``bounds``, and the items of chunks that are not "
+        "contoured are ``None``. Otherwise all chunks are contoured.\n\n"
+        ".. versionchanged:: 1.4.0\n"
+        "   Added ``bounds`` and ``chunks`` keyword arguments.";
     const char* multi_filled_doc =
         "Calculate and return filled contours between multiple pairs of adjacent levels.\n\n"
         "Args:\n"
@@ -134,6 +232,23 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         ".. code-block:: python\n\n"
         "    ret = [cont_gen.filled(lower, upper) for lower, upper in zip(levels[:-1], levels[1:])]\n\n"
         ".. versionadded:: 1.3.0";
+    const char* multi_filled_stack_doc =
+        "Calculate and return filled contours between multiple pairs of adjacent levels for each "
+        "frame of a stack of z arrays.\n\n"
+        "Args:\n"
+        "    z_stack (array-like of floats of shape (nt, ny, nx)): Stack of ``nt`` z arrays, each "
+        "of the same shape as ``z`` and using the same ``x``, ``y`` and mask. Points that are not "
+        "masked cannot be NaN or infinity.\n"
+        "    levels (array-like of floats): z-levels to calculate filled contours between, as for "
+        ":meth:`~.ContourGenerator.multi_filled`.\n\n"
+        "Return:\n"
+        "    List of length ``nt`` of the :meth:`~.ContourGenerator.multi_filled` results of each "
+        "frame.\n\n"
+        "The grid part of the cache is shared by all frames rather than being recalculated for "
+        "each one, and :class:`~.ThreadedContourGenerator` contours multiple frames in parallel. "
+        "Results are never cached by the result cache or kept for :meth:`update_z`. Use "
+        ":func:`~contourpy.stacked_multi_filled` to support a mask that changes between frames.\n\n"
+        ".. versionadded:: 1.4.0";
     const char* multi_lines_doc =
         "Calculate and return contour lines at multiple levels.\n\n"
         "Args:\n"
@@ -149,7 +264,138 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         ".. code-block:: python\n\n"
         "    ret = [cont_gen.lines(level) for level in levels]\n\n"
         ".. versionadded:: 1.3.0";
+    const char* multi_lines_stack_doc =
+        "Calculate and return contour lines at multiple levels for each frame of a stack of z "
+        "arrays.\n\n"
+        "Args:\n"
+        "    z_stack (array-like of floats of shape (nt, ny, nx)): Stack of ``nt`` z arrays, each "
+        "of the same shape as ``z`` and using the same ``x``, ``y`` and mask. Points that are not "
+        "masked cannot be NaN or infinity.\n"
+        "    levels (array-like of floats): z-levels to calculate contours at.\n\n"
+        "Return:\n"
+        "    List of length ``nt`` of the :meth:`~.ContourGenerator.multi_lines` results of each "
+        "frame.\n\n"
+        "The grid part of the cache is shared by all frames rather than being recalculated for "
+        "each one, and :class:`~.ThreadedContourGenerator` contours multiple frames in parallel. "
+        "Results are never cached by the result cache or kept for :meth:`update_z`. Use "
+        ":func:`~contourpy.stacked_multi_lines` to support a mask that changes between frames.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* output_dtype_doc =
+        "Return the dtype of returned points, ``float64`` or ``float32``.\n\n"
+        ".. versionadded:: 1.4.0";
     const char* quad_as_tri_doc = "Return whether ``quad_as_tri`` is set or not.";
+    const char* quad_middles_nbytes_doc =
+        "Return the approximate size in bytes of the cached middles of quads, which is zero if "
+        "they have not been calculated.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* result_cache_info_doc =
+        "Return a dict of result cache statistics.\n\n"
+        "Keys are ``hits`` and ``misses``, the number of calls that did and did not find their "
+        "results in the cache, ``entries``, the number of results in the cache, ``nbytes``, the "
+        "approximate total size of those results in bytes, and ``max_nbytes`` as set by "
+        ":meth:`set_result_cache_size`.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* reuse_output_buffers_doc =
+        "Return whether output buffers are reused between calls, as set by "
+        ":meth:`set_reuse_output_buffers`.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* set_cache_quad_middles_doc =
+        "Set whether the middles of quads are cached when using ``quad_as_tri``, which is "
+        "disabled by default.\n\n"
+        "Args:\n"
+        "    cache (bool): Whether to cache the middles of quads.\n\n"
+        "Using ``quad_as_tri`` requires the x, y and z of the middle of each quad, which are "
+        "otherwise recalculated from the quad's corners every time they are needed, including "
+        "for every level. If enabled, they are calculated for all quads the first time they are "
+        "needed and kept in buffers of 24 bytes per point, as reported by "
+        ":attr:`quad_middles_nbytes`. x and y are reused until this is disabled, z until ``z`` "
+        "is changed by :meth:`set_z` or :meth:`update_z`. Disabling this releases the buffers. "
+        "It has no effect if not using ``quad_as_tri``, or for algorithms that do not support "
+        "``quad_as_tri``, which are ``mpl2005`` and ``mpl2014``.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* set_keep_log_z_doc =
+        "Set whether ``log(z)`` is kept between calls when using ``ZInterp.Log``, which is "
+        "disabled by default.\n\n"
+        "Args:\n"
+        "    keep (bool): Whether to keep ``log(z)``.\n\n"
+        "Logarithmic z-interpolation is performed as linear interpolation of ``log(z)``, which is "
+        "calculated for all points once per call and shared by all levels of "
+        ":meth:`~.ContourGenerator.multi_lines` and :meth:`~.ContourGenerator.multi_filled`. If "
+        "enabled, it is kept in a buffer of 8 bytes per point and reused by subsequent calls "
+        "until ``z`` is changed by :meth:`set_z` or :meth:`update_z`. Disabling this releases the "
+        "buffer. It has no effect when using ``ZInterp.Linear``, or for algorithms that do not "
+        "support ``ZInterp.Log``, which are ``mpl2005`` and ``mpl2014``.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* set_result_cache_size_doc =
+        "Set the maximum size of the result cache, which is disabled by default.\n\n"
+        "Args:\n"
+        "    max_nbytes (int): Maximum approximate total size in bytes of the cached results, "
+        "``0`` to disable the cache.\n\n"
+        "If enabled, the results of :meth:`~.ContourGenerator.lines` and "
+        ":meth:`~.ContourGenerator.filled` calls, including those made by "
+        ":meth:`~.ContourGenerator.multi_lines` and :meth:`~.ContourGenerator.multi_filled`, are "
+        "cached and subsequent calls for the same level(s) return the cached results rather than "
+        "recalculating them. The arrays of cached results are shared between calls so they are "
+        "read-only. The least recently used results are removed from the cache when it is full. "
+        "Results larger than ``max_nbytes`` are not cached.\n\n"
+        "Has no effect for algorithms that do not support the result cache, which are "
+        "``mpl2005`` and ``mpl2014``.\n\n"
+        "Raises a ``ValueError`` if ``max_nbytes`` is negative.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* set_reuse_output_buffers_doc =
+        "Set whether output buffers are reused between calls, which is disabled by default.\n\n"
+        "Args:\n"
+        "    reuse (bool): Whether to reuse output buffers.\n\n"
+        "If enabled, the point, code and offset arrays returned by each call are views into "
+        "buffers owned by the ``ContourGenerator`` that are reused, and grown if necessary, by "
+        "the next call rather than allocating new arrays each time. This reduces memory "
+        "allocation when repeatedly contouring, such as in an animation, but the returned arrays "
+        "are only valid until the next call and must be copied if they are needed for longer. "
+        "Calls of :meth:`~.ContourGenerator.multi_lines` and "
+        ":meth:`~.ContourGenerator.multi_filled` use separate buffers for each level.\n\n"
+        "Output buffers are only reused by a ``line_type`` or ``fill_type`` that returns results "
+        "per chunk, or by :class:`~.ThreadedContourGenerator`, and are not reused if the result "
+        "cache is enabled or :meth:`update_z` has been called. Disabling this releases the "
+        "buffers.\n\n"
+        "Has no effect for algorithms that do not support reusing output buffers, which are "
+        "``mpl2005`` and ``mpl2014``.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* set_z_doc =
+        "Replace ``z`` with a new array of the same shape.\n\n"
+        "Args:\n"
+        "    z (array-like of shape (ny, nx), may be a masked array): New z values. Masked and "
+        "invalid values are masked out as for :func:`~contourpy.contour_generator`.\n\n"
+        "This allows a field that changes over time, such as in an animation, to be contoured "
+        "frame by frame without creating a new ``ContourGenerator`` for each frame. ``x``, ``y`` "
+        "and the chunking are unchanged. The grid part of the cache is kept if the mask is "
+        "unchanged, so that only the marching is repeated, otherwise it is recalculated when next "
+        "needed. ``float64`` and ``float32`` arrays are used without copying, so ``z`` must not be "
+        "modified whilst it is in use. All results are removed from the result cache and any "
+        "results kept by :meth:`update_z` are discarded.\n\n"
+        "Example:\n\n"
+        ".. code-block:: python\n\n"
+        "    for z in frames:\n"
+        "        cont_gen.set_z(z)\n"
+        "        lines = cont_gen.lines(level)\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* set_single_pass_doc =
+        "Set whether each chunk is contoured in a single pass, which is disabled by default.\n\n"
+        "Args:\n"
+        "    single_pass (bool): Whether to use a single pass.\n\n"
+        "By default each chunk is contoured in two passes, the first counts the points and lines "
+        "and the second writes them to arrays of the correct size. If enabled, each chunk is "
+        "contoured in a single pass that writes to buffers that grow as required and are then "
+        "trimmed to size, avoiding tracing each contour twice at the cost of extra memory and "
+        "copying. The results are identical. A ``fill_type`` that identifies holes, i.e. any "
+        "other than ``FillType.ChunkCombinedCode`` and ``FillType.ChunkCombinedOffset``, always "
+        "uses two passes.\n\n"
+        "Has no effect for algorithms that do not support a single pass, which are ``mpl2005`` "
+        "and ``mpl2014``.\n\n"
+        ".. versionadded:: 1.4.0";
+    const char* single_pass_doc =
+        "Return whether each chunk is contoured in a single pass, as set by "
+        ":meth:`set_single_pass`.\n\n"
+        ".. versionadded:: 1.4.0";
     const char* supports_corner_mask_doc =
         "Return whether this algorithm supports ``corner_mask``.";
     const char* supports_fill_type_doc =
@@ -165,10 +411,31 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         "which all support.";
     const char* thread_count_doc = "Return the number of threads used.";
     const char* z_interp_doc = "Return the ``ZInterp``.";
+    const char* update_z_doc =
+        "Replace the z values of a rectangular region of points.\n\n"
+        "Args:\n"
+        "    z_patch (array-like of floats): New z values, a 2D array with shape matching "
+        "``row_slice`` and ``col_slice``. Cannot contain NaN or infinity as the mask cannot be "
+        "changed.\n"
+        "    row_slice (slice): Rows (y indices) of the points to replace, with a step of 1.\n"
+        "    col_slice (slice): Columns (x indices) of the points to replace, with a step of 1.\n\n"
+        "The ``z`` array passed to the ``ContourGenerator`` is not modified, it is copied the "
+        "first time that this is called. All results are removed from the result cache.\n\n"
+        "Once this has been called, calls using a ``line_type`` or ``fill_type`` that returns "
+        "results per chunk keep those results and subsequent calls for the same level(s) only "
+        "recalculate the chunks that have been changed by ``update_z``, reusing the results of "
+        "the other chunks. Results are shared between calls so their arrays are read-only. "
+        "Results of levels that are not used between two calls of ``update_z`` are discarded.\n\n"
+        "Example:\n\n"
+        ".. code-block:: python\n\n"
+        "    cont_gen.update_z(z[100:120, 30:50], slice(100, 120), slice(30, 50))\n\n"
+        ".. versionadded:: 1.4.0";
 
     py::class_<contourpy::ContourGenerator>(m, "ContourGenerator",
         "Abstract base class for contour generator classes, defining the interface that they all "
         "implement.")
+        .def("clear_output_buffers", [](py::object /* self */) {}, clear_output_buffers_doc)
+        .def("clear_result_cache", [](py::object /* self */) {}, clear_result_cache_doc)
         .def("create_contour", &contourpy::ContourGenerator::lines, create_contour_doc, "level"_a)
         .def("create_filled_contour", &contourpy::ContourGenerator::filled,
              create_filled_contour_doc, "lower_level"_a, "upper_level"_a)
@@ -178,6 +445,35 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         .def("multi_filled", &contourpy::ContourGenerator::multi_filled, multi_filled_doc,
              "levels"_a)
         .def("multi_lines", &contourpy::ContourGenerator::multi_lines, multi_lines_doc, "levels"_a)
+        .def(
+            "result_cache_info",
+            [](py::object /* self */) {
+                return py::dict("hits"_a = 0, "misses"_a = 0, "entries"_a = 0, "nbytes"_a = 0,
+                                "max_nbytes"_a = 0);
+            },
+            result_cache_info_doc)
+        .def(
+            "set_cache_quad_middles", [](py::object /* self */, bool /* cache */) {},
+            set_cache_quad_middles_doc, "cache"_a)
+        .def(
+            "set_keep_log_z", [](py::object /* self */, bool /* keep */) {}, set_keep_log_z_doc,
+            "keep"_a)
+        .def(
+            "set_result_cache_size",
+            [](py::object /* self */, contourpy::index_t max_nbytes) {
+                if (max_nbytes < 0)
+                    throw std::invalid_argument("Result cache size must be non-negative");
+            },
+            set_result_cache_size_doc, "max_nbytes"_a)
+        .def(
+            "set_reuse_output_buffers", [](py::object /* self */, bool /* reuse */) {},
+            set_reuse_output_buffers_doc, "reuse"_a)
+        .def(
+            "set_single_pass", [](py::object /* self */, bool /* single_pass */) {},
+            set_single_pass_doc, "single_pass"_a)
+        .def_property_readonly(
+            "cache_quad_middles", [](py::object /* self */) {return false;},
+            cache_quad_middles_doc)
         .def_property_readonly(
             "chunk_count", [](py::object /* self */) {return py::make_tuple(1, 1);},
             chunk_count_doc)
@@ -188,11 +484,23 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         .def_property_readonly(
             "fill_type", [](py::object /* self */) {return contourpy::FillType::OuterOffset;},
             fill_type_doc)
+        .def_property_readonly(
+            "keep_log_z", [](py::object /* self */) {return false;}, keep_log_z_doc)
         .def_property_readonly(
             "line_type", [](py::object /* self */) {return contourpy::LineType::Separate;},
             line_type_doc)
+        .def_property_readonly(
+            "output_dtype", [](py::object /* self */) {return py::dtype::of<double>();},
+            output_dtype_doc)
         .def_property_readonly(
             "quad_as_tri", [](py::object /* self */) {return false;}, quad_as_tri_doc)
+        .def_property_readonly(
+            "quad_middles_nbytes", [](py::object /* self */) {return 0;}, quad_middles_nbytes_doc)
+        .def_property_readonly(
+            "reuse_output_buffers", [](py::object /* self */) {return false;},
+            reuse_output_buffers_doc)
+        .def_property_readonly(
+            "single_pass", [](py::object /* self */) {return false;}, single_pass_doc)
         .def_property_readonly(
             "thread_count", [](py::object /* self */) {return 1;}, thread_count_doc)
         .def_property_readonly(
@@ -312,10 +620,14 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         "ContourGenerator corresponding to ``name=\"serial\"``, the default algorithm for "
         "``contourpy``.\n\n"
         "Supports ``corner_mask``, ``quad_as_tri`` and ``z_interp`` but not ``threads``. "
-        "Supports all options for ``line_type`` and ``fill_type``.")
-        .def(py::init<const contourpy::CoordinateArray&,
-                      const contourpy::CoordinateArray&,
-                      const contourpy::CoordinateArray&,
+        "Supports all options for ``line_type`` and ``fill_type``.\n\n"
+        "The Python Global Interpreter Lock (GIL) is released whilst calculating contours, so "
+        "different instances can be used concurrently from multiple Python threads. A single "
+        "instance is not thread-safe and must not be used from more than one Python thread at "
+        "the same time.")
+        .def(py::init<const contourpy::XYArray&,
+                      const contourpy::XYArray&,
+                      const contourpy::ZArray&,
                       const contourpy::MaskArray&,
                       bool,
                       contourpy::LineType,
@@ -323,11 +635,49 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
                       bool,
                       contourpy::ZInterp,
                       contourpy::index_t,
-                      contourpy::index_t>(),
+                      contourpy::index_t,
+                      const py::object&>(),
              "x"_a, "y"_a, "z"_a, "mask"_a, py::kw_only(), "corner_mask"_a, "line_type"_a,
              "fill_type"_a, "quad_as_tri"_a, "z_interp"_a, "x_chunk_size"_a = 0,
-             "y_chunk_size"_a = 0)
+             "y_chunk_size"_a = 0, "output_dtype"_a = py::none())
         .def("_write_cache", &contourpy::SerialContourGenerator::write_cache)
+        .def("clear_output_buffers", &contourpy::SerialContourGenerator::clear_output_buffers,
+             clear_output_buffers_doc)
+        .def("clear_result_cache", &contourpy::SerialContourGenerator::clear_result_cache,
+             clear_result_cache_doc)
+        .def("filled",
+             py::overload_cast<double, double, const py::object&, const py::object&>(
+                 &contourpy::SerialContourGenerator::filled),
+             filled_subset_doc, "lower_level"_a, "upper_level"_a, py::kw_only(),
+             "bounds"_a = py::none(), "chunks"_a = py::none())
+        .def("lines",
+             py::overload_cast<double, const py::object&, const py::object&>(
+                 &contourpy::SerialContourGenerator::lines),
+             lines_subset_doc, "level"_a, py::kw_only(), "bounds"_a = py::none(),
+             "chunks"_a = py::none())
+        .def("multi_filled_stack", &contourpy::SerialContourGenerator::multi_filled_stack,
+             multi_filled_stack_doc, "z_stack"_a, "levels"_a)
+        .def("multi_lines_stack", &contourpy::SerialContourGenerator::multi_lines_stack,
+             multi_lines_stack_doc, "z_stack"_a, "levels"_a)
+        .def("result_cache_info", &contourpy::SerialContourGenerator::get_result_cache_info,
+             result_cache_info_doc)
+        .def("set_cache_quad_middles", &contourpy::SerialContourGenerator::set_cache_quad_middles,
+             set_cache_quad_middles_doc, "cache"_a)
+        .def("set_keep_log_z", &contourpy::SerialContourGenerator::set_keep_log_z,
+             set_keep_log_z_doc, "keep"_a)
+        .def("set_result_cache_size", &contourpy::SerialContourGenerator::set_result_cache_size,
+             set_result_cache_size_doc, "max_nbytes"_a)
+        .def("set_reuse_output_buffers",
+             &contourpy::SerialContourGenerator::set_reuse_output_buffers,
+             set_reuse_output_buffers_doc, "reuse"_a)
+        .def("set_single_pass", &contourpy::SerialContourGenerator::set_single_pass,
+             set_single_pass_doc, "single_pass"_a)
+        .def("set_z", &contourpy::SerialContourGenerator::set_z, set_z_doc, "z"_a)
+        .def("update_z", &contourpy::SerialContourGenerator::update_z, update_z_doc, "z_patch"_a,
+             "row_slice"_a, "col_slice"_a)
+        .def_property_readonly(
+            "cache_quad_middles", &contourpy::SerialContourGenerator::get_cache_quad_middles,
+            cache_quad_middles_doc)
         .def_property_readonly(
             "chunk_count", &contourpy::SerialContourGenerator::get_chunk_count, chunk_count_doc)
         .def_property_readonly(
@@ -336,10 +686,23 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
             "corner_mask", &contourpy::SerialContourGenerator::get_corner_mask, corner_mask_doc)
         .def_property_readonly(
             "fill_type", &contourpy::SerialContourGenerator::get_fill_type, fill_type_doc)
+        .def_property_readonly(
+            "keep_log_z", &contourpy::SerialContourGenerator::get_keep_log_z, keep_log_z_doc)
         .def_property_readonly(
             "line_type", &contourpy::SerialContourGenerator::get_line_type, line_type_doc)
+        .def_property_readonly(
+            "output_dtype", &contourpy::SerialContourGenerator::get_output_dtype,
+            output_dtype_doc)
         .def_property_readonly(
             "quad_as_tri", &contourpy::SerialContourGenerator::get_quad_as_tri, quad_as_tri_doc)
+        .def_property_readonly(
+            "quad_middles_nbytes", &contourpy::SerialContourGenerator::get_quad_middles_nbytes,
+            quad_middles_nbytes_doc)
+        .def_property_readonly(
+            "reuse_output_buffers", &contourpy::SerialContourGenerator::get_reuse_output_buffers,
+            reuse_output_buffers_doc)
+        .def_property_readonly(
+            "single_pass", &contourpy::SerialContourGenerator::get_single_pass, single_pass_doc)
         .def_property_readonly(
             "z_interp", &contourpy::SerialContourGenerator::get_z_interp, z_interp_doc)
         .def_property_readonly_static(
@@ -364,10 +727,14 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
         "ContourGenerator corresponding to ``name=\"threaded\"``, the multithreaded version of "
         ":class:`~.SerialContourGenerator`.\n\n"
         "Supports ``corner_mask``, ``quad_as_tri`` and ``z_interp`` and ``threads``. "
-        "Supports all options for ``line_type`` and ``fill_type``.")
-        .def(py::init<const contourpy::CoordinateArray&,
-                      const contourpy::CoordinateArray&,
-                      const contourpy::CoordinateArray&,
+        "Supports all options for ``line_type`` and ``fill_type``.\n\n"
+        "The Python Global Interpreter Lock (GIL) is released whilst calculating contours, so "
+        "different instances can be used concurrently from multiple Python threads. A single "
+        "instance is not thread-safe and must not be used from more than one Python thread at "
+        "the same time.")
+        .def(py::init<const contourpy::XYArray&,
+                      const contourpy::XYArray&,
+                      const contourpy::ZArray&,
                       const contourpy::MaskArray&,
                       bool,
                       contourpy::LineType,
@@ -376,11 +743,49 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
                       contourpy::ZInterp,
                       contourpy::index_t,
                       contourpy::index_t,
-                      contourpy::index_t>(),
+                      contourpy::index_t,
+                      const py::object&>(),
              "x"_a, "y"_a, "z"_a, "mask"_a, py::kw_only(), "corner_mask"_a, "line_type"_a,
              "fill_type"_a, "quad_as_tri"_a, "z_interp"_a, "x_chunk_size"_a = 0,
-             "y_chunk_size"_a = 0, "thread_count"_a = 0)
+             "y_chunk_size"_a = 0, "thread_count"_a = 0, "output_dtype"_a = py::none())
         .def("_write_cache", &contourpy::ThreadedContourGenerator::write_cache)
+        .def("clear_output_buffers", &contourpy::ThreadedContourGenerator::clear_output_buffers,
+             clear_output_buffers_doc)
+        .def("clear_result_cache", &contourpy::ThreadedContourGenerator::clear_result_cache,
+             clear_result_cache_doc)
+        .def("filled",
+             py::overload_cast<double, double, const py::object&, const py::object&>(
+                 &contourpy::ThreadedContourGenerator::filled),
+             filled_subset_doc, "lower_level"_a, "upper_level"_a, py::kw_only(),
+             "bounds"_a = py::none(), "chunks"_a = py::none())
+        .def("lines",
+             py::overload_cast<double, const py::object&, const py::object&>(
+                 &contourpy::ThreadedContourGenerator::lines),
+             lines_subset_doc, "level"_a, py::kw_only(), "bounds"_a = py::none(),
+             "chunks"_a = py::none())
+        .def("multi_filled_stack", &contourpy::ThreadedContourGenerator::multi_filled_stack,
+             multi_filled_stack_doc, "z_stack"_a, "levels"_a)
+        .def("multi_lines_stack", &contourpy::ThreadedContourGenerator::multi_lines_stack,
+             multi_lines_stack_doc, "z_stack"_a, "levels"_a)
+        .def("result_cache_info", &contourpy::ThreadedContourGenerator::get_result_cache_info,
+             result_cache_info_doc)
+        .def("set_cache_quad_middles", &contourpy::ThreadedContourGenerator::set_cache_quad_middles,
+             set_cache_quad_middles_doc, "cache"_a)
+        .def("set_keep_log_z", &contourpy::ThreadedContourGenerator::set_keep_log_z,
+             set_keep_log_z_doc, "keep"_a)
+        .def("set_result_cache_size", &contourpy::ThreadedContourGenerator::set_result_cache_size,
+             set_result_cache_size_doc, "max_nbytes"_a)
+        .def("set_reuse_output_buffers",
+             &contourpy::ThreadedContourGenerator::set_reuse_output_buffers,
+             set_reuse_output_buffers_doc, "reuse"_a)
+        .def("set_single_pass", &contourpy::ThreadedContourGenerator::set_single_pass,
+             set_single_pass_doc, "single_pass"_a)
+        .def("set_z", &contourpy::ThreadedContourGenerator::set_z, set_z_doc, "z"_a)
+        .def("update_z", &contourpy::ThreadedContourGenerator::update_z, update_z_doc, "z_patch"_a,
+             "row_slice"_a, "col_slice"_a)
+        .def_property_readonly(
+            "cache_quad_middles", &contourpy::ThreadedContourGenerator::get_cache_quad_middles,
+            cache_quad_middles_doc)
         .def_property_readonly(
             "chunk_count", &contourpy::ThreadedContourGenerator::get_chunk_count, chunk_count_doc)
         .def_property_readonly(
@@ -389,10 +794,23 @@ PYBIND11_MODULE(_contourpy, m, py::mod_gil_not_used()) {
             "corner_mask", &contourpy::ThreadedContourGenerator::get_corner_mask, corner_mask_doc)
         .def_property_readonly(
             "fill_type", &contourpy::ThreadedContourGenerator::get_fill_type, fill_type_doc)
+        .def_property_readonly(
+            "keep_log_z", &contourpy::ThreadedContourGenerator::get_keep_log_z, keep_log_z_doc)
         .def_property_readonly(
             "line_type", &contourpy::ThreadedContourGenerator::get_line_type, line_type_doc)
+        .def_property_readonly(
+            "output_dtype", &contourpy::ThreadedContourGenerator::get_output_dtype,
+            output_dtype_doc)
         .def_property_readonly(
             "quad_as_tri", &contourpy::ThreadedContourGenerator::get_quad_as_tri, quad_as_tri_doc)
+        .def_property_readonly(
+            "quad_middles_nbytes", &contourpy::ThreadedContourGenerator::get_quad_middles_nbytes,
+            quad_middles_nbytes_doc)
+        .def_property_readonly(
+            "reuse_output_buffers", &contourpy::ThreadedContourGenerator::get_reuse_output_buffers,
+            reuse_output_buffers_doc)
+        .def_property_readonly(
+            "single_pass", &contourpy::ThreadedContourGenerator::get_single_pass, single_pass_doc)
         .def_property_readonly(
             "thread_count", &contourpy::ThreadedContourGenerator::get_thread_count,
             thread_count_doc)
@@ -87,7 +87,7 @@ def test_codes_from_offsets_and_points() -> None:
     with pytest.raises(ValueError, match=r"Expected numpy array of dtype <class 'numpy.float64'>"):
         arr.codes_from_offsets_and_points(
             np.array([0, 2], dtype=offset_dtype),
-            np.array([[0, 1], [2, 3]], dtype=np.float32),
+            np.array([[0, 1], [2, 3]], dtype=np.float16),  # type: ignore[arg-type]
         )
 
     with pytest.raises(ValueError, match=r"Expected numpy array of shape"):
@@ -110,7 +110,8 @@ def test_codes_from_points() -> None:
         arr.codes_from_points([[0, 1], [2, 3], [0, 1]])  # type: ignore[arg-type]
 
     with pytest.raises(ValueError, match=r"Expected numpy array of dtype <class 'numpy.float64'>"):
-        arr.codes_from_points(np.array([[0, 1], [2, 3], [4, 5]], dtype=np.float32))
+        arr.codes_from_points(
+            np.array([[0, 1], [2, 3], [4, 5]], dtype=np.float16))  # type: ignore[arg-type]
 
     with pytest.raises(ValueError, match=r"Expected numpy array of shape"):
         arr.codes_from_points(np.array([0, 1, 2, 3], dtype=point_dtype))
@@ -338,7 +339,7 @@ def test_insert_nan_at_offsets() -> None:
 
     with pytest.raises(ValueError, match=r"Expected numpy array of dtype <class 'numpy.float64'>"):
         arr.insert_nan_at_offsets(
-            np.array([[0, 1], [2, 3], [4, 5]], dtype=np.float32),
+            np.array([[0, 1], [2, 3], [4, 5]], dtype=np.float16),  # type: ignore[arg-type]
             np.array([0, 3], dtype=offset_dtype),
         )
 
@@ -538,7 +539,8 @@ def test_split_points_at_nan() -> None:
         arr.split_points_at_nan([[0, 1], [2, 3]])  # type: ignore[arg-type]
 
     with pytest.raises(ValueError, match=r"Expected numpy array of dtype <class 'numpy.float64'>"):
-        arr.split_points_at_nan(np.array([[0, 1], [2, 3]], dtype=np.float32))
+        arr.split_points_at_nan(
+            np.array([[0, 1], [2, 3]], dtype=np.float16))  # type: ignore[arg-type]
 
     with pytest.raises(ValueError, match=r"Expected numpy array of shape"):
         arr.split_points_at_nan(np.array([[0, 1, 2, 3]], dtype=point_dtype))
@@ -417,3 +417,85 @@ def test_z_interp_not_supported(name: str, xyz_3x3_as_lists: tuple[list[list[int
     msg = f"{name} contour generator does not support z_interp ZInterp.Log"
     with pytest.raises(ValueError, match=msg):
         contour_generator(x, y, z, name=name, z_interp=ZInterp.Log)
+
+
+@pytest.mark.parametrize("name", util_test.all_names())
+def test_copy_false(name: str) -> None:
+    x, y = np.meshgrid(np.arange(4.0), np.arange(3.0))
+    z = np.arange(12.0).reshape(3, 4)
+    contour_generator(x, y, z, name=name, copy=False)
+    contour_generator(np.arange(4.0), np.arange(3.0), z, name=name, copy=False)
+    contour_generator(z=np.ma.array(z, mask=z == 5), name=name, copy=False)
+    contour_generator(z=np.where(z == 5, np.nan, z), name=name, copy=False)
+
+    with pytest.raises(ValueError, match="Cannot avoid a copy of z as it is not a NumPy array"):
+        contour_generator(z=z.tolist(), name=name, copy=False)
+    with pytest.raises(ValueError, match="Cannot avoid a copy of z as its dtype is int64"):
+        contour_generator(z=z.astype(np.int64), name=name, copy=False)
+    with pytest.raises(ValueError, match="Cannot avoid a copy of x as it is not a C-contiguous"):
+        contour_generator(x.tolist(), y, z, name=name, copy=False)
+    with pytest.raises(ValueError, match="Cannot avoid a copy of y as it is not a C-contiguous"):
+        contour_generator(x, np.asfortranarray(y), z, name=name, copy=False)
+
+    x32, y32 = x.astype(np.float32), y.astype(np.float32)
+    if name in ("mpl2005", "mpl2014"):
+        with pytest.raises(ValueError, match="not a C-contiguous float64 NumPy array"):
+            contour_generator(x32, y32, z, name=name, copy=False)
+    else:
+        contour_generator(x32, y32, z, name=name, copy=False)
+
+    for z_other in (z.astype(np.float32), np.asfortranarray(z), z[:, ::-1]):
+        if name in ("mpl2005", "mpl2014"):
+            msg = f"Cannot avoid a copy of z as {name} contour generator requires a C-contiguous"
+            with pytest.raises(ValueError, match=msg):
+                contour_generator(z=z_other, name=name, copy=False)
+        else:
+            contour_generator(z=z_other, name=name, copy=False)
+
+
+@pytest.mark.parametrize("name", util_test.all_names())
+def test_copy_true(name: str) -> None:
+    z = np.ma.array(np.arange(12.0).reshape(3, 4), mask=False)
+    z[1, 1] = np.ma.masked
+    cont_gen = contour_generator(z=z, name=name, fill_type=FillType.OuterCode, copy=True)
+    expected = cont_gen.filled(2.5, 7.5)
+
+    # Changing z and its mask does not change the ContourGenerator.
+    z[...] = 0.0
+    z.mask = True
+    util_test.assert_equal_recursive(expected, cont_gen.filled(2.5, 7.5))
+
+
+@pytest.mark.parametrize("name", util_test.all_names())
+def test_copy_none_mask(name: str) -> None:
+    z = np.ma.array(np.arange(12.0).reshape(3, 4), mask=False)
+    z[1, 1] = np.ma.masked
+    cont_gen = contour_generator(z=z, name=name, fill_type=FillType.OuterCode)
+    expected = cont_gen.filled(2.5, 7.5)
+
+    # The mask of z is copied by default so changing it does not change the ContourGenerator.
+    z.mask = True
+    util_test.assert_equal_recursive(expected, cont_gen.filled(2.5, 7.5))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_output_dtype(name: str, xyz_3x3_as_lists: tuple[list[list[int]], ...]) -> None:
+    cont_gen = contour_generator(*xyz_3x3_as_lists, name=name)
+    assert cont_gen.output_dtype == np.float64
+    for output_dtype in (np.float32, "float32", np.dtype(np.float32)):
+        cont_gen = contour_generator(*xyz_3x3_as_lists, name=name, output_dtype=output_dtype)
+        assert cont_gen.output_dtype == np.float32
+
+    with pytest.raises(ValueError, match="output_dtype must be float64 or float32, not int32"):
+        contour_generator(*xyz_3x3_as_lists, name=name, output_dtype=np.int32)
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_output_dtype_not_supported(
+    name: str, xyz_3x3_as_lists: tuple[list[list[int]], ...],
+) -> None:
+    cont_gen = contour_generator(*xyz_3x3_as_lists, name=name, output_dtype=np.float64)
+    assert cont_gen.output_dtype == np.float64
+    msg = f"{name} contour generator does not support output_dtype float32"
+    with pytest.raises(ValueError, match=msg):
+        contour_generator(*xyz_3x3_as_lists, name=name, output_dtype=np.float32)
@@ -1,6 +1,6 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
 import pytest
@@ -117,6 +117,80 @@ def test_convert_lines(
     util_test.assert_equal_recursive(converted, compare)
 
 
+@pytest.mark.parametrize("fill_type_to", FillType.__members__.values())
+@pytest.mark.parametrize("fill_type_from", FillType.__members__.values())
+def test_convert_filled_many_holes(fill_type_from: FillType, fill_type_to: FillType) -> None:
+    if (fill_type_from in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset) and
+        fill_type_to not in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset)):
+        pytest.skip()
+
+    # Random z produces many polygons with holes, some of which span chunk boundaries.
+    z = np.random.default_rng(2187).random((50, 60))
+    chunk_size = 0 if fill_type_from in (FillType.OuterCode, FillType.OuterOffset) else 17
+    cont_gen = contour_generator(z=z, fill_type=fill_type_from, chunk_size=chunk_size)
+    filled = cont_gen.filled(0.4, 0.6)
+    converted = convert_filled(filled, fill_type_from, fill_type_to)
+    util_test.assert_filled(converted, fill_type_to)
+
+    if (fill_type_to in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset) and
+        fill_type_from not in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset)):
+        # Polygon order differs if the relationship between outer boundaries and holes is not
+        # calculated, so compare with a fill type that does calculate it.
+        cont_gen = contour_generator(
+            z=z, fill_type=FillType.ChunkCombinedOffsetOffset, chunk_size=chunk_size)
+        compare = convert_filled(
+            cont_gen.filled(0.4, 0.6), FillType.ChunkCombinedOffsetOffset, fill_type_to)
+    else:
+        cont_gen = contour_generator(z=z, fill_type=fill_type_to, chunk_size=chunk_size)
+        compare = cont_gen.filled(0.4, 0.6)
+    util_test.assert_equal_recursive(converted, compare)
+
+
+@pytest.mark.parametrize("line_type_to", LineType.__members__.values())
+@pytest.mark.parametrize("line_type_from", LineType.__members__.values())
+def test_convert_lines_non_contiguous(line_type_from: LineType, line_type_to: LineType) -> None:
+    z = np.random.default_rng(2187).random((30, 40))
+    lines = contour_generator(z=z, line_type=line_type_from, chunk_size=11).lines(0.5)
+    expected = convert_lines(lines, line_type_from, line_type_to)
+
+    # Copies of all arrays that are not C-contiguous but have the same contents.
+    def non_contiguous(array: Any) -> Any:
+        if isinstance(array, np.ndarray):
+            doubled = np.repeat(array, 2, axis=0)
+            return doubled[::2]
+        elif isinstance(array, list):
+            return [non_contiguous(item) for item in array]
+        elif isinstance(array, tuple):
+            return tuple(non_contiguous(item) for item in array)
+        return array
+
+    converted = convert_lines(non_contiguous(lines), line_type_from, line_type_to)
+    util_test.assert_equal_recursive(converted, expected)
+
+
+@pytest.mark.parametrize("line_type_to", LineType.__members__.values())
+@pytest.mark.parametrize("line_type_from", LineType.__members__.values())
+def test_convert_lines_float32(line_type_from: LineType, line_type_to: LineType) -> None:
+    z = np.random.default_rng(2187).random((30, 40))
+    lines = contour_generator(
+        z=z, line_type=line_type_from, chunk_size=11, output_dtype=np.float32).lines(0.5)
+    lines64 = contour_generator(z=z, line_type=line_type_from, chunk_size=11).lines(0.5)
+    expected = convert_lines(lines64, line_type_from, line_type_to)
+
+    # Converted points are float32 like the input points.
+    def as_float32(array: Any) -> Any:
+        if isinstance(array, np.ndarray) and array.dtype == np.float64:
+            return array.astype(np.float32)
+        elif isinstance(array, list):
+            return [as_float32(item) for item in array]
+        elif isinstance(array, tuple):
+            return tuple(as_float32(item) for item in array)
+        return array
+
+    converted = convert_lines(lines, line_type_from, line_type_to)
+    util_test.assert_equal_recursive(converted, as_float32(expected))
+
+
 @pytest.mark.parametrize("fill_type_to", FillType.__members__.values())
 @pytest.mark.parametrize("fill_type_from", FillType.__members__.values())
 @pytest.mark.parametrize("chunk_size", (0, 2))
@@ -181,6 +181,39 @@ def test_dechunk_lines_empty(z: cpy.CoordinateArray, line_type: LineType, chunk_
         raise RuntimeError(f"Unexpected line_type {line_type}")
 
 
+@pytest.mark.parametrize("line_type", [LineType.ChunkCombinedCode, LineType.ChunkCombinedOffset,
+                                       LineType.ChunkCombinedNan])
+def test_dechunk_lines_single_non_empty_chunk(line_type: LineType) -> None:
+    # Only the first chunk contains any lines.
+    z = np.zeros((5, 5))
+    z[1, 1] = 1.0
+    cont_gen = contour_generator(z=z, line_type=line_type, chunk_size=2)
+    lines = cont_gen.lines(0.5)
+    assert sum(points is not None for points in lines[0]) == 1
+    chunk = next(i for i, points in enumerate(lines[0]) if points is not None)
+
+    dechunked = dechunk_lines(lines, line_type)
+    util_test.assert_lines(dechunked, line_type)
+    for dechunked_list, chunk_list in zip(dechunked, lines):
+        assert len(dechunked_list) == 1
+        assert dechunked_list[0] is chunk_list[chunk]
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+def test_dechunk_filled_float32(z: cpy.CoordinateArray, fill_type: FillType) -> None:
+    filled = contour_generator(
+        z=z, fill_type=fill_type, chunk_size=2, output_dtype=np.float32).filled(0.5, 1.5)
+    filled64 = contour_generator(z=z, fill_type=fill_type, chunk_size=2).filled(0.5, 1.5)
+    dechunked = dechunk_filled(filled, fill_type)
+    expected = dechunk_filled(filled64, fill_type)
+    for points, points64 in zip(dechunked[0], expected[0]):
+        assert points is not None and points64 is not None
+        assert points.dtype == np.float32
+        assert_array_equal(points, points64.astype(np.float32))
+    for arrays, arrays64 in zip(dechunked[1:], expected[1:]):
+        util_test.assert_equal_recursive(arrays, arrays64)
+
+
 @pytest.mark.parametrize("fill_type", FillType.__members__.values())
 @pytest.mark.parametrize("chunk_size", (0, 2))
 def test_dechunk_multi_filled(z: cpy.CoordinateArray, fill_type: FillType, chunk_size: int) -> None:
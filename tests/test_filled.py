@@ -3,13 +3,20 @@ from __future__ import annotations
 from functools import reduce
 from itertools import pairwise
 from operator import add
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
 from numpy.testing import assert_allclose, assert_array_equal
 import pytest
 
-from contourpy import FillType, contour_generator, max_threads
+from contourpy import (
+    FillType,
+    SerialContourGenerator,
+    ThreadedContourGenerator,
+    contour_generator,
+    convert_filled,
+    max_threads,
+)
 from contourpy.util.data import random, simple
 
 from . import util_test
@@ -1042,3 +1049,195 @@ def test_multi_filled_levels_type(name: str, fill_type: FillType, corner_mask: b
     # Slice of larger numpy array.
     levels2 = np.array([1.5, 2, 2.5, 3, 3.5, 4, 4.5])
     util_test.assert_equal_recursive(reference, cont_gen.multi_filled(levels2[1::2]))
+
+
+@pytest.mark.parametrize("name, fill_type", util_test.all_names_and_fill_types())
+@pytest.mark.parametrize("chunk_size", [0, 7])
+@pytest.mark.parametrize("quad_as_tri", [False, True])
+def test_multi_filled_many_levels(
+    name: str, fill_type: FillType, chunk_size: int, quad_as_tri: bool,
+) -> None:
+    # Grid wide enough for multi_filled to use multiple blocks of level indices per row.
+    if quad_as_tri and name not in util_test.quad_as_tri_names():
+        pytest.skip()
+
+    x, y, z = simple((40, 90), want_mask=True)
+    cont_gen = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_size=chunk_size, quad_as_tri=quad_as_tri)
+    levels = np.linspace(-1.0, 1.0, 21)
+
+    reference = [cont_gen.filled(lower, upper) for lower, upper in pairwise(levels)]
+    util_test.assert_equal_recursive(reference, cont_gen.multi_filled(levels))
+
+
+@pytest.mark.threads
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("chunk_size", [0, 7])
+@pytest.mark.parametrize("thread_count", util_test.thread_counts())
+def test_multi_filled_threads(fill_type: FillType, chunk_size: int, thread_count: int) -> None:
+    # More levels than threads so levels are contoured in parallel, giving identical results to
+    # serial even for a single chunk.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = np.linspace(0.0, 1.0, 11)
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", fill_type=fill_type, chunk_size=chunk_size,
+        thread_count=thread_count)
+    ref_gen = contour_generator(x, y, z, name="serial", fill_type=fill_type, chunk_size=chunk_size)
+    util_test.assert_equal_recursive(ref_gen.multi_filled(levels), cont_gen.multi_filled(levels))
+
+
+@pytest.mark.threads
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("thread_count", util_test.thread_counts())
+def test_filled_threads_chunk_order(fill_type: FillType, thread_count: int) -> None:
+    # Chunks are processed in parallel but returned in chunk order, the same as serial.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", fill_type=fill_type, chunk_size=4, thread_count=thread_count)
+    ref_gen = contour_generator(x, y, z, name="serial", fill_type=fill_type, chunk_size=4)
+    for _ in range(3):
+        util_test.assert_equal_recursive(ref_gen.filled(0.3, 0.6), cont_gen.filled(0.3, 0.6))
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_update_z(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = [0.2, 0.4, 0.5, 0.8]
+    cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    cont_gen.filled(0.3, 0.6)
+    cont_gen.multi_filled(levels)
+
+    rng = np.random.default_rng(2187)
+    z = z.copy()
+    for row_slice, col_slice in [(slice(3, 8), slice(10, 20)), (slice(25, None), slice(None, 4))]:
+        patch = rng.random(z[row_slice, col_slice].shape)
+        np.ma.getdata(z)[row_slice, col_slice] = patch  # Mask is unchanged.
+        cont_gen.update_z(patch, row_slice, col_slice)
+
+        ref_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_size=6)
+        filled = cont_gen.filled(0.3, 0.6)
+        util_test.assert_equal_recursive(ref_gen.filled(0.3, 0.6), filled)
+        util_test.assert_equal_recursive(
+            ref_gen.multi_filled(levels), cont_gen.multi_filled(levels))
+
+        if fill_type not in (FillType.OuterCode, FillType.OuterOffset):
+            # Chunk results are shared between calls.
+            assert all(not array.flags.writeable for array in filled[0] if array is not None)
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_set_z(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = [0.2, 0.4, 0.5, 0.8]
+    cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    cont_gen.set_result_cache_size(1_000_000)
+    cont_gen.filled(0.3, 0.6)
+    cont_gen.update_z(np.full((2, 2), 0.5), slice(0, 2), slice(0, 2))
+    cont_gen.multi_filled(levels)
+
+    rng = np.random.default_rng(2187)
+    mask = np.ma.getmaskarray(z)
+    new_mask = mask.copy()
+    new_mask[10:15, 20:30] = True
+    z_frames: list[Any] = [
+        np.ma.array(rng.random(z.shape), mask=mask),  # Mask unchanged.
+        np.ma.array(rng.random(z.shape), mask=new_mask),
+        rng.random(z.shape),  # No mask.
+        np.where(mask, np.nan, rng.random(z.shape)).astype(np.float32),  # Original mask.
+        np.where(mask, np.inf, rng.random(z.shape)).tolist(),  # Original mask.
+    ]
+    for z_frame in z_frames:
+        cont_gen.set_z(z_frame)
+        ref_gen = contour_generator(x, y, z_frame, name=name, fill_type=fill_type, chunk_size=6)
+        util_test.assert_equal_recursive(ref_gen.filled(0.3, 0.6), cont_gen.filled(0.3, 0.6))
+        util_test.assert_equal_recursive(
+            ref_gen.multi_filled(levels), cont_gen.multi_filled(levels))
+
+
+@pytest.mark.parametrize("quad_as_tri", [False, True])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_xy_1d(name: str, quad_as_tri: bool) -> None:
+    # 1D x and y are used directly without broadcasting them to 2D, giving identical results.
+    _, _, z = random((30, 40), mask_fraction=0.05)
+    x = np.cumsum(np.linspace(0.5, 1.5, 40))
+    y = np.cumsum(np.linspace(1.5, 0.5, 30))
+    x2d, y2d = np.meshgrid(x, y)
+    levels = [0.2, 0.5, 0.8]
+    for fill_type in FillType.__members__.values():
+        cont_gen = contour_generator(
+            x, y, z, name=name, fill_type=fill_type, chunk_size=7, quad_as_tri=quad_as_tri)
+        ref_gen = contour_generator(
+            x2d, y2d, z, name=name, fill_type=fill_type, chunk_size=7, quad_as_tri=quad_as_tri)
+        util_test.assert_equal_recursive(
+            ref_gen.multi_filled(levels), cont_gen.multi_filled(levels))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_bounds(name: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    bounds = (3, 9, 10, 20)  # Chunks 1, 2, 3, 8, 9 and 10.
+    region_chunks = [1, 2, 3, 8, 9, 10]
+    for fill_type in (FillType.ChunkCombinedCode, FillType.ChunkCombinedOffset,
+                      FillType.ChunkCombinedCodeOffset, FillType.ChunkCombinedOffsetOffset):
+        cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_size=6)
+        assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+        expected = cast("tuple[list[Any], ...]", cont_gen.filled(0.3, 0.6))
+        filled = cast("tuple[list[Any], ...]", cont_gen.filled(0.3, 0.6, bounds=bounds))
+        for chunk in range(cont_gen.chunk_count[0]*cont_gen.chunk_count[1]):
+            for item, item_expected in zip(filled, expected):
+                if chunk in region_chunks:
+                    util_test.assert_equal_recursive(item_expected[chunk], item[chunk])
+                else:
+                    assert item[chunk] is None
+
+    for fill_type, chunked_fill_type in (
+        (FillType.OuterCode, FillType.ChunkCombinedCodeOffset),
+        (FillType.OuterOffset, FillType.ChunkCombinedOffsetOffset),
+    ):
+        cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_size=6)
+        assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+        ref_gen = contour_generator(x, y, z, name=name, fill_type=chunked_fill_type, chunk_size=6)
+        assert isinstance(ref_gen, (SerialContourGenerator, ThreadedContourGenerator))
+        expected = convert_filled(
+            ref_gen.filled(0.3, 0.6, bounds=bounds), chunked_fill_type, fill_type)
+        util_test.assert_equal_recursive(expected, cont_gen.filled(0.3, 0.6, bounds=bounds))
+
+    cont_gen = contour_generator(x, y, z, name=name, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    util_test.assert_equal_recursive(
+        cont_gen.filled(0.3, 0.6), cont_gen.filled(0.3, 0.6, bounds=(0, 30, 0, 40)))
+    with pytest.raises(ValueError, match="bounds must be None or a tuple of"):
+        cont_gen.filled(0.3, 0.6, bounds=(0, 1))  # type: ignore[arg-type]
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_filled_chunks(name: str, fill_type: FillType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, fill_type=fill_type, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    expected = cast("tuple[list[Any], ...]", cont_gen.filled(0.3, 0.6))
+    n_chunks = cont_gen.chunk_count[0]*cont_gen.chunk_count[1]
+
+    # Contour chunks in two interleaved subsets, the second in decreasing order with duplicates.
+    first = cast("tuple[list[Any], ...]", cont_gen.filled(0.3, 0.6, chunks=range(0, n_chunks, 2)))
+    second = cast(
+        "tuple[list[Any], ...]",
+        cont_gen.filled(0.3, 0.6, chunks=[3, 1, 3, *range(1, n_chunks, 2)[::-1]]))
+    if fill_type in (FillType.OuterCode, FillType.OuterOffset):
+        assert len(first[0]) + len(second[0]) == len(expected[0])
+    else:
+        for chunk in range(n_chunks):
+            for item, item_first, item_second in zip(expected, first, second):
+                if chunk % 2 == 0:
+                    assert item_second[chunk] is None
+                    util_test.assert_equal_recursive(item[chunk], item_first[chunk])
+                else:
+                    assert item_first[chunk] is None
+                    util_test.assert_equal_recursive(item[chunk], item_second[chunk])
+
+    util_test.assert_equal_recursive(expected, cont_gen.filled(0.3, 0.6, chunks=range(n_chunks)))
@@ -206,3 +206,16 @@ def test_write_cache(cls: type[ContourGenerator], xyz_mask: XYZMask) -> None:
         "j=0 ....00....... ...n00....... \n" \
         "    i=0           i=1           \n" \
         "---------------------------\n"
+
+
+@pytest.mark.parametrize("cls", [SerialContourGenerator, ThreadedContourGenerator])
+def test_xy_1d(cls: type[ContourGenerator]) -> None:
+    z = [[1, 2, 3], [4, 5, 6]]
+    kwargs = default_kwargs(cls)
+    cls([0, 1, 2], [0, 1], z, None, **kwargs)
+
+    msg = "1D x and y arrays must have lengths matching the number of columns and rows of z"
+    with pytest.raises(ValueError, match=msg):
+        cls([0, 1], [0, 1], z, None, **kwargs)
+    with pytest.raises(ValueError, match=msg):
+        cls([0, 1, 2], [0, 1, 2], z, None, **kwargs)
@@ -1,12 +1,19 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING, cast
+from typing import TYPE_CHECKING, Any, cast
 
 import numpy as np
 from numpy.testing import assert_allclose, assert_array_equal
 import pytest
 
-from contourpy import LineType, contour_generator, max_threads
+from contourpy import (
+    LineType,
+    SerialContourGenerator,
+    ThreadedContourGenerator,
+    contour_generator,
+    convert_lines,
+    max_threads,
+)
 from contourpy.util.data import random, simple
 
 from . import util_test
@@ -875,3 +882,192 @@ def test_multi_lines_levels_type(name: str, line_type: LineType, corner_mask: bo
     # Slice of larger numpy array.
     levels2 = np.array([1.5, 2, 2.5, 3, 3.5])
     util_test.assert_equal_recursive(reference, cont_gen.multi_lines(levels2[1::2]))
+
+
+@pytest.mark.threads
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("chunk_size", [0, 7])
+@pytest.mark.parametrize("thread_count", util_test.thread_counts())
+def test_multi_lines_threads(line_type: LineType, chunk_size: int, thread_count: int) -> None:
+    # More levels than threads so levels are contoured in parallel, giving identical results to
+    # serial even for a single chunk.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = np.linspace(0.0, 1.0, 11)
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", line_type=line_type, chunk_size=chunk_size,
+        thread_count=thread_count)
+    ref_gen = contour_generator(x, y, z, name="serial", line_type=line_type, chunk_size=chunk_size)
+    util_test.assert_equal_recursive(ref_gen.multi_lines(levels), cont_gen.multi_lines(levels))
+
+
+@pytest.mark.threads
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("thread_count", util_test.thread_counts())
+def test_lines_threads_chunk_order(line_type: LineType, thread_count: int) -> None:
+    # Chunks are processed in parallel but returned in chunk order, the same as serial.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", line_type=line_type, chunk_size=4, thread_count=thread_count)
+    ref_gen = contour_generator(x, y, z, name="serial", line_type=line_type, chunk_size=4)
+    for _ in range(3):
+        util_test.assert_equal_recursive(ref_gen.lines(0.5), cont_gen.lines(0.5))
+
+
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_update_z(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = [0.2, 0.4, 0.5, 0.8]
+    cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    cont_gen.lines(0.5)
+    cont_gen.multi_lines(levels)
+
+    rng = np.random.default_rng(2187)
+    z = z.copy()
+    for row_slice, col_slice in [(slice(3, 8), slice(10, 20)), (slice(25, None), slice(None, 4))]:
+        patch = rng.random(z[row_slice, col_slice].shape)
+        np.ma.getdata(z)[row_slice, col_slice] = patch  # Mask is unchanged.
+        cont_gen.update_z(patch, row_slice, col_slice)
+
+        ref_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_size=6)
+        lines = cont_gen.lines(0.5)
+        util_test.assert_equal_recursive(ref_gen.lines(0.5), lines)
+        util_test.assert_equal_recursive(ref_gen.multi_lines(levels), cont_gen.multi_lines(levels))
+
+        if line_type not in (LineType.Separate, LineType.SeparateCode):
+            # Chunk results are shared between calls.
+            assert all(not array.flags.writeable for array in lines[0] if array is not None)
+
+
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_set_z(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = [0.2, 0.4, 0.5, 0.8]
+    cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    cont_gen.set_result_cache_size(1_000_000)
+    cont_gen.lines(0.5)
+    cont_gen.update_z(np.full((2, 2), 0.5), slice(0, 2), slice(0, 2))
+    cont_gen.multi_lines(levels)
+
+    rng = np.random.default_rng(2187)
+    mask = np.ma.getmaskarray(z)
+    new_mask = mask.copy()
+    new_mask[10:15, 20:30] = True
+    z_frames: list[Any] = [
+        np.ma.array(rng.random(z.shape), mask=mask),  # Mask unchanged.
+        np.ma.array(rng.random(z.shape), mask=new_mask),
+        rng.random(z.shape),  # No mask.
+        np.where(mask, np.nan, rng.random(z.shape)).astype(np.float32),  # Original mask.
+        np.where(mask, np.inf, rng.random(z.shape)).tolist(),  # Original mask.
+    ]
+    for z_frame in z_frames:
+        cont_gen.set_z(z_frame)
+        ref_gen = contour_generator(x, y, z_frame, name=name, line_type=line_type, chunk_size=6)
+        util_test.assert_equal_recursive(ref_gen.lines(0.5), cont_gen.lines(0.5))
+        util_test.assert_equal_recursive(ref_gen.multi_lines(levels), cont_gen.multi_lines(levels))
+
+
+@pytest.mark.parametrize("quad_as_tri", [False, True])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_xy_1d(name: str, quad_as_tri: bool) -> None:
+    # 1D x and y are used directly without broadcasting them to 2D, giving identical results.
+    _, _, z = random((30, 40), mask_fraction=0.05)
+    x = np.cumsum(np.linspace(0.5, 1.5, 40))
+    y = np.cumsum(np.linspace(1.5, 0.5, 30))
+    x2d, y2d = np.meshgrid(x, y)
+    levels = [0.2, 0.5, 0.8]
+    for line_type in LineType.__members__.values():
+        cont_gen = contour_generator(
+            x, y, z, name=name, line_type=line_type, chunk_size=7, quad_as_tri=quad_as_tri)
+        ref_gen = contour_generator(
+            x2d, y2d, z, name=name, line_type=line_type, chunk_size=7, quad_as_tri=quad_as_tri)
+        util_test.assert_equal_recursive(ref_gen.multi_lines(levels), cont_gen.multi_lines(levels))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_z_layout(name: str) -> None:
+    # float64 and float32 z with any memory layout are used without copying, giving the same
+    # results as a C-contiguous float64 copy.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    z_data = np.ma.getdata(z)
+    mask = np.ma.getmask(z)
+    levels = [0.2, 0.5, 0.8]
+    z_others = [
+        np.asfortranarray(z_data), z_data[::-1][::-1], np.repeat(z_data, 2, axis=1)[:, ::2],
+        z_data.astype(np.float32)]
+    for z_other in z_others:
+        cont_gen = contour_generator(
+            x, y, np.ma.array(z_other, mask=mask), name=name, chunk_size=7, copy=False)
+        ref_gen = contour_generator(
+            x, y, np.ma.array(np.ascontiguousarray(z_other, dtype=np.float64), mask=mask),
+            name=name, chunk_size=7)
+        util_test.assert_equal_recursive(ref_gen.multi_lines(levels), cont_gen.multi_lines(levels))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_bounds(name: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    bounds = (3, 9, 10, 20)  # Chunks 1, 2, 3, 8, 9 and 10.
+    region_chunks = [1, 2, 3, 8, 9, 10]
+    for line_type in (LineType.ChunkCombinedCode, LineType.ChunkCombinedOffset,
+                      LineType.ChunkCombinedNan):
+        cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_size=6)
+        assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+        expected = cont_gen.lines(0.5)
+        lines = cont_gen.lines(0.5, bounds=bounds)
+        for chunk in range(cont_gen.chunk_count[0]*cont_gen.chunk_count[1]):
+            for item, item_expected in zip(lines, expected):
+                if chunk in region_chunks:
+                    util_test.assert_equal_recursive(item_expected[chunk], item[chunk])
+                else:
+                    assert item[chunk] is None
+
+    for line_type, chunked_line_type in ((LineType.Separate, LineType.ChunkCombinedOffset),
+                                         (LineType.SeparateCode, LineType.ChunkCombinedCode)):
+        cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_size=6)
+        assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+        ref_gen = contour_generator(x, y, z, name=name, line_type=chunked_line_type, chunk_size=6)
+        assert isinstance(ref_gen, (SerialContourGenerator, ThreadedContourGenerator))
+        expected = convert_lines(ref_gen.lines(0.5, bounds=bounds), chunked_line_type, line_type)
+        util_test.assert_equal_recursive(expected, cont_gen.lines(0.5, bounds=bounds))
+
+    # Negative indices and regions beyond the domain are treated as for slices.
+    cont_gen = contour_generator(x, y, z, name=name, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    util_test.assert_equal_recursive(
+        cont_gen.lines(0.5, bounds=(-5, 100, 30, 40)), cont_gen.lines(0.5, bounds=(25, 30, 30, 40)))
+    util_test.assert_equal_recursive(cont_gen.lines(0.5), cont_gen.lines(0.5, bounds=None))
+    util_test.assert_equal_recursive(
+        cont_gen.lines(0.5), cont_gen.lines(0.5, bounds=(0, 30, 0, 40)))
+
+
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_lines_chunks(name: str, line_type: LineType) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, line_type=line_type, chunk_size=6)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    expected = cont_gen.lines(0.5)
+    n_chunks = cont_gen.chunk_count[0]*cont_gen.chunk_count[1]
+
+    # Contour chunks in two interleaved subsets, the second in decreasing order with duplicates.
+    first = cont_gen.lines(0.5, chunks=range(0, n_chunks, 2))
+    second = cont_gen.lines(0.5, chunks=[3, 1, 3, *range(1, n_chunks, 2)[::-1]])
+    if line_type == LineType.Separate:
+        assert len(first) + len(second) == len(expected)
+    elif line_type == LineType.SeparateCode:
+        assert len(first[0]) + len(second[0]) == len(expected[0])
+    else:
+        for chunk in range(n_chunks):
+            for item, item_first, item_second in zip(expected, first, second):
+                if chunk % 2 == 0:
+                    assert item_second[chunk] is None
+                    util_test.assert_equal_recursive(item[chunk], item_first[chunk])
+                else:
+                    assert item_first[chunk] is None
+                    util_test.assert_equal_recursive(item[chunk], item_second[chunk])
+
+    util_test.assert_equal_recursive(expected, cont_gen.lines(0.5, chunks=range(n_chunks)))
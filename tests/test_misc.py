@@ -1,14 +1,32 @@
 from __future__ import annotations
 
-from typing import TYPE_CHECKING
+from concurrent.futures import ThreadPoolExecutor
+from typing import TYPE_CHECKING, Any
 
 import numpy as np
+import pytest
 
-from contourpy import _remove_z_mask, contour_generator
+from contourpy import (
+    FillType,
+    LineType,
+    SerialContourGenerator,
+    ThreadedContourGenerator,
+    _remove_z_mask,
+    contour_generator,
+    max_threads,
+    set_thread_pool_size,
+    shutdown_thread_pool,
+    thread_pool_size,
+)
+from contourpy.util.data import random
+
+from . import util_test
 
 if TYPE_CHECKING:
     from numpy.typing import ArrayLike
 
+    from contourpy import ContourGenerator
+
 
 def test_nan() -> None:
     # Test that the nan used by contourpy is numpy.nan.
@@ -56,3 +74,515 @@ def test_remove_z_mask() -> None:
     assert isinstance(mask, np.ndarray)
     assert mask.dtype == bool
     np.testing.assert_array_equal(mask, [[True, False], [False, True]])
+
+    # float64 and float32 arrays with any memory layout are not copied.
+    for zarr in (np.asfortranarray(zlist), np.asarray(zlist, dtype=np.float32)):
+        zz, mask = _remove_z_mask(zarr)
+        assert zz is zarr
+        assert mask is None
+
+    # Sum overflows but there are no invalid values.
+    zz, mask = _remove_z_mask([[1e308, 1e308], [1.0, 2.0]])
+    assert mask is None
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_python_threads(name: str) -> None:
+    # Multiple ContourGenerators used concurrently from different Python threads, which is possible
+    # as the GIL is released during contour calculation.
+    n_generators = 4
+    cont_gens = []
+    for seed in range(n_generators):
+        x, y, z = random((30, 40), mask_fraction=0.05, seed=seed)
+        cont_gens.append(contour_generator(
+            x, y, z, name=name, line_type="ChunkCombinedOffset",
+            fill_type="ChunkCombinedOffsetOffset", chunk_count=2))
+
+    def calc(cont_gen: ContourGenerator) -> tuple[Any, ...]:
+        return cont_gen.multi_lines([0.2, 0.5, 0.8]), cont_gen.multi_filled([0.2, 0.5, 0.8])
+
+    expected = [calc(cont_gen) for cont_gen in cont_gens]
+
+    with ThreadPoolExecutor(max_workers=n_generators) as executor:
+        results = list(executor.map(calc, cont_gens))
+
+    for result, expect in zip(results, expected):
+        for multi_result, multi_expect in zip(result, expect):
+            for level_result, level_expect in zip(multi_result, multi_expect):
+                for array_list_result, array_list_expect in zip(level_result, level_expect):
+                    for array_result, array_expect in zip(array_list_result, array_list_expect):
+                        np.testing.assert_array_equal(array_result, array_expect)
+
+
+def test_thread_pool_size() -> None:
+    default_size = thread_pool_size()
+    assert default_size == max(max_threads() - 1, 0)
+
+    try:
+        set_thread_pool_size(5)
+        assert thread_pool_size() == 5
+        set_thread_pool_size(0)
+        assert thread_pool_size() == 0
+
+        with pytest.raises(ValueError, match="Thread pool size must be non-negative"):
+            set_thread_pool_size(-1)
+        assert thread_pool_size() == 0
+    finally:
+        set_thread_pool_size(default_size)
+
+
+@pytest.mark.threads
+@pytest.mark.parametrize("pool_size", [0, 1, 4])
+def test_thread_pool_reuse(pool_size: int) -> None:
+    # Threads are reused between calls, or created for each call if the pool is too small or has
+    # been shut down.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    levels = [0.2, 0.5, 0.8]
+    expected = contour_generator(
+        x, y, z, name="serial", line_type="ChunkCombinedOffset", chunk_count=4).multi_lines(levels)
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", line_type="ChunkCombinedOffset", chunk_count=4)
+
+    default_size = thread_pool_size()
+    try:
+        set_thread_pool_size(pool_size)
+        for i in range(6):
+            if i == 3:
+                shutdown_thread_pool()
+            for level, level_expected in zip(levels, expected):
+                lines = cont_gen.lines(level)
+                for array_list, array_list_expected in zip(lines, level_expected):
+                    for array, array_expected in zip(array_list, array_list_expected):
+                        np.testing.assert_array_equal(array, array_expected)
+    finally:
+        set_thread_pool_size(default_size)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_update_z_invalid(name: str) -> None:
+    z = np.arange(20.0).reshape(4, 5)
+    cont_gen = contour_generator(z=z, name=name, chunk_count=2)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+
+    with pytest.raises(ValueError, match="z_patch must be a 2D array with shape matching"):
+        cont_gen.update_z(np.zeros((2, 3)), slice(0, 2), slice(0, 2))
+    with pytest.raises(ValueError, match="row_slice and col_slice must have a step of 1"):
+        cont_gen.update_z(np.zeros((2, 2)), slice(0, 4, 2), slice(0, 2))
+    for invalid in (np.nan, np.inf, -np.inf):
+        with pytest.raises(ValueError, match="z_patch cannot contain NaN or infinity"):
+            cont_gen.update_z(np.full((2, 2), invalid), slice(0, 2), slice(0, 2))
+
+    # z passed to the ContourGenerator is not modified.
+    cont_gen.update_z(np.zeros((2, 2)), slice(0, 2), slice(0, 2))
+    np.testing.assert_array_equal(z, np.arange(20.0).reshape(4, 5))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_set_z_invalid(name: str) -> None:
+    z = np.arange(20.0).reshape(4, 5) + 1.0
+    cont_gen = contour_generator(z=z, name=name, chunk_count=2, z_interp="Log")
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    lines = cont_gen.lines(5.5)
+
+    msg = "z must be a 2D array with the same shape as the current z"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.set_z(np.zeros((5, 4)))
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.set_z(np.ma.array(np.zeros(20)))
+    msg = "z values must be positive if using ZInterp.Log"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.set_z(z - 5.0)
+
+    # Invalid z is not used, and negative z is allowed if it is masked.
+    util_test.assert_equal_recursive(cont_gen.lines(5.5), lines)
+    cont_gen.set_z(np.ma.masked_less_equal(z - 5.0, 0.0))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_result_cache(name: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, chunk_count=2)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    ref_gen = contour_generator(x, y, z, name=name, chunk_count=2)
+    assert cont_gen.result_cache_info() == {
+        "hits": 0, "misses": 0, "entries": 0, "nbytes": 0, "max_nbytes": 0}
+
+    cont_gen.set_result_cache_size(10**7)
+    for _ in range(2):
+        filled = cont_gen.filled(0.3, 0.6)
+        util_test.assert_equal_recursive(ref_gen.filled(0.3, 0.6), filled)
+        util_test.assert_equal_recursive(ref_gen.multi_lines([0.2, 0.5]),
+                                         cont_gen.multi_lines([0.2, 0.5]))
+    info = cont_gen.result_cache_info()
+    assert info["hits"] == 3
+    assert info["misses"] == 3
+    assert info["entries"] == 3
+    nbytes = info["nbytes"]
+    assert nbytes > 0
+
+    # Cached arrays are shared so are read-only, but the lists containing them are not shared.
+    assert all(array is not None and not array.flags.writeable for array in filled[0])
+    filled[0].clear()
+    assert len(cont_gen.filled(0.3, 0.6)[0]) > 0
+
+    # Least recently used result (lines at 0.2) is evicted first.
+    cont_gen.set_result_cache_size(nbytes - 1)
+    info = cont_gen.result_cache_info()
+    assert info["entries"] == 2
+    assert info["nbytes"] < nbytes
+    cont_gen.lines(0.5)
+    assert cont_gen.result_cache_info()["hits"] == 5
+
+    cont_gen.update_z(z[:2, :2], slice(0, 2), slice(0, 2))
+    assert cont_gen.result_cache_info()["entries"] == 0
+
+    cont_gen.clear_result_cache()
+    assert cont_gen.result_cache_info() == {
+        "hits": 0, "misses": 0, "entries": 0, "nbytes": 0, "max_nbytes": nbytes - 1}
+
+    cont_gen.set_result_cache_size(0)
+    cont_gen.lines(0.5)
+    assert cont_gen.result_cache_info()["misses"] == 0
+
+    with pytest.raises(ValueError, match="Result cache size must be non-negative"):
+        cont_gen.set_result_cache_size(-1)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_result_cache_key(name: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(x, y, z, name=name, chunk_count=2)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    cont_gen.set_result_cache_size(10**7)
+
+    # NaN levels never compare equal so are not cached.
+    for _ in range(3):
+        cont_gen.lines(np.nan)
+    assert cont_gen.result_cache_info() == {
+        "hits": 0, "misses": 0, "entries": 0, "nbytes": 0, "max_nbytes": 10**7}
+
+    # Lines only use the lower level, regardless of preceding filled calls.
+    cont_gen.lines(0.5)
+    cont_gen.filled(0.3, 0.6)
+    cont_gen.lines(0.5)
+    info = cont_gen.result_cache_info()
+    assert info["hits"] == 1
+    assert info["entries"] == 2
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_result_cache_not_supported(name: str) -> None:
+    # Accepted for consistency with the other algorithms, but nothing is cached.
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name)
+    cont_gen.set_result_cache_size(10**7)
+    lines = cont_gen.lines(0.5)
+    util_test.assert_equal_recursive(cont_gen.lines(0.5), lines)
+    assert cont_gen.result_cache_info() == {
+        "hits": 0, "misses": 0, "entries": 0, "nbytes": 0, "max_nbytes": 0}
+    cont_gen.clear_result_cache()
+
+    with pytest.raises(ValueError, match="Result cache size must be non-negative"):
+        cont_gen.set_result_cache_size(-1)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_reuse_output_buffers(name: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name=name, chunk_count=2, fill_type="ChunkCombinedOffsetOffset")
+    ref_gen = contour_generator(
+        x, y, z, name=name, chunk_count=2, fill_type="ChunkCombinedOffsetOffset")
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    assert not cont_gen.reuse_output_buffers
+
+    def shares_memory(filled0: Any, filled1: Any) -> bool:
+        return any(np.shares_memory(a, b) for a, b in zip(filled0[0], filled1[0]) if a is not None)
+
+    cont_gen.set_reuse_output_buffers(True)
+    assert cont_gen.reuse_output_buffers
+    filled = cont_gen.filled(0.3, 0.6)
+    util_test.assert_equal_recursive(ref_gen.filled(0.3, 0.6), filled)
+    filled_again = cont_gen.filled(0.3, 0.6)
+    assert shares_memory(filled, filled_again)
+    util_test.assert_equal_recursive(ref_gen.filled(0.3, 0.6), filled_again)
+    util_test.assert_equal_recursive(ref_gen.filled(0.1, 0.9), cont_gen.filled(0.1, 0.9))
+
+    # Each level of multi_filled uses its own buffers.
+    multi = cont_gen.multi_filled([0.2, 0.5, 0.8])
+    util_test.assert_equal_recursive(ref_gen.multi_filled([0.2, 0.5, 0.8]), multi)
+    assert not shares_memory(multi[0], multi[1])
+
+    # Not reused with the result cache.
+    cont_gen.set_result_cache_size(10**7)
+    assert not shares_memory(filled, cont_gen.filled(0.3, 0.6))
+    cont_gen.set_result_cache_size(0)
+    assert shares_memory(filled, cont_gen.filled(0.3, 0.6))
+
+    cont_gen.set_reuse_output_buffers(False)
+    assert not shares_memory(filled, cont_gen.filled(0.3, 0.6))
+
+    # Not reused after update_z.
+    cont_gen.set_reuse_output_buffers(True)
+    filled = cont_gen.filled(0.3, 0.6)
+    cont_gen.update_z(z[:2, :2], slice(0, 2), slice(0, 2))
+    assert not shares_memory(filled, cont_gen.filled(0.3, 0.6))
+    cont_gen.clear_output_buffers()
+
+
+@pytest.mark.threads
+def test_reuse_output_buffers_threaded_separate() -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    cont_gen = contour_generator(
+        x, y, z, name="threaded", chunk_count=2, line_type="Separate", thread_count=2)
+    ref_gen = contour_generator(
+        x, y, z, name="threaded", chunk_count=2, line_type="Separate", thread_count=2)
+    cont_gen.set_reuse_output_buffers(True)
+    lines = cont_gen.lines(0.5)
+    lines_again = cont_gen.lines(0.5)
+    assert np.shares_memory(lines[0], lines_again[0])
+    util_test.assert_equal_recursive(ref_gen.lines(0.5), lines_again)
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_reuse_output_buffers_not_supported(name: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name)
+    cont_gen.set_reuse_output_buffers(True)
+    assert not cont_gen.reuse_output_buffers
+    lines = cont_gen.lines(0.5)
+    assert not np.shares_memory(lines[0][0], cont_gen.lines(0.5)[0][0])
+    cont_gen.clear_output_buffers()
+
+
+@pytest.mark.parametrize("quad_as_tri", [False, True])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_single_pass(name: str, quad_as_tri: bool) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    for line_type in LineType.__members__.values():
+        ref_gen = contour_generator(
+            x, y, z, name=name, line_type=line_type, chunk_count=3, quad_as_tri=quad_as_tri)
+        cont_gen = contour_generator(
+            x, y, z, name=name, line_type=line_type, chunk_count=3, quad_as_tri=quad_as_tri)
+        assert not cont_gen.single_pass
+        cont_gen.set_single_pass(True)
+        assert cont_gen.single_pass
+        levels = [z.min(), 0.2, 0.5, 0.8]
+        util_test.assert_equal_recursive(ref_gen.multi_lines(levels), cont_gen.multi_lines(levels))
+
+    for fill_type in FillType.__members__.values():
+        ref_gen = contour_generator(
+            x, y, z, name=name, fill_type=fill_type, chunk_count=3, quad_as_tri=quad_as_tri)
+        cont_gen = contour_generator(
+            x, y, z, name=name, fill_type=fill_type, chunk_count=3, quad_as_tri=quad_as_tri)
+        cont_gen.set_single_pass(True)
+        levels = [-np.inf, 0.2, 0.5, 0.8, np.inf]
+        util_test.assert_equal_recursive(
+            ref_gen.multi_filled(levels), cont_gen.multi_filled(levels))
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_single_pass_not_supported(name: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name)
+    cont_gen.set_single_pass(True)
+    assert not cont_gen.single_pass
+
+
+@pytest.mark.parametrize("z_interp", ["Linear", "Log"])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_cache_quad_middles(name: str, z_interp: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    z = np.exp(3.0*z)
+    levels = [1.5, 2.0, 4.0, 10.0]
+    kwargs: dict[str, Any] = {
+        "name": name, "quad_as_tri": True, "z_interp": z_interp, "chunk_count": 3}
+    cont_gen = contour_generator(x, y, z, **kwargs)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    assert not cont_gen.cache_quad_middles
+    cont_gen.set_cache_quad_middles(True)
+    assert cont_gen.cache_quad_middles
+    assert cont_gen.quad_middles_nbytes == 0
+
+    ref_gen = contour_generator(x, y, z, **kwargs)
+    for _ in range(2):
+        util_test.assert_equal_recursive(cont_gen.multi_lines(levels), ref_gen.multi_lines(levels))
+        util_test.assert_equal_recursive(
+            cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+        util_test.assert_equal_recursive(cont_gen.lines(2.0), ref_gen.lines(2.0))
+        util_test.assert_equal_recursive(cont_gen.filled(2.0, 4.0), ref_gen.filled(2.0, 4.0))
+    assert cont_gen.quad_middles_nbytes == 3*z.size*8
+
+    # Cached z of quad middles are recalculated if z is changed.
+    z2 = np.ma.array(
+        np.exp(3.0*np.random.default_rng(2187).random(z.shape)), mask=np.ma.getmaskarray(z))
+    cont_gen.set_z(z2)
+    ref_gen = contour_generator(x, y, z2, **kwargs)
+    util_test.assert_equal_recursive(cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+
+    patch = np.full((3, 4), 3.0)
+    cont_gen.update_z(patch, slice(5, 8), slice(10, 14))
+    z2[5:8, 10:14] = patch
+    ref_gen = contour_generator(x, y, z2, **kwargs)
+    util_test.assert_equal_recursive(cont_gen.multi_lines(levels), ref_gen.multi_lines(levels))
+
+    cont_gen.set_cache_quad_middles(False)
+    assert not cont_gen.cache_quad_middles
+    assert cont_gen.quad_middles_nbytes == 0
+    util_test.assert_equal_recursive(cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+
+
+def test_cache_quad_middles_not_quad_as_tri() -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name="serial")
+    cont_gen.set_cache_quad_middles(True)
+    cont_gen.multi_lines([0.2, 0.5, 0.8])
+    assert cont_gen.quad_middles_nbytes == 0
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_cache_quad_middles_not_supported(name: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name)
+    cont_gen.set_cache_quad_middles(True)
+    assert not cont_gen.cache_quad_middles
+    cont_gen.multi_lines([0.2, 0.5, 0.8])
+    assert cont_gen.quad_middles_nbytes == 0
+
+
+@pytest.mark.parametrize("chunk_count", [1, 3])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_output_dtype_float32(name: str, chunk_count: int) -> None:
+    # float32 output is the float64 output cast to float32, for float32 and float64 inputs.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+
+    def as_float32(result: Any) -> Any:
+        if isinstance(result, list | tuple):
+            return type(result)(as_float32(item) for item in result)
+        if isinstance(result, np.ndarray) and result.dtype == np.float64:
+            return result.astype(np.float32)
+        return result
+
+    for xy_dtype in (np.float64, np.float32):
+        xs, ys = x.astype(xy_dtype), y.astype(xy_dtype)
+        for line_type in LineType.__members__.values():
+            ref_gen = contour_generator(
+                xs, ys, z, name=name, line_type=line_type, chunk_count=chunk_count)
+            cont_gen = contour_generator(
+                xs, ys, z, name=name, line_type=line_type, chunk_count=chunk_count,
+                output_dtype=np.float32)
+            levels = [0.2, 0.5, 0.8]
+            util_test.assert_equal_recursive(
+                as_float32(ref_gen.multi_lines(levels)), cont_gen.multi_lines(levels))
+
+        for fill_type in FillType.__members__.values():
+            ref_gen = contour_generator(
+                xs, ys, z, name=name, fill_type=fill_type, chunk_count=chunk_count)
+            cont_gen = contour_generator(
+                xs, ys, z, name=name, fill_type=fill_type, chunk_count=chunk_count,
+                output_dtype=np.float32)
+            levels = [0.2, 0.5, 0.8]
+            util_test.assert_equal_recursive(
+                as_float32(ref_gen.multi_filled(levels)), cont_gen.multi_filled(levels))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_float32_xyz_not_copied(name: str) -> None:
+    x, y, z = random((30, 40))
+    x, y, z = x.astype(np.float32), y.astype(np.float32), z.astype(np.float32)
+    cont_gen = contour_generator(x, y, z, name=name, line_type="ChunkCombinedCode")
+    ref_gen = contour_generator(x, y, z, name=name, line_type="ChunkCombinedCode", copy=True)
+
+    # Changing the float32 arrays changes the ContourGenerator.
+    x *= 2.0
+    y *= 3.0
+    z *= -1.0
+    util_test.assert_equal_recursive(ref_gen.lines(-0.5), ([None], [None]))
+    points = cont_gen.lines(-0.5)[0][0]
+    assert points is not None
+    assert points[:, 0].max() > 1.0
+    assert points[:, 1].max() > 2.0
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_bounds_invalid(name: str) -> None:
+    z = np.arange(20.0).reshape(4, 5)
+    cont_gen = contour_generator(z=z, name=name, chunk_count=2)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+
+    msg = r"bounds must be None or a tuple of 4 ints \(j0, j1, i0, i1\)"
+    for bounds in (1, "abcd", (0, 2, 0, 2.5), (0, 2, "0", 2), (0, True, 0, 2), (0, 2, None, 2)):
+        with pytest.raises(TypeError, match=msg):
+            cont_gen.lines(1.0, bounds=bounds)  # type: ignore[arg-type]
+        with pytest.raises(TypeError, match=msg):
+            cont_gen.filled(1.0, 2.0, bounds=bounds)  # type: ignore[arg-type]
+    for bounds in ((0, 2), (0, 2, 0, 2, 0)):
+        with pytest.raises(ValueError, match=msg):
+            cont_gen.lines(1.0, bounds=bounds)  # type: ignore[arg-type]
+
+    # NumPy integers are accepted.
+    util_test.assert_equal_recursive(
+        cont_gen.lines(1.0, bounds=(0, 2, 0, 2)),
+        cont_gen.lines(1.0, bounds=tuple(np.arange(4, dtype=np.int32)[[0, 2, 0, 2]])))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_chunks_invalid(name: str) -> None:
+    z = np.arange(20.0).reshape(4, 5)
+    cont_gen = contour_generator(z=z, name=name, chunk_count=2)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+
+    with pytest.raises(ValueError, match="chunks must be in the range 0 to"):
+        cont_gen.lines(1.0, chunks=[4])
+    with pytest.raises(ValueError, match="chunks must be in the range 0 to"):
+        cont_gen.filled(1.0, 2.0, chunks=[-1])
+    with pytest.raises(ValueError, match="bounds and chunks cannot both be specified"):
+        cont_gen.lines(1.0, bounds=(0, 2, 0, 2), chunks=[0])
+
+    msg = "chunks must be None or a sequence of ints"
+    for chunks in (1, "0", [True], [np.True_], [1.0], [None]):
+        with pytest.raises(TypeError, match=msg):
+            cont_gen.lines(1.0, chunks=chunks)  # type: ignore[arg-type]
+        with pytest.raises(TypeError, match=msg):
+            cont_gen.filled(1.0, 2.0, chunks=chunks)  # type: ignore[arg-type]
+
+    # NumPy integers are accepted.
+    util_test.assert_equal_recursive(
+        cont_gen.lines(1.0, chunks=[1, 2]), cont_gen.lines(1.0, chunks=list(np.arange(1, 3))))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_z_stack_invalid(name: str) -> None:
+    z = np.arange(20.0).reshape(4, 5) + 1.0
+    cont_gen = contour_generator(z=z, name=name)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+
+    msg = "z_stack must be a 3D array with the shape of z in its last two dimensions"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.multi_lines_stack(z, [1.0])
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.multi_filled_stack(np.zeros((2, 5, 4)), [1.0, 2.0])
+
+    msg = "z_stack cannot contain NaN or infinity at points that are not masked"
+    for value in (np.nan, np.inf, -np.inf):
+        z_stack = np.stack([z, z])
+        z_stack[1, 2, 3] = value
+        with pytest.raises(ValueError, match=msg):
+            cont_gen.multi_lines_stack(z_stack, [1.0])
+        with pytest.raises(ValueError, match=msg):
+            cont_gen.multi_filled_stack(z_stack.astype(np.float32), [1.0, 2.0])
+
+    # Non-finite values are allowed at masked points.
+    cont_gen = contour_generator(z=np.ma.masked_equal(z, z[2, 3]), name=name)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    z_stack = np.stack([z, z])
+    z_stack[:, 2, 3] = (np.nan, np.inf)
+    util_test.assert_equal_recursive(
+        cont_gen.multi_lines_stack(z_stack, [5.0]), [cont_gen.multi_lines([5.0])]*2)
+
+    cont_gen = contour_generator(z=z, name=name, z_interp="Log")
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    z_stack = np.stack([z, z - 5.0])
+    msg = "z values must be positive if using ZInterp.Log"
+    with pytest.raises(ValueError, match=msg):
+        cont_gen.multi_lines_stack(z_stack, [1.0])
@@ -0,0 +1,127 @@
+from __future__ import annotations
+
+from typing import Any
+
+import numpy as np
+import pytest
+
+from contourpy import (
+    FillType,
+    LineType,
+    ThreadedContourGenerator,
+    ZInterp,
+    contour_generator,
+    stacked_filled,
+    stacked_lines,
+    stacked_multi_filled,
+    stacked_multi_lines,
+)
+from contourpy.util.data import random
+
+from . import util_test
+
+
+def _z_stack(n_frames: int, mask_fraction: float) -> tuple[
+    np.ndarray, np.ndarray, np.ma.MaskedArray,
+]:
+    x, y, z = random((37, 53), mask_fraction=mask_fraction)
+    rng = np.random.default_rng(2187)
+    z_stack = np.ma.array([z + 0.2*rng.random(z.shape) for _ in range(n_frames)])
+    return x, y, z_stack
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("mask_fraction", [0.0, 0.05])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_stacked_multi_filled(name: str, mask_fraction: float, fill_type: FillType) -> None:
+    x, y, z_stack = _z_stack(6, mask_fraction)
+    levels = [0.2, 0.5, 0.8]
+    kwargs: dict[str, Any] = {"name": name, "fill_type": fill_type, "chunk_count": 2}
+    expected = [
+        contour_generator(x, y, z, **kwargs).multi_filled(levels) for z in z_stack]
+    multi_filled = stacked_multi_filled(x, y, z_stack, levels, **kwargs)
+    util_test.assert_equal_recursive(multi_filled, expected)
+
+    filled = stacked_filled(x, y, z_stack, 0.5, 0.8, **kwargs)
+    util_test.assert_equal_recursive(filled, [e[1] for e in expected])
+
+
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("mask_fraction", [0.0, 0.05])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_stacked_multi_lines(name: str, mask_fraction: float, line_type: LineType) -> None:
+    x, y, z_stack = _z_stack(6, mask_fraction)
+    levels = [0.2, 0.5, 0.8]
+    kwargs: dict[str, Any] = {"name": name, "line_type": line_type, "chunk_count": 2}
+    expected = [
+        contour_generator(x, y, z, **kwargs).multi_lines(levels) for z in z_stack]
+    multi_lines = stacked_multi_lines(x, y, z_stack, levels, **kwargs)
+    util_test.assert_equal_recursive(multi_lines, expected)
+
+    lines = stacked_lines(x, y, z_stack, 0.2, **kwargs)
+    util_test.assert_equal_recursive(lines, [e[0] for e in expected])
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_stacked_mask_changes(name: str) -> None:
+    # Frames 1 and 3 have a different mask and a NaN so are contoured together, frame 4 has an
+    # infinity so is contoured alone, and the other frames are contoured together.
+    x, y, z_stack = _z_stack(5, 0.05)
+    z_stack[[1, 3], 10:15, 20:30] = np.ma.masked
+    z_stack[[1, 3], 30, 5] = np.nan
+    z_stack[4, 0, 0] = np.inf
+    levels = [0.3, 0.6]
+    kwargs: dict[str, Any] = {
+        "name": name, "line_type": "ChunkCombinedOffset", "fill_type": "OuterOffset",
+        "chunk_count": 2,
+    }
+    if name == "threaded":
+        kwargs["thread_count"] = 4
+    expected_lines = [contour_generator(x, y, z, **kwargs).multi_lines(levels) for z in z_stack]
+    expected_filled = [contour_generator(x, y, z, **kwargs).multi_filled(levels) for z in z_stack]
+    util_test.assert_equal_recursive(stacked_multi_lines(x, y, z_stack, levels, **kwargs),
+                                     expected_lines)
+    util_test.assert_equal_recursive(stacked_multi_filled(x, y, z_stack, levels, **kwargs),
+                                     expected_filled)
+
+
+@pytest.mark.parametrize("thread_count", [1, 2, 8])
+def test_stacked_threaded_frames(thread_count: int) -> None:
+    # Many frames and a single chunk, so frames are contoured in parallel by the threaded
+    # ContourGenerator.
+    x, y, z_stack = _z_stack(12, 0.0)
+    levels = [0.3, 0.6]
+    kwargs: dict[str, Any] = {
+        "name": "threaded", "line_type": "Separate", "fill_type": "OuterCode",
+        "thread_count": thread_count,
+    }
+    expected_lines = [contour_generator(x, y, z, **kwargs).multi_lines(levels) for z in z_stack]
+    expected_filled = [contour_generator(x, y, z, **kwargs).multi_filled(levels) for z in z_stack]
+    cont_gen = contour_generator(x, y, z_stack[0], **kwargs)
+    assert isinstance(cont_gen, ThreadedContourGenerator)
+    util_test.assert_equal_recursive(cont_gen.multi_lines_stack(z_stack.data, levels),
+                                     expected_lines)
+    util_test.assert_equal_recursive(cont_gen.multi_filled_stack(z_stack.data, levels),
+                                     expected_filled)
+    # The ContourGenerator's own z is unchanged.
+    util_test.assert_equal_recursive(cont_gen.multi_lines(levels), expected_lines[0])
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_stacked_z_interp_log(name: str) -> None:
+    x, y, z_stack = _z_stack(3, 0.0)
+    z_stack = np.exp(z_stack)
+    levels = [1.5, 2.0]
+    kwargs: dict[str, Any] = {
+        "name": name, "z_interp": ZInterp.Log, "line_type": "ChunkCombinedOffset"}
+    expected = [contour_generator(x, y, z, **kwargs).multi_lines(levels) for z in z_stack]
+    util_test.assert_equal_recursive(stacked_multi_lines(x, y, z_stack, levels, **kwargs),
+                                     expected)
+
+
+def test_stacked_invalid() -> None:
+    z_stack = np.ones((2, 3, 4))
+    with pytest.raises(TypeError, match="Input z must be 3D, not 2D"):
+        stacked_lines(None, None, z_stack[0], 0.5)
+    with pytest.raises(ValueError, match="mpl2014 contour generator does not support stacked z"):
+        stacked_lines(None, None, z_stack, 0.5, name="mpl2014")
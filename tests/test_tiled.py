@@ -0,0 +1,125 @@
+from __future__ import annotations
+
+from typing import TYPE_CHECKING, cast
+
+import numpy as np
+import pytest
+
+from contourpy import (
+    FillType,
+    LineType,
+    contour_generator,
+    tiled_filled,
+    tiled_lines,
+    tiled_multi_filled,
+    tiled_multi_lines,
+)
+from contourpy.util.data import random
+
+from . import util_test
+
+if TYPE_CHECKING:
+    from pathlib import Path
+
+    from contourpy._contourpy import LineReturn_ChunkCombinedCode, LineReturn_Separate
+
+
+@pytest.mark.parametrize("fill_type", FillType.__members__.values())
+@pytest.mark.parametrize("tile_size", [(10, 12), 7, 100])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_tiled_multi_filled(
+    name: str, tile_size: int | tuple[int, int], fill_type: FillType,
+) -> None:
+    x, y, z = random((37, 53), mask_fraction=0.05)
+    levels = [0.2, 0.5, 0.8]
+    expected = contour_generator(
+        x, y, z, name=name, fill_type=fill_type, chunk_size=tile_size).multi_filled(levels)
+    multi_filled = tiled_multi_filled(
+        x, y, z, levels, tile_size=tile_size, name=name, fill_type=fill_type)
+    util_test.assert_equal_recursive(multi_filled, expected)
+
+    filled = tiled_filled(x, y, z, 0.2, 0.5, tile_size=tile_size, name=name, fill_type=fill_type)
+    util_test.assert_equal_recursive(filled, expected[0])
+
+
+@pytest.mark.parametrize("line_type", LineType.__members__.values())
+@pytest.mark.parametrize("tile_size", [(10, 12), 7, 100])
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_tiled_multi_lines(
+    name: str, tile_size: int | tuple[int, int], line_type: LineType,
+) -> None:
+    x, y, z = random((37, 53), mask_fraction=0.05)
+    levels = [0.2, 0.5, 0.8]
+    expected = contour_generator(
+        x, y, z, name=name, line_type=line_type, chunk_size=tile_size).multi_lines(levels)
+    multi_lines = tiled_multi_lines(
+        x, y, z, levels, tile_size=tile_size, name=name, line_type=line_type)
+    util_test.assert_equal_recursive(multi_lines, expected)
+
+    lines = tiled_lines(x, y, z, 0.5, tile_size=tile_size, name=name, line_type=line_type)
+    util_test.assert_equal_recursive(lines, expected[1])
+
+
+@pytest.mark.parametrize("xy_ndim", [0, 1])
+def test_tiled_xy(xy_ndim: int) -> None:
+    z = np.random.default_rng(2187).random((30, 40))
+    x = np.linspace(0.0, 1.0, 40) if xy_ndim == 1 else None
+    y = np.linspace(0.0, 2.0, 30) if xy_ndim == 1 else None
+    expected = contour_generator(
+        x, y, z, line_type="ChunkCombinedOffset", chunk_size=(8, 11)).lines(0.5)
+    lines = tiled_lines(x, y, z, 0.5, tile_size=(8, 11), line_type="ChunkCombinedOffset")
+    util_test.assert_equal_recursive(lines, expected)
+
+
+def test_tiled_chunk_size() -> None:
+    # Each tile is further divided into chunks, and the chunks of each tile are returned together.
+    z = np.random.default_rng(2187).random((31, 41))
+    lines = tiled_lines(
+        None, None, z, 0.5, tile_size=10, chunk_size=5, line_type="ChunkCombinedCode")
+    if TYPE_CHECKING:
+        lines = cast("LineReturn_ChunkCombinedCode", lines)
+    assert len(lines[0]) == len(lines[1]) == 48
+    expected = contour_generator(z=z[:11, :11], line_type="ChunkCombinedCode", chunk_size=5)
+    util_test.assert_equal_recursive((lines[0][:4], lines[1][:4]), expected.lines(0.5))
+
+
+def test_tiled_lines_split_at_tile_boundaries() -> None:
+    # Lines are not stitched across tiles, so a horizontal line crossing 4 tiles is returned as 4
+    # lines that meet at the tile edges.
+    z = np.repeat(np.arange(11.0)[:, np.newaxis], 41, axis=1)
+    lines = tiled_lines(None, None, z, 4.5, tile_size=(20, 10), line_type="Separate")
+    if TYPE_CHECKING:
+        lines = cast("LineReturn_Separate", lines)
+    assert len(lines) == 4
+    lines = sorted(lines, key=lambda line: line[:, 0].min())
+    for i, line in enumerate(lines):
+        assert np.allclose(line[:, 1], 4.5)
+        assert line[:, 0].min() == 10*i
+        assert line[:, 0].max() == 10*(i+1)
+
+
+def test_tiled_memmap(tmp_path: Path) -> None:
+    x, y, z = random((40, 30), mask_fraction=0.0)
+    filename = tmp_path / "z.dat"
+    np.asarray(z).tofile(filename)
+    z_memmap = np.memmap(filename, dtype=z.dtype, mode="r", shape=z.shape)
+
+    expected = contour_generator(
+        x, y, z, fill_type="ChunkCombinedOffset", chunk_size=9).multi_filled([0.1, 0.5, 0.9])
+    multi_filled = tiled_multi_filled(
+        x, y, z_memmap, [0.1, 0.5, 0.9], tile_size=9, fill_type="ChunkCombinedOffset")
+    util_test.assert_equal_recursive(multi_filled, expected)
+
+
+def test_tiled_invalid() -> None:
+    z = np.zeros((3, 4))
+    with pytest.raises(TypeError, match="Input z must be 2D, not 1D"):
+        tiled_lines(None, None, z[0], 0.5, tile_size=1)
+    with pytest.raises(TypeError, match="Either both or neither of x and y must be specified"):
+        tiled_lines(np.arange(4.0), None, z, 0.5, tile_size=1)
+    with pytest.raises(TypeError, match=r"Shapes of x \(3,\) and y \(3,\) do not match z"):
+        tiled_lines(np.arange(3.0), np.arange(3.0), z, 0.5, tile_size=1)
+    with pytest.raises(TypeError, match="Inputs x and y must be None, 1D or 2D, not 3D"):
+        tiled_lines(np.zeros((1, 3, 4)), np.zeros((1, 3, 4)), z, 0.5, tile_size=1)
+    with pytest.raises(ValueError, match="chunk_size cannot be negative"):
+        tiled_lines(None, None, z, 0.5, tile_size=-1)
@@ -49,14 +49,15 @@ def test_check_offset_array() -> None:
 
 
 def test_check_point_array() -> None:
-    # Valid point array, does not raise.
+    # Valid point arrays, do not raise.
     check_point_array(np.array([[1.1, 2.2], [3.3, 4.4]], dtype=point_dtype))
+    check_point_array(np.array([[1.1, 2.2], [3.3, 4.4]], dtype=np.float32))
 
     with pytest.raises(TypeError, match=r"Expected numpy array not <class 'list'>"):
         check_point_array([[1.1, 2.2], [3.3, 4.4]])
 
     with pytest.raises(ValueError, match=r"Expected numpy array of dtype <class 'numpy.float64'>"):
-        check_point_array(np.array([[1.1, 2.2], [3.3, 4.4]], dtype=np.float32))
+        check_point_array(np.array([[1.1, 2.2], [3.3, 4.4]], dtype=np.float16))
 
     with pytest.raises(ValueError, match=r"Expected numpy array of shape"):
         check_point_array(np.array([[1.1, 2.2, 3.3, 4.4]], dtype=point_dtype))
@@ -6,7 +6,16 @@ import numpy as np
 from numpy.testing import assert_allclose
 import pytest
 
-from contourpy import LineType, ZInterp, contour_generator
+from contourpy import (
+    LineType,
+    SerialContourGenerator,
+    ThreadedContourGenerator,
+    ZInterp,
+    contour_generator,
+)
+from contourpy.util.data import random
+
+from . import util_test
 
 if TYPE_CHECKING:
     from collections.abc import Callable
@@ -104,3 +113,62 @@ def test_z_interp_negative(name: str) -> None:
     # Mask out negative value so no exception.
     z = np.ma.masked_less_equal(z, 0.0)
     _ = contour_generator(z=z, name=name, z_interp=ZInterp.Log)
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+def test_z_interp_log_keep(name: str) -> None:
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    z = np.exp(3.0*z)
+    levels = [1.5, 2.0, 4.0, 10.0]
+    kwargs: dict[str, Any] = {
+        "name": name, "z_interp": ZInterp.Log, "fill_type": "OuterCode", "chunk_count": 2}
+    cont_gen = contour_generator(x, y, z, **kwargs)
+    assert isinstance(cont_gen, (SerialContourGenerator, ThreadedContourGenerator))
+    assert not cont_gen.keep_log_z
+    cont_gen.set_keep_log_z(True)
+    assert cont_gen.keep_log_z
+
+    ref_gen = contour_generator(x, y, z, **kwargs)
+    for _ in range(2):
+        util_test.assert_equal_recursive(
+            cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+        util_test.assert_equal_recursive(cont_gen.filled(2.0, 4.0), ref_gen.filled(2.0, 4.0))
+
+    # Kept log(z) is recalculated if z is changed.
+    z2 = np.ma.array(
+        np.exp(3.0*np.random.default_rng(2187).random(z.shape)), mask=np.ma.getmaskarray(z))
+    cont_gen.set_z(z2)
+    ref_gen = contour_generator(x, y, z2, **kwargs)
+    util_test.assert_equal_recursive(cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+
+    patch = np.full((3, 4), 3.0)
+    cont_gen.update_z(patch, slice(5, 8), slice(10, 14))
+    z2[5:8, 10:14] = patch
+    ref_gen = contour_generator(x, y, z2, **kwargs)
+    util_test.assert_equal_recursive(cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+
+    cont_gen.set_keep_log_z(False)
+    assert not cont_gen.keep_log_z
+    util_test.assert_equal_recursive(cont_gen.multi_filled(levels), ref_gen.multi_filled(levels))
+
+
+@pytest.mark.parametrize("name", ["serial", "threaded"])
+@pytest.mark.parametrize("quad_as_tri", [False, True])
+def test_z_interp_log_non_positive_level(name: str, quad_as_tri: bool) -> None:
+    # All z are above a level that is not positive, the same as for a small positive level.
+    x, y, z = random((30, 40), mask_fraction=0.05)
+    z = np.exp(3.0*z)
+    kwargs: dict[str, Any] = {
+        "name": name, "z_interp": ZInterp.Log, "fill_type": "OuterCode", "quad_as_tri": quad_as_tri}
+    cont_gen = contour_generator(x, y, z, **kwargs)
+    expected = cont_gen.filled(1e-10, 2.0)
+    for lower_level in (0.0, -1.0):
+        util_test.assert_equal_recursive(cont_gen.filled(lower_level, 2.0), expected)
+
+
+@pytest.mark.parametrize("name", ["mpl2005", "mpl2014"])
+def test_keep_log_z_not_supported(name: str) -> None:
+    x, y, z = random((30, 40))
+    cont_gen = contour_generator(x, y, z, name=name)
+    cont_gen.set_keep_log_z(True)
+    assert not cont_gen.keep_log_z
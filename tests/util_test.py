@@ -308,7 +308,7 @@ def assert_equal_recursive(any1: Any, any2: Any) -> None:
             assert_equal_recursive(item1, item2)
     elif isinstance(any1, np.ndarray):
         assert any1.dtype == any2.dtype
-        if any1.dtype == np.float64:
+        if any1.dtype in (np.float64, np.float32):
             assert_allclose(any1, any2)
         else:
             assert_array_equal(any1, any2)